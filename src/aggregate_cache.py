@@ -0,0 +1,141 @@
+from collections import Counter
+
+import pandas as pd
+
+
+class AggregateCache:
+    """
+    Bộ nhớ đệm các bảng đếm dùng cho biểu đồ.
+
+    Lưu số câu trả lời theo (Quốc gia, Loại câu trả lời), số câu hỏi theo cấp độ và theo chủ đề. Các bảng được
+    tính một lần bằng groupby trên toàn bộ dữ liệu; sau đó mỗi thao tác thêm/sửa/xóa chỉ cộng hoặc trừ số đếm
+    của các hàng bị ảnh hưởng. Giá trị rỗng (NaN) không được đếm, giống như groupby và value_counts.
+    """
+
+    def __init__(self, data):
+        """
+        Tính các bảng đếm từ DataFrame.
+
+        Tham số:
+            data (pandas.DataFrame): Dữ liệu cần thống kê.
+        """
+        self.columns = list(data.columns)
+        self.country_answer = Counter()
+        self.levels = Counter()
+        self.topics = Counter()
+        self.update(data)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Tính các bảng đếm trong một lần duyệt qua các phần liên tiếp của dữ liệu (ví dụ `read_csv(chunksize=...)`).
+
+        Chỉ một phần dữ liệu nằm trong bộ nhớ tại mỗi thời điểm; kết quả giống như khi tính trên toàn bộ dữ liệu.
+
+        Tham số:
+            chunks (iterable): Các DataFrame có cùng các cột.
+
+        Trả về:
+            AggregateCache: Các bảng đếm của toàn bộ dữ liệu.
+        """
+        cache = None
+        for chunk in chunks:
+            if cache is None:
+                cache = cls(chunk)
+            else:
+                cache.update(chunk)
+        return cache if cache is not None else cls(pd.DataFrame())
+
+    def update(self, data):
+        """
+        Cộng thêm số đếm của các hàng trong một DataFrame.
+
+        Tham số:
+            data (pandas.DataFrame): Các hàng cần cộng, có cùng các cột với dữ liệu ban đầu.
+        """
+        self._count_frame(data, 1)
+
+    def subtract(self, data):
+        """
+        Trừ số đếm của các hàng trong một DataFrame (các hàng sắp bị xóa hoặc giá trị cũ của các hàng sắp được sửa).
+
+        Tham số:
+            data (pandas.DataFrame): Các hàng cần trừ.
+        """
+        self._count_frame(data, -1)
+
+    def add_row(self, row):
+        """
+        Cộng số đếm của một hàng vừa được thêm.
+
+        Tham số:
+            row (pandas.Series): Hàng dữ liệu.
+        """
+        self._count(row, 1)
+
+    def remove_row(self, row):
+        """
+        Trừ số đếm của một hàng sắp bị xóa (hoặc giá trị cũ của một hàng sắp được sửa).
+
+        Tham số:
+            row (pandas.Series): Hàng dữ liệu.
+        """
+        self._count(row, -1)
+
+    def country_answer_table(self):
+        """
+        Bảng số câu trả lời theo quốc gia (hàng) và loại câu trả lời (cột).
+
+        Trả về:
+            pandas.DataFrame: Tương đương `groupby(['Student Country', 'Type of Answer']).size().unstack(fill_value=0)`.
+        """
+        if not self.country_answer:
+            return pd.DataFrame()
+        counts = pd.Series(self.country_answer)
+        counts.index.names = ["Student Country", "Type of Answer"]
+        return counts.sort_index().unstack(fill_value=0)
+
+    def level_counts(self):
+        """
+        Số câu hỏi theo cấp độ, sắp xếp giảm dần như `value_counts`.
+        """
+        return self._as_series(self.levels, "Question Level")
+
+    def topic_counts(self):
+        """
+        Số câu hỏi theo chủ đề, sắp xếp giảm dần như `value_counts`.
+        """
+        return self._as_series(self.topics, "Topic")
+
+    def _count(self, row, delta):
+        country, answer = row.get("Student Country"), row.get("Type of Answer")
+        if not pd.isna(country) and not pd.isna(answer):
+            self._bump(self.country_answer, (country, answer), delta)
+        level = row.get("Question Level")
+        if not pd.isna(level):
+            self._bump(self.levels, level, delta)
+        topic = row.get("Topic")
+        if not pd.isna(topic):
+            self._bump(self.topics, topic, delta)
+
+    def _bump(self, counter, key, delta):
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+
+    def _count_frame(self, data, sign):
+        if {"Student Country", "Type of Answer"}.issubset(self.columns):
+            grouped = data.groupby(["Student Country", "Type of Answer"], observed=True).size()
+            for key, count in grouped.items():
+                if count:
+                    self._bump(self.country_answer, key, sign * count)
+        for column, counter in (("Question Level", self.levels), ("Topic", self.topics)):
+            if column in self.columns:
+                for key, count in data[column].value_counts().items():
+                    if count:
+                        self._bump(counter, key, sign * count)
+
+    def _as_series(self, counter, name):
+        counts = pd.Series(dict(counter), dtype="int64", name="count")
+        counts.index.name = name
+        return counts.sort_values(ascending=False, kind="stable")
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+ANALYTICS_COLUMNS = ["Student ID", "Student Country", "Question ID", "Type of Answer", "Topic", "Subtopic"]
+GROUP_COLUMNS = ["Student Country", "Topic", "Subtopic"]
+MIN_PARALLEL_ROWS = 200000
+
+
+class Statistics:
+    """
+    Kết quả thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia (xem `compute_statistics`).
+
+    Thuộc tính:
+        students (pandas.DataFrame): Theo "Student ID": Answers, Correct, Accuracy (tỉ lệ trả lời đúng).
+        questions (pandas.DataFrame): Theo "Question ID": Answers, Correct, P-Value (độ khó: tỉ lệ trả lời đúng),
+            Discrimination (chỉ số phân biệt: tương quan điểm-nhị phân giữa việc trả lời đúng câu hỏi và tỉ lệ
+            trả lời đúng chung của học sinh).
+        topics (pandas.DataFrame): Theo ("Student Country", "Topic", "Subtopic"): Answers, Correct, Success Rate.
+    """
+
+    def __init__(self, students, questions, topics):
+        self.students = students
+        self.questions = questions
+        self.topics = topics
+        self.columns = list(ANALYTICS_COLUMNS)
+
+    def topic_country_table(self):
+        """
+        Bảng tỉ lệ trả lời đúng theo quốc gia (hàng) và chủ đề (cột), gộp các chủ đề con.
+
+        Trả về:
+            pandas.DataFrame: Tỉ lệ trả lời đúng; NaN nếu quốc gia không có câu trả lời nào cho chủ đề.
+        """
+        if self.topics.empty:
+            return pd.DataFrame()
+        totals = self.topics.groupby(level=["Student Country", "Topic"])[["Answers", "Correct"]].sum()
+        return (totals["Correct"] / totals["Answers"]).unstack()
+
+
+def _prepare(data):
+    """
+    Chọn các hàng hợp lệ và đổi dữ liệu thành các mảng numpy gọn để gửi tới các tiến trình.
+
+    Chỉ các hàng có "Student ID" và "Type of Answer" là 0 hoặc 1 được thống kê. Các cột chuỗi được mã hóa thành
+    số nguyên (0 là giá trị rỗng), bảng giá trị được trả về riêng để đổi ngược khi gộp kết quả.
+    """
+    student = pd.to_numeric(data["Student ID"], errors="coerce").to_numpy(dtype=float)
+    answer = pd.to_numeric(data["Type of Answer"], errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(student) & np.isin(answer, (0, 1))
+    arrays = {
+        "student": student[valid].astype(np.int64),
+        "question": pd.to_numeric(data["Question ID"], errors="coerce").to_numpy(dtype=float)[valid],
+        "correct": answer[valid].astype(np.int8),
+    }
+    labels = {}
+    for column in GROUP_COLUMNS:
+        codes, uniques = pd.factorize(data[column].to_numpy()[valid])
+        arrays[column] = (codes + 1).astype(np.int32)
+        labels[column] = uniques
+    return arrays, labels
+
+
+def _partition(arrays, partitions):
+    """
+    Chia các mảng theo giá trị băm của "Student ID": mọi câu trả lời của một học sinh nằm trong cùng một phần.
+    """
+    if partitions <= 1:
+        return [arrays]
+    keys = pd.util.hash_array(arrays["student"]) % np.uint64(partitions)
+    order = np.argsort(keys, kind="stable")
+    bounds = np.searchsorted(keys[order], np.arange(1, partitions, dtype=np.uint64))
+    return [{name: values[part] for name, values in arrays.items()} for part in np.split(order, bounds)]
+
+
+def _partition_statistics(arrays):
+    """
+    Tính các tổng riêng phần của một phần dữ liệu; chạy trong tiến trình con.
+
+    Vì mỗi học sinh chỉ nằm trong một phần, tỉ lệ trả lời đúng của học sinh được tính đầy đủ ngay trong phần đó,
+    và các tổng cần cho chỉ số phân biệt của câu hỏi (n, Σx, Σy, Σy², Σxy với x là đúng/sai, y là tỉ lệ đúng của
+    học sinh) đều cộng được giữa các phần.
+    """
+    correct = arrays["correct"].astype(np.float64)
+    student_rows, students = pd.factorize(arrays["student"])
+    answers = np.bincount(student_rows, minlength=len(students))
+    right = np.bincount(student_rows, weights=correct, minlength=len(students))
+    student_table = pd.DataFrame({"Answers": answers, "Correct": right.astype(np.int64)},
+                                 index=pd.Index(students, name="Student ID"))
+
+    score = (right / answers)[student_rows]
+    has_question = ~np.isnan(arrays["question"])
+    question_rows, questions = pd.factorize(arrays["question"][has_question])
+    x, y = correct[has_question], score[has_question]
+    size = len(questions)
+    question_table = pd.DataFrame({
+        "Answers": np.bincount(question_rows, minlength=size),
+        "Correct": np.bincount(question_rows, weights=x, minlength=size),
+        "Score": np.bincount(question_rows, weights=y, minlength=size),
+        "Score2": np.bincount(question_rows, weights=y * y, minlength=size),
+        "CorrectScore": np.bincount(question_rows, weights=x * y, minlength=size),
+    }, index=pd.Index(questions, name="Question ID"))
+
+    complete = np.logical_and.reduce([arrays[column] > 0 for column in GROUP_COLUMNS])
+    codes = [arrays[column][complete].astype(np.int64) for column in GROUP_COLUMNS]
+    sizes = [int(code.max()) + 1 if len(code) else 1 for code in codes]
+    group_rows, groups = pd.factorize((codes[0] * sizes[1] + codes[1]) * sizes[2] + codes[2])
+    topic_table = pd.DataFrame({
+        "Answers": np.bincount(group_rows, minlength=len(groups)),
+        "Correct": np.bincount(group_rows, weights=correct[complete], minlength=len(groups)).astype(np.int64),
+    }, index=pd.MultiIndex.from_arrays(
+        [groups // (sizes[1] * sizes[2]), groups // sizes[2] % sizes[1], groups % sizes[2]], names=GROUP_COLUMNS))
+    return student_table, question_table, topic_table
+
+
+def _merge(partials, labels):
+    """
+    Gộp các tổng riêng phần thành kết quả cuối cùng.
+    """
+    students = pd.concat([part[0] for part in partials]).sort_index()
+    students["Accuracy"] = students["Correct"] / students["Answers"]
+
+    sums = pd.concat([part[1] for part in partials]).groupby(level=0).sum().sort_index()
+    n, sx, sy, syy, sxy = (sums[name] for name in ("Answers", "Correct", "Score", "Score2", "CorrectScore"))
+    spread_x, spread_y = n * sx - sx * sx, n * syy - sy * sy
+    # Khi mọi học sinh trả lời câu hỏi có cùng kết quả hoặc cùng tỉ lệ đúng, phương sai bằng 0 (sai số làm tròn
+    # có thể để lại một số rất nhỏ) và chỉ số phân biệt không xác định.
+    denominator = np.sqrt(spread_x.where(spread_x > 1e-9 * n * sx) * spread_y.where(spread_y > 1e-9 * n * syy))
+    questions = pd.DataFrame({"Answers": n.astype(np.int64), "Correct": sx.round().astype(np.int64)})
+    questions["P-Value"] = sx / n
+    questions["Discrimination"] = ((n * sxy - sx * sy) / denominator).clip(-1, 1)
+
+    topics = pd.concat([part[2] for part in partials]).groupby(level=GROUP_COLUMNS).sum()
+    topics.index = pd.MultiIndex.from_arrays(
+        [np.asarray(labels[column], dtype=object)[topics.index.get_level_values(column).to_numpy() - 1]
+         for column in GROUP_COLUMNS], names=GROUP_COLUMNS)
+    topics = topics.sort_index()
+    topics["Success Rate"] = topics["Correct"] / topics["Answers"]
+    return Statistics(students, questions, topics)
+
+
+def compute_statistics(data, workers=None, partitions=None):
+    """
+    Tính thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia trên nhiều lõi CPU.
+
+    Dữ liệu được chia thành các phần theo giá trị băm của "Student ID"; mỗi phần được tính trong một tiến trình
+    của `ProcessPoolExecutor` thành các tổng riêng phần (số câu trả lời, số câu đúng, các tổng cho chỉ số phân
+    biệt), sau đó các tổng được gộp lại. Chỉ các mảng số nguyên của các cột cần thiết được gửi tới tiến trình con.
+    Với dữ liệu nhỏ (dưới `MIN_PARALLEL_ROWS` hàng) hoặc `workers=1`, mọi việc được tính ngay trong tiến trình hiện tại.
+
+    Tham số:
+        data (pandas.DataFrame): Dữ liệu có các cột trong `ANALYTICS_COLUMNS`.
+        workers (int, tùy chọn): Số tiến trình; mặc định bằng số lõi CPU.
+        partitions (int, tùy chọn): Số phần dữ liệu; mặc định bằng số tiến trình.
+
+    Trả về:
+        Statistics: Kết quả thống kê.
+    """
+    workers = workers or os.cpu_count() or 1
+    arrays, labels = _prepare(data)
+    if workers == 1 or len(arrays["student"]) < MIN_PARALLEL_ROWS:
+        partials = [_partition_statistics(part) for part in _partition(arrays, partitions or 1)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(_partition_statistics, _partition(arrays, partitions or workers)))
+    return _merge(partials, labels)
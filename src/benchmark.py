@@ -0,0 +1,277 @@
+"""
+Đo hiệu năng các thao tác chính của ứng dụng trên dữ liệu tổng hợp (xem `synthetic_data`).
+
+Mỗi phép đo được chạy `--repeat` lần để lấy thời gian (trung vị và nhỏ nhất), sau đó chạy thêm một lần riêng
+với `tracemalloc` để lấy bộ nhớ cấp phát tối đa, vì `tracemalloc` làm chậm mã Python và làm sai lệch thời gian.
+Kết quả được ghi dưới dạng JSON; `--compare` so sánh với một file kết quả cũ và trả về mã thoát 1 nếu có
+phép đo chậm hơn hoặc tốn bộ nhớ hơn ngưỡng cho phép.
+
+Ví dụ:
+    python src/benchmark.py --rows 10k 100k 1m --output bench.json
+    python src/benchmark.py --rows 100k --compare bench.json --threshold 1.3
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+
+from chart_utils import CHART_TYPES
+from data_manager import COLUMN_NAMES, DataManager
+from synthetic_data import DEFAULT_REFERENCE, write_dataset
+
+DEFAULT_WORKDIR = "./data/benchmarks"
+OPERATIONS = 100
+BATCH_SIZE = 1000
+SEARCH_VALUES = ["", "portugal", "", "", "basic", "algebra", "", ""]
+SORT_COLUMNS = ["Student ID", "Topic"]
+
+
+def parse_rows(text):
+    """
+    Đọc số hàng dạng "10000", "100k" hoặc "10m".
+    """
+    text = text.strip().lower()
+    scale = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def measure(run, setup=None, repeat=3):
+    """
+    Đo thời gian và bộ nhớ tối đa của `run(state)`, với `state = setup()` được chuẩn bị lại trước mỗi lần chạy.
+
+    Trả về:
+        dict: seconds (trung vị), seconds_min, peak_memory_mb.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(times), "seconds_min": min(times), "peak_memory_mb": peak / 2 ** 20}
+
+
+class BenchmarkSuite:
+    """
+    Các phép đo trên một file dữ liệu tổng hợp có `rows` hàng.
+    """
+
+    def __init__(self, file_name, rows, repeat=3, fsync="always", seed=0):
+        self.file_name = file_name
+        self.rows = rows
+        self.repeat = repeat
+        self.fsync = fsync
+        self.rng = np.random.default_rng(seed)
+        self.results = []
+        self.manager = None
+
+    def record(self, name, run, setup=None, repeat=None, operations=1):
+        result = measure(run, setup, self.repeat if repeat is None else repeat)
+        result.update({"rows": self.rows, "benchmark": name, "operations": operations})
+        self.results.append(result)
+        print(f"{self.rows:>10} {name:<45} {result['seconds']:9.4f}s {result['peak_memory_mb']:9.1f} MB",
+              file=sys.stderr)
+
+    def open_manager(self, use_cache=False):
+        return DataManager(self.file_name, fsync=self.fsync, compact_every=None, use_cache=use_cache,
+                           notify=lambda level, title, message: None)
+
+    def run(self, treeview=True):
+        """
+        Chạy toàn bộ các phép đo và trả về danh sách kết quả.
+        """
+        # Lần mở đầu tiên ghi các hàng không hợp lệ vào file cách ly và gắn nhật ký với file CSV (xem `validation`),
+        # để các lần đo sau không ghi lại file cách ly.
+        self.open_manager().journal.close()
+        self.record("load_data (csv)", lambda _: self.open_manager())
+        self.open_manager(use_cache=True).journal.close()
+        self.record("load_data (column cache)", lambda _: self.open_manager(use_cache=True).journal.close())
+        self.manager = manager = self.open_manager()
+        self.record("save_data", lambda _: manager.save_data())
+
+        self.record("search_data (build index)", lambda _: manager.search_data(SEARCH_VALUES),
+                    setup=lambda: setattr(manager, "search_index", None))
+        self.record("search_data (indexed)", lambda _: manager.search_data(SEARCH_VALUES))
+        manager.use_search_index = False
+        self.record("search_data (scan)", lambda _: manager.search_data(SEARCH_VALUES))
+        manager.use_search_index = True
+        for column in SORT_COLUMNS:
+            self.record(f"sort_data {column} (build permutation)", lambda _, c=column: manager.sort_data(c),
+                        setup=lambda c=column: manager._sort_indexes.pop(c, None))
+            self.record(f"sort_data {column} (cached)", lambda _, c=column: manager.sort_data(c, ascending=False))
+
+        self.record("aggregates (build)", lambda _: manager.aggregates(),
+                    setup=lambda: setattr(manager, "_aggregates", None))
+        self.record("statistics", lambda _: manager.statistics())
+        aggregates, results = manager.aggregates(), manager.statistics()
+        for chart, chart_type in sorted(CHART_TYPES.items()):
+            data = results if chart_type.source == "statistics" else aggregates
+            self.record(f"chart {chart}", lambda _, t=chart_type, d=data: t.figure(d))
+            artists = chart_type.plot(Figure(figsize=chart_type.figsize), data)
+            self.record(f"chart {chart} (update in place)", lambda _, t=chart_type, a=artists, d=data: t.update(a, d))
+
+        if treeview:
+            self.run_treeview()
+
+        self.record("add_data", lambda rows: [manager.add_data(row) for row in rows],
+                    setup=lambda: self.fresh_rows(OPERATIONS), repeat=1, operations=OPERATIONS)
+        self.record("update_data", lambda rows: [manager.update_data(position, row) for position, row in
+                                                 zip(self.rng.integers(0, len(manager.data), OPERATIONS), rows)],
+                    setup=lambda: self.fresh_rows(OPERATIONS), repeat=1, operations=OPERATIONS)
+        self.record("delete_data", lambda _: [manager.delete_data([position]) for position in
+                                              self.rng.integers(0, len(manager.data) - OPERATIONS, OPERATIONS)],
+                    repeat=1, operations=OPERATIONS)
+        # Cùng một hàng giá trị cho cả lô tạo ra các cặp trùng nhau, vốn bị từ chối khi bật kiểm tra dữ liệu.
+        manager.use_validation = False
+        row = self.fresh_rows(1)[0]
+        self.record(f"update_rows (batch {BATCH_SIZE}, no validation)", lambda ids: manager.update_rows(ids, row),
+                    setup=self.sample_ids, repeat=1)
+        manager.use_validation = True
+        self.record(f"delete_rows (batch {BATCH_SIZE})", lambda ids: manager.delete_rows(ids),
+                    setup=self.sample_ids, repeat=1)
+        manager.journal.close()
+        return self.results
+
+    def fresh_rows(self, count):
+        """
+        `count` hàng mang giá trị của hàng đầu tiên nhưng với các cặp (Student ID, Question ID) chưa có trong dữ
+        liệu, để các thao tác thêm/sửa không bị từ chối vì trùng lặp.
+        """
+        row = self.manager.data.iloc[0].tolist()
+        first = int(self.manager.data["Student ID"].max()) + 1
+        return [[first + offset] + row[1:] for offset in range(count)]
+
+    def sample_ids(self):
+        size = min(BATCH_SIZE, len(self.manager.data) // 4)
+        return self.manager.data.index[self.rng.choice(len(self.manager.data), size, replace=False)].tolist()
+
+    def run_treeview(self):
+        """
+        Đo việc hiển thị dữ liệu trong bảng ảo (`VirtualTable`); bỏ qua nếu không có màn hình.
+        """
+        try:
+            from tkinter import Tk
+            root = Tk()
+        except Exception as error:
+            print(f"Bỏ qua đo Treeview: {error}", file=sys.stderr)
+            self.results.append({"rows": self.rows, "benchmark": "treeview", "skipped": str(error)})
+            return
+        from virtual_table import VirtualTable
+        try:
+            root.withdraw()
+            table = VirtualTable(root, COLUMN_NAMES, height=30)
+            view = self.manager.sorted_view("Student ID")
+
+            def populate(_):
+                table.show_view(view)
+                root.update_idletasks()
+
+            def scroll(_):
+                for page in range(OPERATIONS):
+                    table.scroll_to(page * len(view) // OPERATIONS)
+                root.update_idletasks()
+
+            self.record("treeview populate", populate)
+            self.record("treeview scroll", scroll, operations=OPERATIONS)
+        finally:
+            root.destroy()
+
+
+def environment():
+    """
+    Thông tin môi trường đo, ghi kèm kết quả để so sánh giữa các máy.
+    """
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    So sánh kết quả với một lần đo trước.
+
+    Trả về:
+        list: Các dòng mô tả phép đo chậm hơn hoặc tốn bộ nhớ hơn `threshold` lần.
+    """
+    previous = {(item["rows"], item["benchmark"]): item for item in baseline["results"] if "seconds" in item}
+    regressions = []
+    for item in results:
+        old = previous.get((item["rows"], item["benchmark"]))
+        if not old or "seconds" not in item:
+            continue
+        for key, unit in (("seconds", "s"), ("peak_memory_mb", " MB")):
+            if old[key] > 0 and item[key] > old[key] * threshold:
+                regressions.append(f"{item['rows']} hàng, {item['benchmark']}: {key} "
+                                   f"{old[key]:.4f}{unit} -> {item[key]:.4f}{unit}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo hiệu năng các thao tác dữ liệu trên dữ liệu tổng hợp.")
+    parser.add_argument("--rows", nargs="+", type=parse_rows, default=[10000, 100000],
+                        help="Số hàng của các bộ dữ liệu, ví dụ 10k 100k 1m 10m.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fsync", choices=["always", "interval", "never"], default="always")
+    parser.add_argument("--reference", default=DEFAULT_REFERENCE, help="File dữ liệu thật dùng làm mẫu.")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Thư mục chứa dữ liệu tổng hợp.")
+    parser.add_argument("--no-treeview", action="store_true", help="Không đo Treeview (không cần màn hình).")
+    parser.add_argument("--output", help="File JSON kết quả (mặc định: stdout).")
+    parser.add_argument("--compare", help="File JSON kết quả cũ để phát hiện suy giảm hiệu năng.")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    arguments = parser.parse_args(argv)
+
+    results = []
+    for rows in arguments.rows:
+        directory = os.path.join(arguments.workdir, f"{rows}_{arguments.seed}")
+        file_name = os.path.join(directory, "dataset.csv")
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        write_dataset(file_name, rows, reference=arguments.reference, seed=arguments.seed)
+        suite = BenchmarkSuite(file_name, rows, repeat=arguments.repeat, fsync=arguments.fsync, seed=arguments.seed)
+        results.extend(suite.run(treeview=not arguments.no_treeview))
+        shutil.rmtree(directory)
+
+    report = {"environment": environment(), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), arguments.threshold)
+        for line in regressions:
+            print(f"Suy giảm hiệu năng: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,104 +1,445 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from tkinter import messagebox
+from collections import namedtuple
 
-def draw_stacked_bar_chart(data, chart_display_frame):
-    """
-    Vẽ biểu đồ hình cột xếp chồng thể hiện số câu trả lời đúng/sai theo quốc gia của học sinh.
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from aggregate_cache import AggregateCache
+from tracing import span, traced
 
-    Tham số:
-        data (pandas.DataFrame): Dữ liệu chứa các thông tin như Quốc gia học sinh, Loại câu trả lời.
-        chart_display_frame (tkinter.Frame): Khung giao diện để hiển thị biểu đồ.
 
-    Điều kiện:
-        - Dữ liệu phải có các cột "Student Country" và "Type of Answer".
+STACKED_BAR_COLORS = ['red', 'green']
+PIE_START_ANGLE = 90
+PIE_AUTOPCT = '%1.1f%%'
+ACCURACY_BINS = 20
 
-    Hiển thị thông báo cảnh báo nếu các cột cần thiết không được tìm thấy.
-    """
-    if {'Student Country', 'Type of Answer'}.issubset(data.columns):
-        grouped = data.groupby(['Student Country', 'Type of Answer']).size().unstack(fill_value=0)
-        fig, ax = plt.subplots(figsize=(8, 4))
-        grouped.plot(kind='bar', stacked=True, ax=ax, color=['red', 'green'])
-        ax.set_title("Biểu đồ hình cột xếp chồng: Quốc gia học sinh vs. Loại câu trả lời")
-        ax.set_xlabel("Quốc gia học sinh")
-        ax.set_ylabel("Số lượng")
-        ax.legend(title="Loại câu trả lời", labels=['Sai (0)', 'Đúng (1)'])
-        render_chart(fig, chart_display_frame)
-    else:
-        messagebox.showwarning("Cảnh báo", "Không tìm thấy các cột cần thiết ('Student Country', 'Type of Answer') để vẽ biểu đồ hình cột xếp chồng.")
-
-def draw_pie_chart(data, chart_display_frame):
+
+def as_aggregates(data):
     """
-    Vẽ biểu đồ hình tròn thể hiện số lượng câu hỏi theo cấp độ.
+    Lấy các bảng đếm dùng cho biểu đồ từ dữ liệu.
 
     Tham số:
-        data (pandas.DataFrame): Dữ liệu chứa các thông tin như Cấp độ câu hỏi.
-        chart_display_frame (tkinter.Frame): Khung giao diện để hiển thị biểu đồ.
+        data (pandas.DataFrame hoặc AggregateCache): Dữ liệu thô, hoặc bộ nhớ đệm các bảng đếm đã được tính sẵn
+            (ví dụ `DataManager.aggregates()`).
+
+    Trả về:
+        AggregateCache: Các bảng đếm. Nếu `data` là DataFrame, các bảng được tính lại trên toàn bộ dữ liệu.
+    """
+    return AggregateCache(data) if isinstance(data, pd.DataFrame) else data
+
+
+def _country_answer_table(data):
+    aggregates = as_aggregates(data)
+    if not {'Student Country', 'Type of Answer'}.issubset(aggregates.columns):
+        raise ValueError("Không tìm thấy các cột cần thiết ('Student Country', 'Type of Answer') "
+                         "để vẽ biểu đồ hình cột xếp chồng.")
+    table = aggregates.country_answer_table()
+    if table.empty:
+        raise ValueError("Không có câu trả lời nào ('Student Country', 'Type of Answer') "
+                         "để vẽ biểu đồ hình cột xếp chồng.")
+    return table
+
+
+def _plot_stacked_bar(fig, data):
+    table = _country_answer_table(data)
+    ax = fig.add_subplot()
+    positions = np.arange(len(table.index))
+    bottom = np.zeros(len(table.index))
+    bars = []
+    for i, answer in enumerate(table.columns):
+        heights = table[answer].to_numpy(dtype=float)
+        bars.append(ax.bar(positions, heights, width=0.5, bottom=bottom,
+                           color=STACKED_BAR_COLORS[i % len(STACKED_BAR_COLORS)], label=str(answer)))
+        bottom = bottom + heights
+    ax.set_xticks(positions, table.index, rotation=90)
+    ax.set_title("Biểu đồ hình cột xếp chồng: Quốc gia học sinh vs. Loại câu trả lời")
+    ax.set_xlabel("Quốc gia học sinh")
+    ax.set_ylabel("Số lượng")
+    ax.legend(title="Loại câu trả lời", labels=['Sai (0)', 'Đúng (1)'])
+    return {"axes": ax, "index": table.index, "columns": table.columns, "bars": bars,
+            "animated": [bar for container in bars for bar in container]}
+
+
+def _update_stacked_bar(artists, data):
+    table = _country_answer_table(data)
+    if not (table.index.equals(artists["index"]) and table.columns.equals(artists["columns"])):
+        return False
+    bottom = np.zeros(len(table.index))
+    for container, answer in zip(artists["bars"], table.columns):
+        heights = table[answer].to_numpy(dtype=float)
+        for bar, y, height in zip(container, bottom, heights):
+            bar.set_y(y)
+            bar.set_height(height)
+        bottom = bottom + heights
+    _rescale(artists["axes"])
+    return True
+
+
+def _level_counts(data):
+    aggregates = as_aggregates(data)
+    if 'Question Level' not in aggregates.columns:
+        raise ValueError("Không tìm thấy cột cần thiết ('Question Level') để vẽ biểu đồ hình tròn.")
+    value_counts = aggregates.level_counts()
+    if value_counts.empty:
+        raise ValueError("Không có câu hỏi nào có cấp độ ('Question Level') để vẽ biểu đồ hình tròn.")
+    return value_counts
+
+
+def _plot_pie(fig, data):
+    value_counts = _level_counts(data)
+    ax = fig.add_subplot()
+    wedges, labels, percents = ax.pie(value_counts, labels=value_counts.index, autopct=PIE_AUTOPCT,
+                                      startangle=PIE_START_ANGLE)
+    ax.set_title("Biểu đồ hình tròn: Cấp độ câu hỏi")
+    return {"axes": ax, "index": value_counts.index, "wedges": wedges, "labels": labels, "percents": percents,
+            "animated": [*wedges, *labels, *percents]}
+
+
+def _update_pie(artists, data):
+    # Đặt lại góc của các miếng và vị trí các nhãn như `Axes.pie` (labeldistance=1.1, pctdistance=0.6).
+    value_counts = _level_counts(data)
+    if not value_counts.index.equals(artists["index"]):
+        return False
+    fractions = value_counts.to_numpy(dtype=float) / value_counts.sum()
+    start = PIE_START_ANGLE
+    for wedge, label, percent, fraction in zip(artists["wedges"], artists["labels"], artists["percents"], fractions):
+        end = start + 360 * fraction
+        wedge.set_theta1(start)
+        wedge.set_theta2(end)
+        middle = np.deg2rad((start + end) / 2)
+        x, y = np.cos(middle), np.sin(middle)
+        label.set_position((1.1 * x, 1.1 * y))
+        label.set_horizontalalignment("left" if x > 0 else "right")
+        percent.set_position((0.6 * x, 0.6 * y))
+        percent.set_text(PIE_AUTOPCT % (100 * fraction))
+        start = end
+    return True
+
+
+def _topic_counts(data):
+    aggregates = as_aggregates(data)
+    if 'Topic' not in aggregates.columns:
+        raise ValueError("Không tìm thấy cột cần thiết ('Topic') để vẽ biểu đồ diện tích.")
+    return aggregates.topic_counts()
+
+
+def _plot_area(fig, data):
+    value_counts = _topic_counts(data)
+    ax = fig.add_subplot()
+    area = ax.fill_between(value_counts.index, value_counts.values, color="skyblue", alpha=0.4)
+    line, = ax.plot(value_counts.index, value_counts.values, color="Slateblue", alpha=0.6, linewidth=2)
+    ax.set_title("Biểu đồ diện tích: Chủ đề câu hỏi")
+    ax.set_xlabel("Chủ đề")
+    ax.set_ylabel("Số lượng")
+    ax.tick_params(axis='x', rotation=45)
+    return {"axes": ax, "index": value_counts.index, "area": area, "line": line, "animated": [area, line]}
+
+
+def _update_area(artists, data):
+    value_counts = _topic_counts(data)
+    if not value_counts.index.equals(artists["index"]):
+        return False
+    values = value_counts.to_numpy(dtype=float)
+    artists["area"].set_verts([_area_polygon(values)] if len(values) else [])
+    artists["line"].set_ydata(values)
+    _rescale(artists["axes"])
+    return True
+
+
+def _area_polygon(values):
+    # Đa giác của `fill_between(x, values, 0)`: theo đường trên từ trái sang phải rồi về theo trục 0. Dựng lại bằng
+    # `set_verts` vì `FillBetweenPolyCollection.set_data` chỉ có từ matplotlib 3.10.
+    # Trục x là trục phân loại: chủ đề thứ i nằm ở vị trí i.
+    x = np.arange(len(values), dtype=float)
+    top = np.column_stack([x, values])
+    bottom = np.column_stack([x[::-1], np.zeros(len(values))])
+    return np.concatenate([[(x[0], 0.0)], top, [(x[-1], 0.0)], bottom])
+
+
+def _student_accuracy(statistics):
+    if statistics.students.empty:
+        raise ValueError("Không có câu trả lời hợp lệ ('Student ID', 'Type of Answer') để thống kê theo học sinh.")
+    return statistics.students["Accuracy"]
+
+
+def _plot_student_accuracy(fig, statistics):
+    accuracy = _student_accuracy(statistics)
+    ax = fig.add_subplot()
+    _, _, bars = ax.hist(accuracy, bins=ACCURACY_BINS, range=(0, 1), color="steelblue", edgecolor="white")
+    ax.set_title("Tỉ lệ trả lời đúng của học sinh")
+    ax.set_xlabel("Tỉ lệ trả lời đúng")
+    ax.set_ylabel("Số học sinh")
+    return {"axes": ax, "bars": bars, "animated": list(bars)}
+
+
+def _update_student_accuracy(artists, statistics):
+    counts, _ = np.histogram(_student_accuracy(statistics), bins=ACCURACY_BINS, range=(0, 1))
+    for bar, count in zip(artists["bars"], counts):
+        bar.set_height(count)
+    _rescale(artists["axes"])
+    return True
+
+
+def _questions(statistics):
+    if statistics.questions.empty:
+        raise ValueError("Không có câu trả lời hợp lệ ('Question ID', 'Type of Answer') để thống kê theo câu hỏi.")
+    return statistics.questions
+
+
+def _plot_question_difficulty(fig, statistics):
+    questions = _questions(statistics)
+    ax = fig.add_subplot()
+    points = ax.scatter(questions["P-Value"], questions["Discrimination"], c=questions["Answers"],
+                        cmap="viridis", s=12, alpha=0.7)
+    fig.colorbar(points, ax=ax, label="Số câu trả lời")
+    zero = ax.axhline(0, color="grey", linewidth=0.8)
+    ax.set_title("Độ khó và chỉ số phân biệt của câu hỏi")
+    ax.set_xlabel("Độ khó (tỉ lệ trả lời đúng)")
+    ax.set_ylabel("Chỉ số phân biệt")
+    return {"axes": ax, "points": points, "animated": [points, zero]}
+
 
-    Điều kiện:
-        - Dữ liệu phải có cột "Question Level".
+def _update_question_difficulty(artists, statistics):
+    questions = _questions(statistics)
+    points = artists["points"]
+    offsets = np.column_stack([questions["P-Value"].to_numpy(dtype=float),
+                               questions["Discrimination"].to_numpy(dtype=float)])
+    # Như `Axes.scatter`, bỏ các câu hỏi không có tọa độ (ví dụ chỉ số phân biệt không xác định).
+    valid = np.isfinite(offsets).all(axis=1)
+    points.set_offsets(offsets[valid])
+    points.set_array(questions["Answers"].to_numpy(dtype=float)[valid])
+    # Thang màu (và thanh màu đi kèm) theo số câu trả lời mới.
+    points.autoscale()
+    _rescale(artists["axes"])
+    return True
 
-    Hiển thị thông báo cảnh báo nếu cột cần thiết không được tìm thấy.
+
+def _topic_country_table(statistics):
+    table = statistics.topic_country_table()
+    if table.empty:
+        raise ValueError("Không có dữ liệu ('Student Country', 'Topic', 'Type of Answer') để thống kê theo chủ đề.")
+    return table
+
+
+def _plot_topic_success(fig, statistics):
+    table = _topic_country_table(statistics)
+    ax = fig.add_subplot()
+    image = ax.imshow(table.to_numpy(dtype=float), aspect="auto", cmap="RdYlGn", vmin=0, vmax=1)
+    fig.colorbar(image, ax=ax, label="Tỉ lệ trả lời đúng")
+    ax.set_xticks(range(len(table.columns)), table.columns, rotation=45, ha="right")
+    ax.set_yticks(range(len(table.index)), table.index)
+    ax.set_title("Tỉ lệ trả lời đúng theo quốc gia và chủ đề")
+    fig.tight_layout()
+    return {"axes": ax, "index": table.index, "columns": table.columns, "image": image, "animated": [image]}
+
+
+def _update_topic_success(artists, statistics):
+    table = _topic_country_table(statistics)
+    if not (table.index.equals(artists["index"]) and table.columns.equals(artists["columns"])):
+        return False
+    artists["image"].set_data(table.to_numpy(dtype=float))
+    return True
+
+
+class ChartType(namedtuple("ChartType", "source figsize plot update")):
     """
-    if 'Question Level' in data.columns:
-        value_counts = data['Question Level'].value_counts()
-        fig, ax = plt.subplots(figsize=(6, 6))
-        ax.pie(value_counts, labels=value_counts.index, autopct='%1.1f%%', startangle=90)
-        ax.set_title("Biểu đồ hình tròn: Cấp độ câu hỏi")
-        render_chart(fig, chart_display_frame)
-    else:
-        messagebox.showwarning("Cảnh báo", "Không tìm thấy cột cần thiết ('Question Level') để vẽ biểu đồ hình tròn.")
-
-def draw_area_chart(data, chart_display_frame):
+    Một loại biểu đồ: nguồn dữ liệu ("aggregates" hoặc "statistics", tên phương thức của bộ lưu trữ), kích thước
+    figure, hàm `plot(fig, data)` vẽ biểu đồ và trả về các đối tượng vẽ (dict, khóa "animated" là các đối tượng phụ
+    thuộc dữ liệu), và hàm `update(artists, data)` cập nhật tại chỗ các đối tượng đó, trả về False nếu cấu trúc biểu
+    đồ đã thay đổi (ví dụ có thêm quốc gia) và phải vẽ lại từ đầu.
     """
-    Vẽ biểu đồ diện tích thể hiện số lượng câu hỏi theo chủ đề.
 
-    Tham số:
-        data (pandas.DataFrame): Dữ liệu chứa các thông tin như Chủ đề.
-        chart_display_frame (tkinter.Frame): Khung giao diện để hiển thị biểu đồ.
+    def figure(self, data):
+        """
+        Tạo một figure mới với biểu đồ vẽ từ `data`.
+
+        Figure không do pyplot quản lý: không cần `plt.close` và tạo được từ bất kỳ luồng nào.
+        """
+        fig = Figure(figsize=self.figsize)
+        self.plot(fig, data)
+        return fig
 
-    Điều kiện:
-        - Dữ liệu phải có cột "Topic".
 
-    Hiển thị thông báo cảnh báo nếu cột cần thiết không được tìm thấy.
+CHART_TYPES = {
+    "stacked-bar": ChartType("aggregates", (8, 4), _plot_stacked_bar, _update_stacked_bar),
+    "pie": ChartType("aggregates", (6, 6), _plot_pie, _update_pie),
+    "area": ChartType("aggregates", (8, 4), _plot_area, _update_area),
+    "student-accuracy": ChartType("statistics", (8, 4), _plot_student_accuracy, _update_student_accuracy),
+    "question-difficulty": ChartType("statistics", (8, 4), _plot_question_difficulty, _update_question_difficulty),
+    "topic-success": ChartType("statistics", (8, 4), _plot_topic_success, _update_topic_success),
+}
+
+
+def _rescale(ax):
+    ax.relim()
+    ax.autoscale_view()
+
+
+def _view_limits(fig):
+    return [tuple(ax.viewLim.bounds) for ax in fig.axes]
+
+
+class ChartCanvas:
     """
-    if 'Topic' in data.columns:
-        value_counts = data['Topic'].value_counts()
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.fill_between(value_counts.index, value_counts.values, color="skyblue", alpha=0.4)
-        ax.plot(value_counts.index, value_counts.values, color="Slateblue", alpha=0.6, linewidth=2)
-        ax.set_title("Biểu đồ diện tích: Chủ đề câu hỏi")
-        ax.set_xlabel("Chủ đề")
-        ax.set_ylabel("Số lượng")
-        ax.tick_params(axis='x', rotation=45)
-        render_chart(fig, chart_display_frame)
-    else:
-        messagebox.showwarning("Cảnh báo", "Không tìm thấy cột cần thiết ('Topic') để vẽ biểu đồ diện tích.")
-
-def render_chart(fig, chart_display_frame):
+    Một figure và canvas Tkinter được giữ lại cho một loại biểu đồ; dữ liệu mới được vẽ vào cùng figure.
+
+    `version` là phiên bản dữ liệu (`StorageEngine.version`) của hình đang vẽ trên canvas. Khi `blit` bật, các đối
+    tượng phụ thuộc dữ liệu được đánh dấu `animated`: sau mỗi lần vẽ toàn bộ figure, nền (trục, nhãn, chú thích)
+    được lưu lại, và khi dữ liệu thay đổi mà giới hạn các trục giữ nguyên, chỉ các đối tượng đó được vẽ lại lên nền
+    đã lưu (blitting).
     """
-    Hiển thị biểu đồ matplotlib trong khung giao diện Tkinter.
 
-    Xóa nội dung hiện có trong khung hiển thị biểu đồ trước khi vẽ biểu đồ mới.
+    def __init__(self, master, chart_type, data, version=None, blit=True):
+        """
+        Vẽ biểu đồ lần đầu.
 
-    Tham số:
-        fig (matplotlib.figure.Figure): Đối tượng biểu đồ matplotlib cần hiển thị.
-        chart_display_frame (tkinter.Frame): Khung giao diện để hiển thị biểu đồ.
+        Tham số:
+            master (tkinter.Frame): Khung chứa canvas.
+            chart_type (ChartType): Loại biểu đồ.
+            data: Dữ liệu của biểu đồ.
+            version (int, tùy chọn): Phiên bản dữ liệu của `data`.
+            blit (bool, tùy chọn): Vẽ lại bằng blitting khi có thể.
+
+        Ngoại lệ:
+            ValueError: Nếu dữ liệu không đủ để vẽ biểu đồ.
+        """
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.chart_type = chart_type
+        self.blit = blit
+        self.figure = Figure(figsize=chart_type.figsize)
+        self.artists = self._plot(data)
+        self.version = version
+        self.background = None
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.widget = self.canvas.get_tk_widget()
+        with span("ChartCanvas.draw"):
+            self.canvas.draw()
+
+    def update(self, data, version=None):
+        """
+        Cập nhật biểu đồ theo dữ liệu mới.
+
+        Các đối tượng vẽ được cập nhật tại chỗ; nếu giới hạn các trục không đổi và `blit` bật, chỉ các đối tượng
+        này được vẽ lại, nếu không figure được vẽ lại khi giao diện rảnh. Biểu đồ chỉ được tạo lại (trong cùng
+        figure) khi cấu trúc của nó thay đổi.
+
+        Ngoại lệ:
+            ValueError: Nếu dữ liệu mới không đủ để vẽ biểu đồ; biểu đồ cũ được giữ nguyên.
+        """
+        limits = _view_limits(self.figure)
+        if not self.chart_type.update(self.artists, data):
+            self.figure.clear()
+            self.artists = self._plot(data)
+            self.canvas.draw_idle()
+        elif self.blit and self.background is not None and _view_limits(self.figure) == limits:
+            with span("ChartCanvas.blit"):
+                self.canvas.restore_region(self.background)
+                self._draw_animated()
+                self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw_idle()
+        self.version = version
+
+    def destroy(self):
+        """
+        Hủy widget của canvas.
+        """
+        self.widget.destroy()
+
+    def _plot(self, data):
+        artists = self.chart_type.plot(self.figure, data)
+        for artist in artists["animated"]:
+            artist.set_animated(self.blit)
+        return artists
+
+    def _on_draw(self, event):
+        # Các đối tượng `animated` không được vẽ cùng figure: lưu nền rồi vẽ chúng lên trên.
+        if self.blit:
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self._draw_animated()
+
+    def _draw_animated(self):
+        # Các đường viền trục được vẽ lại trên cùng như khi vẽ toàn bộ figure.
+        for artist in self.artists["animated"]:
+            self.figure.draw_artist(artist)
+        for ax in self.figure.axes:
+            for spine in ax.spines.values() if ax.get_frame_on() else ():
+                self.figure.draw_artist(spine)
+
+
+class ChartPanel:
     """
-    clear_chart_area(chart_display_frame)
-    canvas = FigureCanvasTkAgg(fig, master=chart_display_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="y", expand=True)
-    canvas.get_tk_widget().bind("<Destroy>", lambda event: plt.close(fig))
+    Khung hiển thị biểu đồ, giữ lại figure và canvas (`ChartCanvas`) của từng loại biểu đồ trong `CHART_TYPES`.
 
-def clear_chart_area(chart_display_frame):
+    Các canvas đã vẽ là bộ đệm hình biểu đồ theo loại biểu đồ và phiên bản dữ liệu: chuyển sang một biểu đồ đã vẽ
+    với dữ liệu chưa đổi (`is_current`) chỉ ẩn/hiện canvas, không tính hay vẽ lại. Khi dữ liệu đã đổi, biểu đồ được
+    cập nhật tại chỗ (xem `ChartCanvas.update`) thay vì tạo lại figure và widget.
     """
-    Xóa tất cả các widget con khỏi khung hiển thị biểu đồ.
 
-    Sử dụng để làm sạch khung trước khi vẽ biểu đồ mới, tránh chồng chéo.
+    def __init__(self, master, blit=True):
+        """
+        Tham số:
+            master (tkinter.Frame): Khung giao diện để hiển thị biểu đồ.
+            blit (bool, tùy chọn): Vẽ lại bằng blitting khi có thể, xem `ChartCanvas`.
+        """
+        self.master = master
+        self.blit = blit
+        self.shown = None
+        self.charts = {}
+
+    def is_current(self, name, version):
+        """
+        Kiểm tra biểu đồ `name` đã được vẽ với phiên bản dữ liệu `version` hay chưa.
+        """
+        chart = self.charts.get(name)
+        return chart is not None and chart.version == version
+
+    @traced
+    def show(self, name, data=None, version=None):
+        """
+        Hiển thị một biểu đồ, vẽ hoặc cập nhật theo `data` nếu biểu đồ chưa khớp với phiên bản dữ liệu `version`.
+
+        Tham số:
+            name (str): Loại biểu đồ, một khóa của `CHART_TYPES`.
+            data (tùy chọn): Dữ liệu của biểu đồ; có thể bỏ qua nếu biểu đồ đã được vẽ.
+            version (int, tùy chọn): Phiên bản dữ liệu của `data`.
+
+        Ngoại lệ:
+            ValueError: Nếu dữ liệu không đủ để vẽ biểu đồ.
+        """
+        chart = self.charts.get(name)
+        if chart is None:
+            chart = self.charts[name] = ChartCanvas(self.master, CHART_TYPES[name], data, version, self.blit)
+        elif data is not None and chart.version != version:
+            chart.update(data, version)
+        if self.shown != name:
+            if self.shown is not None:
+                self.charts[self.shown].widget.pack_forget()
+            chart.widget.pack(fill="y", expand=True)
+            self.shown = name
+
+    def clear(self):
+        """
+        Hủy tất cả các canvas đã tạo.
+        """
+        for chart in self.charts.values():
+            chart.destroy()
+        self.charts.clear()
+        self.shown = None
+
+
+@traced
+def save_chart(build_figure, data, file_name, dpi=100):
+    """
+    Tạo biểu đồ bằng `build_figure(data)` và lưu ra file ảnh (ví dụ PNG), không cần giao diện.
 
     Tham số:
-        chart_display_frame (tkinter.Frame): Khung giao diện cần được làm sạch.
+        build_figure (callable): Hàm tạo figure từ dữ liệu, ví dụ `CHART_TYPES["pie"].figure`.
+        data: Dữ liệu của biểu đồ (xem `ChartType.source`).
+        file_name (str): Đường dẫn file ảnh; định dạng theo phần mở rộng.
+        dpi (int, tùy chọn): Độ phân giải ảnh.
+
+    Ngoại lệ:
+        ValueError: Nếu dữ liệu không đủ để vẽ biểu đồ.
     """
-    for widget in chart_display_frame.winfo_children():
-        widget.destroy()
\ No newline at end of file
+    build_figure(data).savefig(file_name, dpi=dpi, bbox_inches="tight")
@@ -0,0 +1,235 @@
+"""
+Chế độ dòng lệnh (không cần giao diện) cho các thao tác hàng loạt trên dữ liệu.
+
+Ví dụ:
+    python src/cli.py --data data/dataset.csv append new_answers.csv
+    python src/cli.py search --where "Student Country=Portugal" --where "Topic=Algebra" --output result.csv
+    python src/cli.py sort "Question ID" --descending --output sorted.csv
+    python src/cli.py delete --where "Topic=Test Topic"
+    python src/cli.py purge
+    python src/cli.py aggregate --output reports/ --statistics
+    python src/cli.py chart stacked-bar --output chart.png
+    python src/cli.py --trace trace.json search --where "Topic=Algebra" --output result.csv
+"""
+import argparse
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd
+
+from chart_utils import CHART_TYPES, save_chart
+from data_manager import CATEGORICAL_COLUMNS, COLUMN_NAMES
+from storage import open_storage
+from tracing import tracer
+
+DEFAULT_DATA_FILE = "./data/dataset.csv"
+CHUNK_SIZE = 100000
+
+
+def parse_filters(filters):
+    """
+    Đổi các điều kiện dạng "Cột=giá trị" thành danh sách giá trị tìm kiếm theo thứ tự `COLUMN_NAMES`.
+
+    Ngoại lệ:
+        ValueError: Nếu điều kiện sai định dạng hoặc tên cột không tồn tại.
+    """
+    search_values = [""] * len(COLUMN_NAMES)
+    for item in filters or []:
+        column, separator, value = item.partition("=")
+        column = column.strip()
+        if not separator or column not in COLUMN_NAMES:
+            raise ValueError(f"Điều kiện không hợp lệ: {item!r} "
+                             f"(cần dạng 'Cột=giá trị', cột là một trong {COLUMN_NAMES})")
+        search_values[COLUMN_NAMES.index(column)] = value.strip()
+    return search_values
+
+
+def write_view(view, output, page_size=CHUNK_SIZE):
+    """
+    Ghi toàn bộ một khung nhìn dữ liệu (ví dụ `sorted_view`, `search_view`) ra CSV, từng trang `page_size` hàng.
+
+    Tham số:
+        view: Khung nhìn có `len()` và `fetch_rows(start, stop)`.
+        output (file): File văn bản đã mở để ghi.
+
+    Trả về:
+        int: Số hàng đã ghi.
+    """
+    pd.DataFrame(columns=COLUMN_NAMES).to_csv(output, sep=";", index=False)
+    for start in range(0, len(view), page_size):
+        rows = view.fetch_rows(start, start + page_size)
+        pd.DataFrame([values for _, values in rows], columns=COLUMN_NAMES).to_csv(
+            output, sep=";", index=False, header=False)
+    return len(view)
+
+
+def _open_output(path):
+    return open(path, "w", encoding="utf-8", newline="") if path and path != "-" else sys.stdout
+
+
+def command_append(storage, arguments):
+    total = 0
+    for csv_file in arguments.files:
+        chunks = pd.read_csv(csv_file, delimiter=";", encoding="utf-8", chunksize=arguments.chunksize,
+                             dtype={column: "category" for column in CATEGORICAL_COLUMNS})
+        for chunk in chunks:
+            total += storage.append_rows(chunk)
+    print(f"Đã thêm {total} hàng.", file=sys.stderr)
+
+
+def command_search(storage, arguments):
+    view = storage.search_view(parse_filters(arguments.where))
+    output = _open_output(arguments.output)
+    try:
+        count = write_view(view, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Tìm thấy {count} hàng.", file=sys.stderr)
+
+
+def command_sort(storage, arguments):
+    if arguments.column not in COLUMN_NAMES:
+        raise ValueError(f"Cột không tồn tại: {arguments.column!r}")
+    view = storage.sorted_view(arguments.column, ascending=not arguments.descending)
+    output = _open_output(arguments.output)
+    try:
+        write_view(view, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def command_delete(storage, arguments):
+    search_values = parse_filters(arguments.where)
+    if arguments.dry_run:
+        print(f"Sẽ xóa {len(storage.search_view(search_values))} hàng.", file=sys.stderr)
+        return
+    print(f"Đã xóa {storage.delete_where(search_values)} hàng.", file=sys.stderr)
+
+
+def command_purge(storage, arguments):
+    print(f"Đã xóa {storage.purge_rejected()} hàng không hợp lệ khỏi file dữ liệu.", file=sys.stderr)
+
+
+def command_aggregate(storage, arguments):
+    os.makedirs(arguments.output, exist_ok=True)
+    aggregates = storage.aggregates()
+    tables = {
+        "country_answer.csv": aggregates.country_answer_table(),
+        "question_levels.csv": aggregates.level_counts(),
+        "topics.csv": aggregates.topic_counts(),
+    }
+    if arguments.statistics:
+        statistics = storage.statistics(workers=arguments.workers)
+        tables.update({
+            "students.csv": statistics.students,
+            "questions.csv": statistics.questions,
+            "topic_success.csv": statistics.topics,
+        })
+    for name, table in tables.items():
+        table.to_csv(os.path.join(arguments.output, name), sep=";")
+    print(f"Đã ghi {len(tables)} bảng vào {arguments.output}.", file=sys.stderr)
+
+
+def command_chart(storage, arguments):
+    chart_type = CHART_TYPES[arguments.type]
+    data = storage.statistics(workers=arguments.workers) if chart_type.source == "statistics" else storage.aggregates()
+    save_chart(chart_type.figure, data, arguments.output, dpi=arguments.dpi)
+    print(f"Đã lưu biểu đồ vào {arguments.output}.", file=sys.stderr)
+
+
+def build_parser():
+    """
+    Tạo bộ phân tích tham số dòng lệnh.
+    """
+    parser = argparse.ArgumentParser(description="Thao tác hàng loạt trên dữ liệu câu trả lời, không cần giao diện.")
+    parser.add_argument("--data", default=DEFAULT_DATA_FILE,
+                        help="File dữ liệu: CSV, hoặc SQLite (.db/.sqlite). Mặc định: %(default)s")
+    parser.add_argument("--stream", action="store_true", help="Đọc file CSV theo từng phần, chỉ đọc.")
+    parser.add_argument("--fsync", choices=["always", "interval", "never"], default="always",
+                        help="Chế độ đồng bộ nhật ký thay đổi của file CSV.")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Ghi thời gian các thao tác ra FILE (định dạng Chrome trace, xem `tracing`).")
+    parser.add_argument("--unique-pairs", action="store_true",
+                        help="Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    append = commands.add_parser("append", help="Thêm tất cả các hàng từ các file CSV khác.")
+    append.add_argument("files", nargs="+")
+    append.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Số hàng thêm mỗi lô.")
+    append.set_defaults(handler=command_append)
+
+    search = commands.add_parser("search", help="Tìm kiếm theo nhiều cột và xuất kết quả ra CSV.")
+    search.add_argument("--where", action="append", metavar="COLUMN=VALUE",
+                        help="Điều kiện chuỗi con, không phân biệt chữ hoa chữ thường; có thể lặp lại.")
+    search.add_argument("--output", help="File CSV kết quả (mặc định: stdout).")
+    search.set_defaults(handler=command_search)
+
+    sort = commands.add_parser("sort", help="Sắp xếp theo một cột và xuất ra CSV.")
+    sort.add_argument("column")
+    sort.add_argument("--descending", action="store_true")
+    sort.add_argument("--output", help="File CSV kết quả (mặc định: stdout).")
+    sort.set_defaults(handler=command_sort)
+
+    delete = commands.add_parser("delete", help="Xóa tất cả các hàng thỏa mãn bộ lọc.")
+    delete.add_argument("--where", action="append", required=True, metavar="COLUMN=VALUE")
+    delete.add_argument("--dry-run", action="store_true", help="Chỉ đếm số hàng sẽ bị xóa.")
+    delete.set_defaults(handler=command_delete)
+
+    purge = commands.add_parser("purge", help="Xóa khỏi file dữ liệu các hàng không hợp lệ đã được cách ly.")
+    purge.set_defaults(handler=command_purge)
+
+    aggregate = commands.add_parser("aggregate", help="Xuất các bảng thống kê ra CSV.")
+    aggregate.add_argument("--output", required=True, help="Thư mục chứa các file CSV.")
+    aggregate.add_argument("--statistics", action="store_true",
+                           help="Xuất thêm thống kê theo học sinh, câu hỏi và chủ đề/quốc gia.")
+    aggregate.add_argument("--workers", type=int, help="Số tiến trình dùng để tính thống kê.")
+    aggregate.set_defaults(handler=command_aggregate)
+
+    chart = commands.add_parser("chart", help="Vẽ biểu đồ ra file ảnh (PNG).")
+    chart.add_argument("type", choices=sorted(CHART_TYPES))
+    chart.add_argument("--output", required=True, help="File ảnh, ví dụ chart.png.")
+    chart.add_argument("--dpi", type=int, default=100)
+    chart.add_argument("--workers", type=int, help="Số tiến trình dùng để tính thống kê.")
+    chart.set_defaults(handler=command_chart)
+    return parser
+
+
+def main(argv=None):
+    """
+    Điểm vào của chế độ dòng lệnh.
+
+    Trả về:
+        int: Mã thoát (0 nếu thành công).
+    """
+    arguments = build_parser().parse_args(argv)
+    tracer.enabled = bool(arguments.trace)
+
+    def notify(level, title, message):
+        print(f"{title}: {message}", file=sys.stderr)
+
+    storage = open_storage(arguments.data, notify=notify, streaming=arguments.stream,
+                           unique_pairs=arguments.unique_pairs, fsync=arguments.fsync, compact_every=None)
+    try:
+        arguments.handler(storage, arguments)
+    except (ValueError, KeyError, NotImplementedError) as error:
+        print(f"Lỗi: {error}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Đầu ra được chuyển tới một lệnh đã đóng (ví dụ `| head`): dừng lặng lẽ.
+        sys.stdout = None
+        return 0
+    finally:
+        storage.close()
+        if arguments.trace:
+            tracer.export_chrome_trace(arguments.trace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Kiểu mảng có mặt nạ giá trị rỗng của pandas, theo loại kiểu numpy của mảng giá trị.
+MASKED_ARRAYS = {
+    "i": pd.arrays.IntegerArray,
+    "u": pd.arrays.IntegerArray,
+    "b": pd.arrays.BooleanArray,
+    "f": pd.arrays.FloatingArray,
+}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Tính mã băm SHA-1 của nội dung một file, đọc theo từng khối.
+
+    Tham số:
+        path (str): Đường dẫn tới file.
+        chunk_size (int, tùy chọn): Kích thước mỗi khối đọc (byte).
+
+    Trả về:
+        str: Mã băm dạng chuỗi hex.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ColumnCache:
+    """
+    Bộ nhớ đệm dạng cột trên đĩa cho một file CSV.
+
+    Mỗi cột của DataFrame được lưu thành một file NumPy `.npy` trong thư mục `.cache/<tên file>/` cạnh file CSV.
+    Cột số được lưu nguyên mảng; cột số có thể rỗng (`Int32`, `boolean`, ...) được lưu thành mảng giá trị và mảng
+    mặt nạ giá trị rỗng; cột chuỗi được mã hóa từ điển (mảng mã số nguyên + danh sách giá trị phân biệt),
+    và các cột trong `categorical_columns` được khôi phục dưới dạng `category`. Bộ đệm gắn với kích thước,
+    thời gian sửa đổi và mã băm SHA-1 của file CSV nên chỉ được dùng khi file CSV chưa thay đổi.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, source_path, categorical_columns=(), mmap=False):
+        """
+        Khởi tạo bộ nhớ đệm.
+
+        Tham số:
+            source_path (str): Đường dẫn tới file CSV gốc.
+            categorical_columns (iterable, tùy chọn): Các cột được khôi phục dưới dạng `category`.
+            mmap (bool, tùy chọn): Ánh xạ bộ nhớ (chỉ đọc) các mảng số thay vì đọc toàn bộ vào RAM.
+        """
+        self.source_path = source_path
+        self.categorical_columns = set(categorical_columns)
+        self.mmap = mmap
+        directory, name = os.path.split(os.path.abspath(source_path))
+        self.directory = os.path.join(directory, ".cache", name)
+
+    def load(self):
+        """
+        Tải DataFrame từ bộ nhớ đệm nếu bộ đệm còn hợp lệ.
+
+        Nếu kích thước hoặc thời gian sửa đổi của file CSV khác với lúc ghi bộ đệm, mã băm nội dung được
+        so sánh lại; bộ đệm chỉ bị loại bỏ khi nội dung file thực sự thay đổi.
+
+        Trả về:
+            pandas.DataFrame hoặc None: Dữ liệu đã lưu, hoặc None nếu bộ đệm không tồn tại hoặc đã cũ.
+        """
+        meta = self._read_meta()
+        if meta is None or not os.path.exists(self.source_path):
+            return None
+        stat = os.stat(self.source_path)
+        source = meta["source"]
+        if (source["size"], source["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            if source["size"] != stat.st_size or file_digest(self.source_path) != source["sha1"]:
+                return None
+            source["mtime_ns"] = stat.st_mtime_ns
+            self._write_meta(meta)
+        try:
+            columns = {column["name"]: self._load_column(column) for column in meta["columns"]}
+        except (OSError, ValueError, KeyError):
+            return None
+        return pd.DataFrame(columns, columns=[column["name"] for column in meta["columns"]])
+
+    def store(self, data, digest=None):
+        """
+        Ghi DataFrame vào bộ nhớ đệm, gắn với trạng thái hiện tại của file CSV gốc.
+
+        Các file cột được ghi trước, file `meta.json` được đổi tên nguyên tử sau cùng, vì vậy bộ đệm ghi dở
+        không bao giờ được đọc. Lỗi ghi bộ đệm được bỏ qua vì file CSV vẫn là nguồn dữ liệu chính.
+
+        Tham số:
+            data (pandas.DataFrame): Dữ liệu tương ứng với nội dung file CSV.
+            digest (str, tùy chọn): Mã băm SHA-1 của file CSV nếu đã biết.
+        """
+        if not os.path.exists(self.source_path):
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            stat = os.stat(self.source_path)
+            token = uuid.uuid4().hex[:8]
+            columns = [self._store_column(i, name, data[name], token) for i, name in enumerate(data.columns)]
+            meta = {
+                "source": {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha1": digest or file_digest(self.source_path),
+                },
+                "rows": len(data),
+                "columns": columns,
+            }
+            self._write_meta(meta)
+            self._remove_stale_files(columns)
+        except OSError:
+            pass
+
+    def _load_column(self, column):
+        path = os.path.join(self.directory, column["file"])
+        if column["kind"] == "numeric":
+            return np.load(path, mmap_mode="r" if self.mmap else None, allow_pickle=False)
+        if column["kind"] == "masked":
+            values = np.load(path, allow_pickle=False)
+            mask = np.load(os.path.join(self.directory, column["mask"]), allow_pickle=False)
+            return MASKED_ARRAYS[values.dtype.kind](values, mask)
+        codes = np.load(path, allow_pickle=False)
+        with open(os.path.join(self.directory, column["values"]), encoding="utf-8") as handle:
+            values = json.load(handle)
+        if column["kind"] == "categorical":
+            return pd.Categorical.from_codes(codes, categories=values)
+        strings = np.asarray(values + [np.nan], dtype=object)
+        return strings.take(codes)
+
+    def _store_column(self, position, name, series, token):
+        base = f"{position}.{token}"
+        if name not in self.categorical_columns and isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            file_name = base + ".npy"
+            np.save(os.path.join(self.directory, file_name), series.to_numpy(), allow_pickle=False)
+            return {"name": name, "kind": "numeric", "file": file_name}
+        if isinstance(series.array, tuple(MASKED_ARRAYS.values())):
+            file_name, mask_name = base + ".npy", base + ".mask.npy"
+            np.save(os.path.join(self.directory, file_name),
+                    series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0), allow_pickle=False)
+            np.save(os.path.join(self.directory, mask_name), series.isna().to_numpy(), allow_pickle=False)
+            return {"name": name, "kind": "masked", "file": file_name, "mask": mask_name}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            values = series.cat.categories
+        else:
+            codes, values = pd.factorize(series, use_na_sentinel=True)
+        values = [str(value) for value in values]
+        codes = codes.astype(np.int32 if len(values) >= 1 << 15 else np.int16)
+        file_name = base + ".npy"
+        values_name = base + ".json"
+        np.save(os.path.join(self.directory, file_name), codes, allow_pickle=False)
+        with open(os.path.join(self.directory, values_name), "w", encoding="utf-8") as handle:
+            json.dump(values, handle, ensure_ascii=False)
+        kind = "categorical" if name in self.categorical_columns else "string"
+        return {"name": name, "kind": kind, "file": file_name, "values": values_name}
+
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.directory, self.META_FILE), encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta):
+        path = os.path.join(self.directory, self.META_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _remove_stale_files(self, columns):
+        keep = {self.META_FILE}
+        for column in columns:
+            keep.add(column["file"])
+            keep.update(column[key] for key in ("values", "mask") if key in column)
+        for file_name in os.listdir(self.directory):
+            if file_name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
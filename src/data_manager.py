@@ -1,60 +1,276 @@
 import pandas as pd
 import os
-from tkinter import messagebox
+import threading
+from journal import ChangeJournal, fsync_directory
+from column_cache import ColumnCache
+from search_index import SearchIndex
+from keyword_index import KeywordIndex
+from aggregate_cache import AggregateCache
+from sort_index import ColumnSortIndex, SortedView
+from storage import StorageEngine, FrameView
+from analytics import ANALYTICS_COLUMNS, compute_statistics
+from tracing import span, traced
+from schema import COLUMN_NAMES, CATEGORICAL_COLUMNS, apply_schema, coerce_row, conform, memory_report
+from validation import REASON_COLUMN, PairIndex, as_written, check_rows, validate, quarantine
 
-COLUMN_NAMES = ["Student ID", "Student Country", "Question ID", "Type of Answer", "Question Level", "Topic", "Subtopic", "Keywords"]
 
-class DataManager:
+class DataManager(StorageEngine):
     """
     Quản lý dữ liệu cho ứng dụng.
 
     Lớp này chịu trách nhiệm tải, lưu, thao tác và tìm kiếm dữ liệu. Dữ liệu được lưu trữ trong một file CSV.
+    Các thao tác thêm/sửa/xóa không ghi lại toàn bộ file CSV mà được ghi nối vào một nhật ký thay đổi
+    (`<file_name>.journal`); nhật ký được phát lại khi tải dữ liệu và định kỳ được nén trở lại file CSV.
+    Nội dung file CSV đã phân tích được lưu đệm dạng cột (xem `ColumnCache`) để lần khởi động sau không phải đọc lại
+    CSV.
+    Tìm kiếm có thể dùng chỉ mục theo cột (xem `SearchIndex`), được xây dựng ở lần tìm kiếm đầu tiên và cập nhật
+    tăng dần sau mỗi thao tác. Các bảng đếm cho biểu đồ (xem `AggregateCache`) và các hoán vị sắp xếp theo cột
+    (xem `ColumnSortIndex`) cũng được cập nhật tăng dần như vậy.
+    Các cột của `self.data` có kiểu gọn theo `schema.SCHEMA` (số nguyên nhỏ có thể rỗng, `category`); kiểu này
+    được giữ nguyên khi thêm/sửa hàng (xem `memory_report`).
+    Các hàng đưa vào dữ liệu được kiểm tra bằng `validation` theo cùng một bộ quy tắc (quy tắc không trùng cặp
+    (Student ID, Question ID) chỉ khi bật `unique_pairs`), để dữ liệu đã được chấp nhận luôn hợp lệ: khi đọc file CSV
+    và khi thêm hàng loạt, các hàng không hợp lệ được chuyển vào file cách ly `<file_name>.quarantine.csv` kèm lý do;
+    `add_data` và các thao tác sửa ném `ValueError`. Việc tải dữ liệu không bao giờ ghi lại file CSV: các hàng không
+    hợp lệ của file chỉ bị bỏ qua trong bộ nhớ và được giữ nguyên trong file khi nén nhật ký, cho tới khi người dùng
+    yêu cầu xóa chúng (xem `purge_rejected`).
+
+    Các phương thức công khai được bảo vệ bởi `self.lock` nên có thể được gọi từ luồng nền (xem `TaskRunner`).
     """
 
-    def __init__(self, file_name="./data/dataset.csv"):
+    def __init__(self, file_name="./data/dataset.csv", fsync="always", compact_every=1000, use_cache=True,
+                 use_search_index=True, use_validation=True, unique_pairs=False, notify=None):
         """
         Khởi tạo đối tượng DataManager.
 
         Tham số:
             file_name (str, tùy chọn): Đường dẫn tới file CSV chứa dữ liệu. Mặc định là "./dataset.csv".
+            fsync (str, tùy chọn): Chế độ đồng bộ nhật ký xuống đĩa ("always", "interval" hoặc "never").
+            compact_every (int, tùy chọn): Tự động nén nhật ký vào file CSV sau số thao tác này.
+                Dùng None để chỉ nén khi gọi `compact()`.
+            use_cache (bool, tùy chọn): Dùng bộ nhớ đệm dạng cột trên đĩa để tăng tốc khởi động.
+            use_search_index (bool, tùy chọn): Dùng chỉ mục tìm kiếm thay vì quét toàn bộ dữ liệu mỗi lần tìm kiếm.
+            use_validation (bool, tùy chọn): Kiểm tra và cách ly các hàng không hợp lệ (xem `validation`).
+            unique_pairs (bool, tùy chọn): Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ. Mặc định
+                tắt, vì một học sinh có thể trả lời lại cùng một câu hỏi.
+            notify (callable, tùy chọn): Hàm `notify(level, title, message)` nhận các thông báo lỗi/cảnh báo
+                ("error", "warning", "info"). Mặc định hiển thị bằng `messagebox`.
         """
         self.file_name = file_name
+        self.notify = notify
+        self.lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self.compact_every = compact_every
+        self.cache = ColumnCache(file_name, categorical_columns=CATEGORICAL_COLUMNS) if use_cache else None
+        self.use_search_index = use_search_index
+        self.use_validation = use_validation
+        self.unique_pairs = unique_pairs
+        self.rejected = None
+        self.quarantine_file = file_name + ".quarantine.csv"
+        self.search_index = None
+        self._keyword_index = None
+        self._aggregates = None
+        self._sort_indexes = {}
+        self._pairs = None
+        self.version = 0
+        self.journal = ChangeJournal(file_name + ".journal", fsync=fsync)
         self.data = self.load_data()
 
+    @traced
     def load_data(self):
         """
         Tải dữ liệu từ file CSV.
 
-        Kiểm tra sự tồn tại của file và đọc dữ liệu bằng pandas.read_csv(). Trả về một DataFrame rỗng nếu gặp lỗi.
+        Kiểm tra sự tồn tại của file và đọc dữ liệu từ bộ nhớ đệm dạng cột nếu file chưa thay đổi, nếu không
+        thì đọc bằng pandas.read_csv() và ghi lại bộ đệm. Sau đó phát lại các thao tác còn trong nhật ký thay đổi.
+        Dữ liệu đọc từ file CSV được kiểm tra; các hàng không hợp lệ không được nạp mà được giữ trong `self.rejected`
+        (file CSV không bị sửa) và chỉ được ghi vào file cách ly ở lần tải đầu tiên của mỗi phiên bản file CSV (khi
+        nhật ký chưa gắn với file đó), nên chúng không bị cách ly lại ở các lần tải sau.
+        Trả về một DataFrame rỗng nếu gặp lỗi.
         """
+        with self.lock:
+            return self._load_data()
+
+    def _load_data(self):
+        records = self._replay_journal()
+        rejected = None
         if os.path.exists(self.file_name):
             try:
-                return pd.read_csv(self.file_name, delimiter=";", encoding="utf-8")
+                with span("DataManager.load_cache"):
+                    data = self.cache.load() if self.cache else None
+                from_cache = data is not None
+                if not from_cache:
+                    with span("DataManager.read_csv", file=self.file_name):
+                        data = pd.read_csv(self.file_name, delimiter=";", encoding="utf-8",
+                                           dtype={column: "category" for column in CATEGORICAL_COLUMNS})
+                    # Kiểm tra trước khi đổi kiểu, vì `apply_schema` biến giá trị sai kiểu thành rỗng. Các hàng bị loại
+                    # là như nhau ở mọi lần tải cùng một file, nên vị trí hàng trong nhật ký vẫn khớp. Bộ đệm chỉ
+                    # được ghi khi file không có hàng nào bị loại, vì vậy dữ liệu đọc từ bộ đệm không cần kiểm tra.
+                    if self.use_validation:
+                        with span("DataManager.validate", rows=len(data)):
+                            data, rejected = validate(data, unique_pairs=self.unique_pairs)
+                        data = data.reset_index(drop=True)
+                data = apply_schema(data)
+                if self.cache and not from_cache and (rejected is None or not len(rejected)):
+                    with span("DataManager.store_cache", rows=len(data)):
+                        self.cache.store(data)
             except Exception as e:
-                messagebox.showerror("Lỗi", f"Không thể đọc file: {e}")
-                return pd.DataFrame(columns=COLUMN_NAMES)
+                self._notify("error", "Lỗi", f"Không thể đọc file: {e}")
+                data = pd.DataFrame(columns=COLUMN_NAMES)
         else:
-            messagebox.showwarning("Cảnh báo", "File không tồn tại. Sử dụng dữ liệu mặc định.")
-            return pd.DataFrame(columns=COLUMN_NAMES)
+            self._notify("warning", "Cảnh báo", "File không tồn tại. Sử dụng dữ liệu mặc định.")
+            data = pd.DataFrame(columns=COLUMN_NAMES)
+        self.data = apply_schema(data)
+        self._next_id = int(self.data.index.max()) + 1 if len(self.data) else 0
+        self.search_index = None
+        self._keyword_index = None
+        self._aggregates = None
+        self._sort_indexes = {}
+        self._pairs = None
+        self.version += 1
+        self.rejected = None
+        if rejected is not None and len(rejected):
+            self.rejected = rejected.drop(columns=REASON_COLUMN)
+            if not self.journal.attached:
+                self._quarantine(rejected)
+        with span("DataManager.replay_journal"):
+            for record in records:
+                self._apply(record)
+        if not self.journal.attached:
+            self.journal.reset(self.file_name)
+        return self.data
 
-    def save_data(self):
+    @traced
+    def save_data(self, purge=False):
         """
         Lưu dữ liệu vào file CSV.
 
-        Sử dụng pandas.to_csv() để lưu nội dung của DataFrame `self.data` vào file được chỉ định bởi `self.file_name`.
+        Sử dụng pandas.to_csv() để ghi nội dung của DataFrame `self.data` ra một file tạm và đồng bộ xuống đĩa.
+        Các hàng không hợp lệ bị bỏ qua khi tải (`self.rejected`) được ghi lại nguyên vẹn ở cuối file, trừ khi
+        `purge` được bật. Nhật ký thay đổi được làm rỗng (mọi thao tác trong đó đã nằm trong file mới), rồi file tạm
+        được đổi tên nguyên tử thành `self.file_name`. Bộ nhớ đệm dạng cột được ghi lại từ dữ liệu trong bộ nhớ khi
+        các cột còn giữ kiểu dữ liệu rõ ràng; nếu không, bộ đệm cũ hết hiệu lực và file CSV sẽ được đọc lại ở lần
+        tải sau.
+
+        File CSV được ghi từ một bản chụp của dữ liệu mà không giữ `self.lock`, vì vậy khi chạy trong luồng nền,
+        các thao tác thêm/sửa/xóa vẫn tiếp tục được; các thao tác đó được giữ lại trong nhật ký mới.
+
+        Tham số:
+            purge (bool, tùy chọn): Xóa vĩnh viễn các hàng không hợp lệ khỏi file CSV (xem `purge_rejected`).
+        """
+        with self._save_lock:
+            with self.lock:
+                snapshot = self.data.copy()
+                carry_from = self.journal.tell()
+                rejected = None if purge else self.rejected
+            tmp_name = self.file_name + ".tmp"
+            with open(tmp_name, "w", encoding="utf-8", newline="") as handle:
+                with span("DataManager.to_csv", rows=len(snapshot)):
+                    snapshot.to_csv(handle, sep=";", index=False)
+                    if rejected is not None:
+                        as_written(rejected).reindex(columns=snapshot.columns).to_csv(
+                            handle, sep=";", index=False, header=False)
+                handle.flush()
+                if self.journal.fsync != "never":
+                    with span("DataManager.fsync"):
+                        os.fsync(handle.fileno())
+            with self.lock:
+                # Nhật ký mới được ghi trước, gắn với chữ ký của file tạm (giữ nguyên khi đổi tên): nếu chương trình
+                # dừng trước khi file tạm thay file CSV, lần tải sau hoàn tất việc thay thế (xem `_replay_journal`)
+                # thay vì bỏ mất các thao tác được giữ lại trong nhật ký.
+                self.journal.reset(tmp_name, carry_from=carry_from)
+                os.replace(tmp_name, self.file_name)
+                if self.journal.fsync != "never":
+                    fsync_directory(self.file_name)
+                if purge:
+                    self.rejected = None
+            # Bộ đệm chỉ chứa các hàng hợp lệ, nên không được dùng thay cho file còn giữ các hàng không hợp lệ.
+            if self.cache and rejected is None and not (snapshot.dtypes == object).any():
+                with span("DataManager.store_cache", rows=len(snapshot)):
+                    self.cache.store(snapshot)
+
+    def _replay_journal(self):
+        """
+        Đọc lại nhật ký thay đổi của file CSV (xem `ChangeJournal.replay`).
+
+        Nếu nhật ký không khớp với file CSV mà khớp với file tạm của `save_data`, lần lưu trước đã dừng giữa lúc
+        ghi nhật ký mới và lúc thay file CSV: file tạm được đổi tên thành file CSV để hoàn tất lần lưu đó.
+        """
+        records = self.journal.replay(self.file_name)
+        tmp_name = self.file_name + ".tmp"
+        if not self.journal.attached and os.path.exists(tmp_name):
+            records = self.journal.replay(tmp_name)
+            if self.journal.attached:
+                os.replace(tmp_name, self.file_name)
+        return records
+
+    def row_count(self):
+        """
+        Tổng số hàng dữ liệu.
+        """
+        return len(self.data)
+
+    def pending_changes(self):
+        """
+        Số thao tác trong nhật ký thay đổi chưa được nén vào file CSV.
+        """
+        return len(self.journal)
+
+    @traced
+    def compact(self):
+        """
+        Nén nhật ký thay đổi vào file CSV gốc.
+
+        Chỉ ghi lại file CSV khi nhật ký còn thao tác chưa được nén.
+        """
+        if len(self.journal):
+            self.save_data()
+
+    @traced
+    def purge_rejected(self):
+        """
+        Xóa vĩnh viễn khỏi file CSV các hàng không hợp lệ đã bị bỏ qua khi tải (bản sao của chúng nằm trong file
+        cách ly).
+
+        Trả về:
+            int: Số hàng đã xóa.
+        """
+        with self.lock:
+            count = len(self.rejected) if self.rejected is not None else 0
+        if count:
+            self.save_data(purge=True)
+        return count
+
+    def close(self):
+        """
+        Nén nhật ký thay đổi vào file CSV và đóng file nhật ký.
         """
-        self.data.to_csv(self.file_name, sep=";", index=False, encoding="utf-8")
+        self.compact()
+        with self.lock:
+            self.journal.close()
 
+    @traced
     def add_data(self, new_data):
         """
         Thêm một hàng dữ liệu mới vào DataFrame.
 
+        Các giá trị được đổi sang kiểu của từng cột (xem `schema.coerce_row`) và được kiểm tra (xem `validation`)
+        trước khi ghi.
+
         Tham số:
             new_data (list): Danh sách các giá trị tương ứng với các cột trong DataFrame.
+
+        Ngoại lệ:
+            ValueError: Nếu có giá trị không hợp lệ với kiểu của cột (ví dụ chữ trong cột số), giá trị ngoài miền
+                cho phép, cột bắt buộc bị rỗng, hoặc cặp (Student ID, Question ID) đã có trong dữ liệu.
         """
-        self.data.loc[len(self.data)] = new_data
-        self.save_data()
+        row = coerce_row(new_data)
+        with self.lock:
+            if self.use_validation:
+                self._check_rows([row])
+            self._commit({"op": "add", "row": row})
 
+    @traced
     def delete_data(self, indices):
         """
         Xóa các hàng dữ liệu được chọn.
@@ -62,9 +278,9 @@ class DataManager:
         Tham số:
             indices (list): Danh sách các chỉ số của các hàng cần xóa.
         """
-        self.data.drop(self.data.index[indices])
-        self.save_data()
+        self._commit({"op": "delete", "indices": [int(i) for i in indices]})
 
+    @traced
     def update_data(self, index, updated_data):
         """
         Cập nhật dữ liệu của một hàng cụ thể.
@@ -72,34 +288,465 @@ class DataManager:
         Tham số:
             index (int): Chỉ số của hàng cần cập nhật.
             updated_data (list): Danh sách các giá trị mới cho hàng được cập nhật.
+
+        Ngoại lệ:
+            ValueError: Nếu có giá trị không hợp lệ với kiểu hoặc miền giá trị của cột, cột bắt buộc bị rỗng, hoặc
+                cặp (Student ID, Question ID) mới đã có ở một hàng khác.
+        """
+        row = coerce_row(updated_data)
+        with self.lock:
+            if self.use_validation:
+                self._check_rows([row], replacing=[int(index)])
+            self._commit({"op": "update", "index": int(index), "row": row})
+
+    def positions_of(self, row_ids):
+        """
+        Đổi mã định danh hàng thành vị trí hàng trong `self.data`.
+
+        Mã định danh hàng là nhãn chỉ mục của DataFrame: mỗi hàng giữ nguyên mã của mình khi các hàng khác
+        được thêm, xóa hay khi dữ liệu được sắp xếp/lọc để hiển thị, và mã của hàng đã xóa không được dùng lại
+        trong cùng phiên làm việc. Việc tra cứu dùng bảng băm của chỉ mục pandas.
+
+        Tham số:
+            row_ids (list): Danh sách mã định danh hàng.
+
+        Trả về:
+            numpy.ndarray: Vị trí tương ứng của từng hàng.
+
+        Ngoại lệ:
+            KeyError: Nếu có mã định danh không tồn tại.
+        """
+        with self.lock:
+            positions = self.data.index.get_indexer(list(row_ids))
+        if (positions < 0).any():
+            missing = [row_id for row_id, position in zip(row_ids, positions) if position < 0]
+            raise KeyError(f"Không tìm thấy hàng: {missing}")
+        return positions
+
+    @traced
+    def update_rows(self, row_ids, updated_data):
+        """
+        Cập nhật nhiều hàng cùng lúc theo mã định danh hàng.
+
+        Tất cả các hàng nhận cùng một danh sách giá trị mới; thao tác được ghi thành một bản ghi duy nhất trong nhật ký.
+        Vì vậy sửa nhiều hàng cùng lúc sẽ tạo ra các cặp (Student ID, Question ID) trùng nhau và bị từ chối khi bật
+        `unique_pairs`.
+
+        Tham số:
+            row_ids (list): Danh sách mã định danh các hàng cần cập nhật.
+            updated_data (list): Danh sách các giá trị mới cho các hàng được cập nhật.
+
+        Ngoại lệ:
+            KeyError: Nếu có mã định danh không tồn tại.
+            ValueError: Nếu có giá trị không hợp lệ với kiểu hoặc miền giá trị của cột, cột bắt buộc bị rỗng, hoặc
+                khi bật `unique_pairs`, các hàng sau khi sửa trùng cặp (Student ID, Question ID) với nhau hoặc với một
+                hàng khác.
+        """
+        row = coerce_row(updated_data)
+        with self.lock:
+            positions = self.positions_of(row_ids)
+            if self.use_validation:
+                self._check_rows([row] * len(positions), replacing=positions)
+            self._commit({"op": "update", "indices": [int(i) for i in positions], "row": row})
+
+    @traced
+    def delete_rows(self, row_ids):
+        """
+        Xóa nhiều hàng cùng lúc theo mã định danh hàng, ghi thành một bản ghi duy nhất trong nhật ký.
+
+        Tham số:
+            row_ids (list): Danh sách mã định danh các hàng cần xóa.
+        """
+        with self.lock:
+            self.delete_data(self.positions_of(row_ids))
+
+    @traced
+    def append_rows(self, rows):
+        """
+        Thêm nhiều hàng cùng lúc, ghi thành một bản ghi duy nhất trong nhật ký.
+
+        Các hàng được nối vào DataFrame bằng một lần `concat`; các chỉ mục tìm kiếm và từ khóa, các bảng đếm và
+        hoán vị sắp xếp đã xây dựng được cập nhật theo lô (xem `_append`). Cả lô được kiểm tra một lần (xem
+        `validation`); các hàng không hợp lệ (kể cả, khi bật `unique_pairs`, các hàng trùng cặp
+        (Student ID, Question ID) với dữ liệu hiện có) được chuyển vào file cách ly thay vì được thêm.
+
+        Tham số:
+            rows (pandas.DataFrame hoặc list): Các hàng cần thêm; DataFrame được sắp lại theo các cột của dữ liệu.
+
+        Trả về:
+            int: Số hàng đã thêm.
+        """
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(list(rows), columns=COLUMN_NAMES)
+        rows = rows.reindex(columns=COLUMN_NAMES)
+        with self.lock:
+            if self.use_validation:
+                rows = self._reject_invalid(rows, self.pair_index() if self.unique_pairs else None)
+            # Chuẩn hóa một lần cho cả lô (NaN thành None, kiểu numpy thành kiểu Python) để nhật ký ghi được ngay.
+            frame = rows.astype(object)
+            rows = frame.where(frame.notna(), None).to_numpy().tolist()
+            if rows:
+                self._commit({"op": "append", "rows": rows})
+        return len(rows)
+
+    @traced
+    def delete_where(self, search_values):
+        """
+        Xóa tất cả các hàng thỏa mãn điều kiện tìm kiếm (xem `search_data`) trong một thao tác.
+
+        Tham số:
+            search_values (list): Danh sách các giá trị tìm kiếm, tương ứng với các cột trong DataFrame.
+
+        Trả về:
+            int: Số hàng đã xóa.
+
+        Ngoại lệ:
+            ValueError: Nếu không có điều kiện nào (để tránh xóa toàn bộ dữ liệu).
+        """
+        if not any(search_values):
+            raise ValueError("Cần ít nhất một điều kiện để xóa theo bộ lọc.")
+        with self.lock:
+            matches = self.search_data(search_values)
+            if len(matches):
+                self.delete_rows(matches.index)
+            return len(matches)
+
+    def _reject_invalid(self, rows, existing=None):
+        """
+        Tách các hàng không hợp lệ (xem `validation.validate`), ghi chúng vào file cách ly và báo cho người dùng.
+
+        Tham số:
+            rows (pandas.DataFrame): Các hàng cần kiểm tra.
+            existing (PairIndex, tùy chọn): Các cặp (Student ID, Question ID) hiện có, xem `pair_index`.
+
+        Trả về:
+            pandas.DataFrame: Các hàng hợp lệ.
+        """
+        with span("DataManager.validate", rows=len(rows)):
+            valid, rejected = validate(rows, existing, self.unique_pairs)
+        if len(rejected):
+            self._quarantine(rejected)
+        return valid
+
+    def _quarantine(self, rejected):
+        """
+        Ghi các hàng bị loại (kèm lý do) vào file cách ly và báo cho người dùng.
+        """
+        quarantine(rejected, self.quarantine_file)
+        self._notify("warning", "Cảnh báo",
+                     f"{len(rejected)} hàng không hợp lệ đã được chuyển vào file {self.quarantine_file}.")
+
+    def _check_rows(self, rows, replacing=None):
+        """
+        Ném `ValueError` kèm lý do nếu một trong các hàng (đã đổi kiểu bằng `coerce_row`) không hợp lệ, xem
+        `validation`. Khi bật `unique_pairs`, các cặp (Student ID, Question ID) được so với `pair_index`.
+
+        Tham số:
+            rows (list): Các hàng mới.
+            replacing (list, tùy chọn): Vị trí các hàng sẽ được thay bằng `rows`; cặp của chúng không tính là trùng.
+        """
+        if not self.unique_pairs:
+            check_rows(rows)
+            return
+        pairs = self.pair_index()
+        old_rows = self.data.iloc[list(replacing)] if replacing is not None else None
+        if old_rows is not None:
+            pairs.remove(old_rows)
+        try:
+            check_rows(rows, pairs, unique_pairs=True)
+        finally:
+            if old_rows is not None:
+                pairs.add(old_rows)
+
+    def pair_index(self):
+        """
+        Lấy chỉ mục các cặp (Student ID, Question ID) của dữ liệu, xây dựng ở lần dùng đầu tiên và cập nhật tăng dần
+        sau đó.
+
+        Trả về:
+            PairIndex: Số lần xuất hiện của mỗi cặp.
+        """
+        with self.lock:
+            if self._pairs is None:
+                with span("DataManager.build_pair_index", rows=len(self.data)):
+                    self._pairs = PairIndex(self.data)
+            return self._pairs
+
+    def _commit(self, record):
+        """
+        Áp dụng một thao tác lên DataFrame, ghi nối nó vào nhật ký và nén nhật ký khi đã đủ dài.
+        """
+        with self.lock:
+            self._apply(record)
+            self.journal.append(record)
+        if self.compact_every and len(self.journal) >= self.compact_every:
+            self.save_data()
+
+    def _apply(self, record):
+        """
+        Áp dụng một bản ghi thao tác (thêm/sửa/xóa) lên DataFrame trong bộ nhớ.
+
+        Bản ghi sửa có thể chứa một vị trí (`index`) hoặc nhiều vị trí (`indices`) cùng nhận một hàng giá trị mới.
+        Bản ghi `append` chứa nhiều hàng mới (`rows`), xem `append_rows`.
+        """
+        op = record["op"]
+        self.version += 1
+        if op == "append":
+            self._append(record["rows"])
+            return
+        if op in ("add", "update"):
+            # Bản ghi từ nhật ký cũ có thể chứa giá trị chưa đổi kiểu (chuỗi); giá trị không hợp lệ thành rỗng.
+            row = coerce_row(record["row"], errors="coerce")
+            new_row = conform(self.data, [row], index=[self._next_id])
+        positions = record["indices"] if "indices" in record else [record.get("index")]
+        if self._aggregates and op in ("update", "delete"):
+            self._aggregates.subtract(self.data.iloc[positions])
+        if self._pairs is not None and op in ("update", "delete"):
+            self._pairs.remove(self.data.iloc[positions])
+        if self._sort_indexes and op in ("update", "delete"):
+            for index in self._sort_indexes.values():
+                index.remove(self.data.index[positions])
+        if op == "add":
+            label = self._next_id
+            self._next_id += 1
+            self.data = pd.concat([self.data, new_row]) if len(self.data) else new_row
+            if self.search_index:
+                self.search_index.append(self.data.iloc[-1])
+            if self._keyword_index:
+                self._keyword_index.append(self.data["Keywords"].iloc[-1:])
+            if self._aggregates:
+                self._aggregates.add_row(self.data.iloc[-1])
+            if self._pairs is not None:
+                self._pairs.add(self.data.iloc[-1:])
+            for column, index in self._sort_indexes.items():
+                index.insert([label], [self.data[column].iloc[-1]])
+        elif op == "update":
+            self.data.iloc[positions] = [row] * len(positions)
+            if self._aggregates:
+                self._aggregates.update(self.data.iloc[positions])
+            if self._pairs is not None:
+                self._pairs.add(self.data.iloc[positions])
+            if self.search_index:
+                self.search_index.update(positions, self.data.iloc[positions])
+            if self._keyword_index:
+                self._keyword_index.update(positions, self.data["Keywords"].iloc[positions])
+            for column, index in self._sort_indexes.items():
+                values = self.data[column].iloc[positions]
+                index.insert(values.index, values.tolist())
+        elif op == "delete":
+            self.data = self.data.drop(self.data.index[positions])
+            if self.search_index:
+                self.search_index.delete(positions)
+            if self._keyword_index:
+                self._keyword_index.delete(positions)
+        else:
+            raise ValueError(f"Thao tác không hợp lệ trong nhật ký: {op}")
+
+    def _append(self, rows):
+        """
+        Nối nhiều hàng vào DataFrame trong một lần và cập nhật các cấu trúc phụ theo lô.
         """
-        self.data.iloc[index] = updated_data
-        self.save_data()
+        labels = pd.RangeIndex(self._next_id, self._next_id + len(rows))
+        self._next_id += len(rows)
+        new_rows = conform(self.data, rows, index=labels)
+        self.data = pd.concat([self.data, new_rows]) if len(self.data) else new_rows
+        if self.search_index:
+            self.search_index.extend(new_rows)
+        if self._keyword_index:
+            self._keyword_index.append(new_rows["Keywords"])
+        if self._aggregates:
+            self._aggregates.update(new_rows)
+        if self._pairs is not None:
+            self._pairs.add(new_rows)
+        for column, index in self._sort_indexes.items():
+            index.insert(labels, new_rows[column].tolist())
 
-    def search_data(self, search_values):
+    @traced
+    def search_data(self, search_values, progress=None):
         """
         Tìm kiếm dữ liệu dựa trên các giá trị tìm kiếm.
 
-        Tìm kiếm theo từng cột tương ứng với danh sách `search_values`. Sử dụng phương thức `str.contains` để kiểm tra sự khớp mẫu không phân biệt chữ hoa chữ thường.
+        Tìm kiếm theo từng cột tương ứng với danh sách `search_values`, không phân biệt chữ hoa chữ thường.
+        Khi bật chỉ mục tìm kiếm, chuỗi tìm kiếm được so khớp như chuỗi con thông thường với các giá trị phân biệt
+        của mỗi cột và kết quả các cột được giao với nhau. Nếu không, sử dụng phương thức `str.contains` để quét toàn bộ
+        dữ liệu.
 
         Tham số:
             search_values (list): Danh sách các giá trị tìm kiếm, tương ứng với các cột trong DataFrame.
+            progress (callable, tùy chọn): Hàm `progress(fraction, message)` được gọi sau mỗi cột được xử lý
+                (ví dụ `Task.report_progress`, có thể dừng tìm kiếm bằng cách ném ngoại lệ).
 
         Trả về:
             pandas.DataFrame: DataFrame chứa các hàng dữ liệu thỏa mãn điều kiện tìm kiếm.
         """
-        filtered_data = self.data.copy()
-        for i, value in enumerate(search_values):
-            if value:
-                filtered_data = filtered_data[filtered_data[COLUMN_NAMES[i]].astype(str).str.contains(value, case=False, na=False)]
-        return filtered_data
+        criteria = {COLUMN_NAMES[i]: value for i, value in enumerate(search_values) if value}
+        with self.lock:
+            if self.use_search_index:
+                if self.search_index is None:
+                    if progress:
+                        progress(0.0, "Đang xây dựng chỉ mục tìm kiếm...")
+                    with span("DataManager.build_search_index", rows=len(self.data)):
+                        self.search_index = SearchIndex(self.data)
+                mask = None
+                for step, (column, value) in enumerate(criteria.items()):
+                    column_mask = self.search_index.match({column: value})
+                    mask = column_mask if mask is None else mask & column_mask
+                    if progress:
+                        progress((step + 1) / len(criteria), f"Đã tìm trong cột {column}")
+                return self.data[mask] if mask is not None else self.data.copy()
+            filtered_data = self.data.copy()
+            for step, (column, value) in enumerate(criteria.items()):
+                matches = filtered_data[column].astype(str).str.contains(value, case=False, na=False)
+                filtered_data = filtered_data[matches]
+                if progress:
+                    progress((step + 1) / len(criteria), f"Đã tìm trong cột {column}")
+            return filtered_data
+
+    @traced
+    def search_view(self, search_values, progress=None):
+        """
+        Tìm kiếm như `search_data` và trả về kết quả dưới dạng khung nhìn cho `VirtualTable`.
+
+        Trả về:
+            FrameView: Khung nhìn các hàng thỏa mãn điều kiện tìm kiếm.
+        """
+        return FrameView(self.search_data(search_values, progress=progress))
+
+    @traced
+    def aggregates(self):
+        """
+        Lấy bộ nhớ đệm các bảng đếm dùng cho biểu đồ, tính lần đầu khi cần.
+
+        Trả về:
+            AggregateCache: Các bảng đếm luôn khớp với `self.data`.
+        """
+        with self.lock:
+            if self._aggregates is None:
+                self._aggregates = AggregateCache(self.data)
+            return self._aggregates
+
+    @traced
+    def statistics(self, workers=None):
+        """
+        Tính thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia trên nhiều lõi CPU.
+
+        Chỉ việc chụp các cột cần thiết được thực hiện trong `self.lock`; phần tính toán chạy ngoài khóa.
+
+        Tham số:
+            workers (int, tùy chọn): Số tiến trình, xem `compute_statistics`.
+
+        Trả về:
+            Statistics: Kết quả thống kê.
+        """
+        with self.lock:
+            snapshot = self.data.reindex(columns=ANALYTICS_COLUMNS).copy()
+        return compute_statistics(snapshot, workers=workers)
+
+    def memory_report(self):
+        """
+        Bộ nhớ sử dụng của từng cột dữ liệu.
 
+        Trả về:
+            pandas.DataFrame: Xem `schema.memory_report`.
+        """
+        with self.lock:
+            return memory_report(self.data)
+
+    @traced
+    def keyword_index(self):
+        """
+        Lấy chỉ mục của cột "Keywords", xây dựng ở lần dùng đầu tiên và cập nhật tăng dần sau mỗi thao tác.
+
+        Trả về:
+            KeywordIndex: Chỉ mục từ khóa theo vị trí hàng của `self.data`.
+        """
+        with self.lock:
+            if self._keyword_index is None:
+                self._keyword_index = KeywordIndex(self.data["Keywords"])
+            return self._keyword_index
+
+    @traced
+    def search_keywords(self, keywords, match="any"):
+        """
+        Tìm các hàng theo từ khóa chính xác trong cột "Keywords".
+
+        Tham số:
+            keywords (list): Danh sách từ khóa cần tìm.
+            match (str, tùy chọn): "any" để lấy các hàng chứa ít nhất một từ khóa, "all" để lấy các hàng chứa tất cả.
+
+        Trả về:
+            pandas.DataFrame: DataFrame chứa các hàng dữ liệu thỏa mãn điều kiện.
+        """
+        if match not in ("any", "all"):
+            raise ValueError(f"Kiểu so khớp không hợp lệ: {match}")
+        with self.lock:
+            index = self.keyword_index()
+            mask = index.all_of(keywords) if match == "all" else index.any_of(keywords)
+            return self.data[mask]
+
+    @traced
+    def keyword_statistics(self):
+        """
+        Thống kê số câu trả lời và tỉ lệ trả lời đúng theo từng từ khóa.
+
+        Trả về:
+            pandas.DataFrame: Xem `KeywordIndex.correctness_rates`.
+        """
+        with self.lock:
+            return self.keyword_index().correctness_rates(self.data["Type of Answer"])
+
+    @traced
     def sort_data(self, sort_by, ascending=True):
         """
         Sắp xếp dữ liệu theo một cột cụ thể.
 
-        Sử dụng phương thức `sort_values` của DataFrame để sắp xếp dữ liệu theo cột `sort_by` với thứ tự tăng dần hoặc giảm dần tùy thuộc vào tham số.
+        Dùng hoán vị sắp xếp đã lưu của cột `sort_by` (xem `sort_index`) để sắp xếp dữ liệu theo thứ tự tăng dần
+        hoặc giảm dần tùy thuộc vào tham số. `self.data` không bị thay đổi; kết quả sắp xếp được trả về dưới dạng
+        DataFrame mới với nhãn chỉ mục gốc. Để hiển thị, nên dùng `sorted_view` để không phải sao chép dữ liệu.
+        """
+        with self.lock:
+            if sort_by in self.data.columns:
+                ids = self.sort_index(sort_by).window(0, len(self.data), ascending)
+                return self.data.iloc[self.data.index.get_indexer(ids)]
+            return self.data
+
+    def sort_index(self, column):
+        """
+        Lấy hoán vị sắp xếp của một cột, xây dựng ở lần dùng đầu tiên và cập nhật tăng dần sau đó.
+
+        Tham số:
+            column (str): Tên cột.
+
+        Trả về:
+            ColumnSortIndex: Hoán vị sắp xếp theo mã định danh hàng.
+        """
+        with self.lock:
+            if column not in self._sort_indexes:
+                with span("DataManager.build_sort_index", column=column, rows=len(self.data)):
+                    self._sort_indexes[column] = ColumnSortIndex(self.data[column])
+            return self._sort_indexes[column]
+
+    @traced
+    def sorted_view(self, sort_by, ascending=True):
+        """
+        Tạo khung nhìn dữ liệu đã sắp xếp theo một cột mà không sao chép dữ liệu.
+
+        Tham số:
+            sort_by (str): Tên cột cần sắp xếp.
+            ascending (bool, tùy chọn): Thứ tự sắp xếp.
+
+        Trả về:
+            SortedView: Khung nhìn có `len()` và `fetch_rows(start, stop)`, dùng cho `VirtualTable.show_view`.
+        """
+        return SortedView(self.sort_index(sort_by), ascending, self.rows_by_id)
+
+    def rows_by_id(self, row_ids):
+        """
+        Lấy giá trị của các hàng theo mã định danh hàng.
+
+        Trả về:
+            list: Các cặp (mã định danh, tuple giá trị các cột), theo thứ tự của `row_ids`.
         """
-        if sort_by in self.data.columns:
-            self.data.sort_values(by=sort_by, ascending=ascending)
-        return self.data
\ No newline at end of file
+        with self.lock:
+            rows = self.data.iloc[self.data.index.get_indexer(row_ids)]
+            return list(zip(rows.index, rows.itertuples(index=False, name=None)))
@@ -0,0 +1,135 @@
+from tkinter import Toplevel, Frame, Button, Checkbutton, Label, Text, BooleanVar, StringVar, filedialog
+from tkinter import ttk
+
+from tracing import tracer
+
+SUMMARY_COLUMNS = ["Operation", "Count", "Total (ms)", "Mean (ms)", "Max (ms)", "Errors"]
+REFRESH_INTERVAL = 1000
+# Các thao tác dữ liệu chạy trong luồng nền (xem `TaskRunner`); hàm xử lý sự kiện của giao diện chỉ gửi tác vụ đi.
+DEFAULT_PROFILE_TARGET = "TaskRunner.run"
+
+
+class DiagnosticsWindow:
+    """
+    Cửa sổ chẩn đoán hiệu năng: bật/tắt việc ghi span (xem `tracing`), xem thời gian tổng hợp theo thao tác,
+    ghi cProfile cho thao tác tiếp theo và xuất kết quả ra JSON hoặc Chrome trace.
+
+    Bảng tổng hợp được làm mới định kỳ trong khi cửa sổ đang mở.
+    """
+
+    def __init__(self, master):
+        """
+        Tham số:
+            master (tkinter.Tk): Cửa sổ chính của ứng dụng.
+        """
+        self.window = Toplevel(master)
+        self.window.title("Diagnostics")
+        self.enabled = BooleanVar(value=tracer.enabled)
+        self.profile_target = StringVar(value=DEFAULT_PROFILE_TARGET)
+        self._shown_profile = None
+        self._after_id = None
+
+        controls = Frame(self.window)
+        controls.pack(fill="x", padx=10, pady=5)
+        Checkbutton(controls, text="Enable tracing", variable=self.enabled,
+                    command=self.toggle_tracing).pack(side="left", padx=5)
+        Button(controls, text="Profile Next", command=self.profile_next).pack(side="left", padx=5)
+        self.target_box = ttk.Combobox(controls, textvariable=self.profile_target, width=40)
+        self.target_box.pack(side="left", padx=5)
+        Button(controls, text="Clear", command=self.clear).pack(side="left", padx=5)
+        Button(controls, text="Export JSON", command=self.export_json).pack(side="left", padx=5)
+        Button(controls, text="Export Chrome Trace", command=self.export_chrome_trace).pack(side="left", padx=5)
+
+        self.tree = ttk.Treeview(self.window, columns=SUMMARY_COLUMNS, show="headings", height=15)
+        for column in SUMMARY_COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=300 if column == "Operation" else 90,
+                             anchor="w" if column == "Operation" else "e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.status_label = Label(self.window, text="", anchor="w")
+        self.status_label.pack(fill="x", padx=10)
+        self.profile_text = Text(self.window, height=15, wrap="none", font=("Courier", 9))
+        self.profile_text.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def toggle_tracing(self):
+        """
+        Bật hoặc tắt việc ghi span theo ô đánh dấu.
+        """
+        tracer.enabled = self.enabled.get()
+        self.refresh()
+
+    def profile_next(self):
+        """
+        Ghi cProfile cho lần tiếp theo của thao tác được chọn (bật ghi span nếu đang tắt).
+        """
+        tracer.enabled = True
+        self.enabled.set(True)
+        tracer.profile_next(self.profile_target.get().strip() or None)
+        self.refresh()
+
+    def clear(self):
+        """
+        Xóa các span và kết quả cProfile đã ghi.
+        """
+        tracer.clear()
+        self.refresh()
+
+    def export_json(self):
+        """
+        Xuất các span, bảng tổng hợp và kết quả cProfile ra file JSON.
+        """
+        file_name = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                                 filetypes=[("JSON", "*.json")])
+        if file_name:
+            tracer.export_json(file_name)
+
+    def export_chrome_trace(self):
+        """
+        Xuất các span ra định dạng Chrome trace.
+        """
+        file_name = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                                 filetypes=[("Chrome trace", "*.json")])
+        if file_name:
+            tracer.export_chrome_trace(file_name)
+
+    def refresh(self):
+        """
+        Làm mới bảng tổng hợp và kết quả cProfile gần nhất, rồi lập lịch làm mới lần sau.
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+        summary = tracer.summary()
+        self.target_box["values"] = [DEFAULT_PROFILE_TARGET] + sorted(
+            {item["name"] for item in summary} - {DEFAULT_PROFILE_TARGET})
+        self.tree.delete(*self.tree.get_children())
+        for item in summary:
+            self.tree.insert("", "end", values=[item["name"], item["count"], f"{item['total_ms']:.1f}",
+                                                f"{item['mean_ms']:.2f}", f"{item['max_ms']:.1f}", item["errors"]])
+        state = "bật" if tracer.enabled else "tắt"
+        pending = ", đang chờ thao tác để ghi cProfile" if tracer.profile_pending() else ""
+        self.status_label.config(text=f"Ghi span: {state}; {len(tracer.records)} span{pending}")
+        profiles = list(tracer.profiles)
+        if profiles and profiles[-1] is not self._shown_profile:
+            latest = profiles[-1]
+            self.profile_text.delete("1.0", "end")
+            self.profile_text.insert("1.0", f"{latest.name}: {latest.duration / 1e6:.1f} ms\n\n{latest.report}")
+            self._shown_profile = latest
+        self._after_id = self.window.after(REFRESH_INTERVAL, self.refresh)
+
+    def close(self):
+        """
+        Dừng làm mới định kỳ và đóng cửa sổ (việc ghi span vẫn giữ nguyên trạng thái).
+        """
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+        self.window.destroy()
+
+    def exists(self):
+        """
+        Kiểm tra cửa sổ còn đang mở hay không.
+        """
+        return bool(self.window.winfo_exists())
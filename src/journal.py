@@ -0,0 +1,236 @@
+import json
+import math
+import os
+import time
+
+
+def _file_signature(path):
+    """
+    Lấy chữ ký (kích thước, thời gian sửa đổi) của một file.
+
+    Trả về:
+        dict: {"size": ..., "mtime_ns": ...}, hoặc các giá trị None nếu file không tồn tại.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {"size": None, "mtime_ns": None}
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _to_json(value):
+    """
+    Chuyển các kiểu dữ liệu numpy/pandas sang kiểu Python để ghi JSON.
+    """
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _clean_value(value):
+    """
+    Chuẩn hóa giá trị trước khi ghi: NaN/NA được ghi thành null.
+    """
+    try:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+    except TypeError:
+        pass
+    if type(value).__name__ in ("NAType", "NaTType"):
+        return None
+    return value
+
+
+def fsync_directory(path):
+    """
+    Đồng bộ thư mục chứa `path` xuống đĩa để việc đổi tên file được bền vững.
+
+    Bỏ qua trên các hệ điều hành không hỗ trợ mở thư mục (Windows).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ChangeJournal:
+    """
+    Nhật ký thay đổi chỉ ghi nối (append-only) cho file dữ liệu CSV.
+
+    Mỗi thao tác thêm/sửa/xóa được ghi thành một dòng JSON ở cuối file nhật ký thay vì ghi lại toàn bộ file CSV.
+    Dòng đầu tiên của nhật ký ghi chữ ký của file CSV gốc; nếu file gốc đã thay đổi (ví dụ sau khi nén),
+    nhật ký cũ bị coi là hết hiệu lực và không được phát lại.
+    """
+
+    FSYNC_MODES = ("always", "interval", "never")
+
+    def __init__(self, path, fsync="always", fsync_interval=1.0):
+        """
+        Khởi tạo nhật ký thay đổi.
+
+        Tham số:
+            path (str): Đường dẫn tới file nhật ký.
+            fsync (str, tùy chọn): Chế độ đồng bộ xuống đĩa: "always" (sau mỗi thao tác),
+                "interval" (tối đa một lần mỗi `fsync_interval` giây) hoặc "never" (để hệ điều hành quyết định).
+            fsync_interval (float, tùy chọn): Khoảng thời gian (giây) giữa hai lần fsync ở chế độ "interval".
+        """
+        if fsync not in self.FSYNC_MODES:
+            raise ValueError(f"Chế độ fsync không hợp lệ: {fsync}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.pending = 0
+        self.attached = False
+        self._handle = None
+        self._last_fsync = 0.0
+
+    def __len__(self):
+        """
+        Số thao tác đã ghi vào nhật ký kể từ lần nén gần nhất.
+        """
+        return self.pending
+
+    def replay(self, base_path):
+        """
+        Đọc lại các thao tác đã ghi trong nhật ký.
+
+        Dòng cuối bị ghi dở (do chương trình dừng đột ngột) sẽ bị bỏ qua và cắt khỏi file.
+        Sau khi gọi, thuộc tính `attached` cho biết nhật ký có khớp với file gốc hay không; nếu không,
+        cần gọi `reset` trước khi ghi thêm thao tác.
+
+        Tham số:
+            base_path (str): Đường dẫn tới file CSV gốc mà nhật ký áp dụng lên.
+
+        Trả về:
+            list: Danh sách các bản ghi thao tác (dict) theo đúng thứ tự đã ghi.
+        """
+        self.close()
+        self.pending = 0
+        self.attached = False
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        valid_size = 0
+        with open(self.path, "rb") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                records.append(record)
+        if valid_size < os.path.getsize(self.path):
+            with open(self.path, "r+b") as handle:
+                handle.truncate(valid_size)
+        if not records or records[0].get("op") != "base":
+            return []
+        header = records[0]
+        signature = _file_signature(base_path)
+        if header.get("size") != signature["size"] or header.get("mtime_ns") != signature["mtime_ns"]:
+            return []
+        self.attached = True
+        self.pending = len(records) - 1
+        return records[1:]
+
+    def append(self, record):
+        """
+        Ghi nối một thao tác vào cuối nhật ký.
+
+        Tham số:
+            record (dict): Bản ghi thao tác, ví dụ {"op": "add", "row": [...]}.
+        """
+        handle = self._open()
+        handle.write(self._encode(record))
+        handle.flush()
+        self.pending += 1
+        if self.fsync == "always":
+            os.fsync(handle.fileno())
+        elif self.fsync == "interval":
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(handle.fileno())
+                self._last_fsync = now
+
+    def tell(self):
+        """
+        Vị trí (byte) của cuối nhật ký; dùng làm mốc cho `reset(carry_from=...)`.
+        """
+        if self._handle is not None:
+            self._handle.flush()
+            return self._handle.tell()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def reset(self, base_path, carry_from=None):
+        """
+        Tạo lại nhật ký gắn với chữ ký hiện tại của file CSV gốc.
+
+        File nhật ký mới được ghi ra file tạm rồi đổi tên nguyên tử, vì vậy nhật ký cũ chỉ bị thay thế khi
+        nhật ký mới đã nằm trên đĩa.
+
+        Tham số:
+            base_path (str): Đường dẫn tới file CSV gốc vừa được ghi lại.
+            carry_from (int, tùy chọn): Nếu có, các thao tác được ghi sau vị trí này (xem `tell`) được giữ lại
+                trong nhật ký mới. Dùng khi file CSV được ghi từ một bản chụp dữ liệu trong lúc các thao tác
+                khác vẫn tiếp tục được ghi vào nhật ký.
+        """
+        tail = b""
+        if carry_from is not None and os.path.exists(self.path):
+            if self._handle is not None:
+                self._handle.flush()
+            with open(self.path, "rb") as old:
+                old.seek(carry_from)
+                tail = old.read()
+        self.close()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(self._encode(self._header(base_path)))
+            handle.write(tail.decode("utf-8"))
+            handle.flush()
+            if self.fsync != "never":
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+        if self.fsync != "never":
+            fsync_directory(self.path)
+        self.attached = True
+        self.pending = tail.count(b"\n")
+
+    def sync(self):
+        """
+        Buộc đồng bộ nhật ký xuống đĩa (dùng cho chế độ "interval" và "never").
+        """
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._last_fsync = time.monotonic()
+
+    def close(self):
+        """
+        Đóng file nhật ký nếu đang mở.
+        """
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _open(self):
+        if self._handle is None:
+            if not self.attached:
+                raise RuntimeError(f"Nhật ký chưa được gắn với file dữ liệu: {self.path}")
+            self._handle = open(self.path, "a", encoding="utf-8")
+        return self._handle
+
+    def _header(self, base_path):
+        return dict({"op": "base"}, **_file_signature(base_path))
+
+    def _encode(self, record):
+        if "row" in record:
+            record = dict(record, row=[_clean_value(value) for value in record["row"]])
+        return json.dumps(record, default=_to_json, ensure_ascii=False) + "\n"
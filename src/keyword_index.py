@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+
+class KeywordIndex:
+    """
+    Chỉ mục cho cột nhiều giá trị "Keywords" (danh sách từ khóa phân tách bằng dấu phẩy).
+
+    Cột được phân tích một lần thành dạng CSR: mảng `codes` chứa mã từ khóa của mọi lần xuất hiện (theo thứ tự hàng),
+    mảng `rows` chứa hàng tương ứng, và mảng `offsets` cho biết các từ khóa của hàng `i` nằm trong
+    `codes[offsets[i]:offsets[i + 1]]`. Chỉ mục đảo (từ khóa -> các hàng) được lưu theo cùng cách với
+    `posting_offsets` và `posting_rows`. Mọi truy vấn và thống kê được tính bằng các phép toán NumPy vector hóa
+    trên các mảng này.
+
+    Khi dữ liệu thay đổi, chỉ các chuỗi từ khóa của những hàng được thêm/sửa mới phải tách lại (xem `append`,
+    `update`, `delete`); các mảng còn lại được vá cục bộ tại các đoạn của những hàng đó, không phải sắp xếp hay
+    đếm lại toàn bộ. Riêng `posting_rows` được dựng lại ở lần tra cứu sau.
+    """
+
+    def __init__(self, keywords, separator=","):
+        """
+        Xây dựng chỉ mục từ cột từ khóa.
+
+        Từ khóa được cắt khoảng trắng ở hai đầu; từ khóa rỗng và từ khóa lặp lại trong cùng một hàng bị bỏ qua.
+        Mỗi chuỗi từ khóa phân biệt chỉ được tách một lần, sau đó kết quả được trải ra cho các hàng bằng phép
+        lấy chỉ số vector hóa.
+
+        Tham số:
+            keywords (pandas.Series): Cột từ khóa, mỗi giá trị là một chuỗi các từ khóa.
+            separator (str, tùy chọn): Ký tự phân tách các từ khóa. Mặc định là ",".
+        """
+        self.separator = separator
+        self.vocabulary = pd.Index([], dtype=object)
+        self.row_count = len(keywords)
+        row_counts, self.codes = self._tokenize(keywords)
+        self.rows = np.repeat(np.arange(self.row_count, dtype=np.int64), row_counts)
+        self._reindex()
+
+    def append(self, keywords):
+        """
+        Thêm các hàng mới vào cuối chỉ mục.
+
+        Tham số:
+            keywords (pandas.Series): Cột từ khóa của các hàng vừa được thêm vào.
+        """
+        row_counts, codes = self._tokenize(keywords)
+        rows = np.repeat(np.arange(self.row_count, self.row_count + len(keywords), dtype=np.int64), row_counts)
+        self.codes = np.concatenate([self.codes, codes])
+        self.rows = np.concatenate([self.rows, rows])
+        self.offsets = np.concatenate([self.offsets, self.offsets[-1] + np.cumsum(row_counts)])
+        self.row_count += len(keywords)
+        self._recount(codes[:0], codes)
+
+    def update(self, positions, keywords):
+        """
+        Thay từ khóa của các hàng ở các vị trí cho trước.
+
+        Tham số:
+            positions (list): Vị trí các hàng được sửa.
+            keywords (pandas.Series): Cột từ khóa mới của các hàng đó, theo cùng thứ tự với `positions`.
+        """
+        positions, first = np.unique(np.asarray(positions, dtype=np.int64), return_index=True)
+        row_counts, codes = self._tokenize(keywords.iloc[first])
+        entries, lengths, starts = self._segments(positions)
+        removed = self.codes[entries]
+        # Các từ khóa mới của mỗi hàng được chèn vào đúng chỗ đoạn cũ của hàng đó sau khi bỏ các đoạn cũ.
+        at = np.repeat(starts, row_counts)
+        self.codes = np.insert(np.delete(self.codes, entries), at, codes)
+        self.rows = np.insert(np.delete(self.rows, entries), at, np.repeat(positions, row_counts))
+        shift = np.zeros(self.row_count + 1, dtype=np.int64)
+        shift[positions + 1] = row_counts - lengths
+        self.offsets += np.cumsum(shift)
+        self._recount(removed, codes)
+
+    def delete(self, positions):
+        """
+        Xóa các hàng ở các vị trí cho trước, dồn các hàng phía sau lên.
+        """
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        entries, _, starts = self._segments(positions)
+        removed = self.codes[entries]
+        # Các hàng phía sau mỗi hàng bị xóa dồn lên một vị trí.
+        shift = np.zeros(len(self.rows) - len(entries) + 1, dtype=np.int64)
+        np.add.at(shift, starts, 1)
+        self.rows = np.delete(self.rows, entries) - np.cumsum(shift[:-1])
+        self.codes = np.delete(self.codes, entries)
+        counts = np.delete(np.diff(self.offsets), positions)
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.row_count -= len(positions)
+        self._recount(removed, removed[:0])
+
+    def keyword_ids(self, keywords):
+        """
+        Đổi danh sách từ khóa thành mã; từ khóa không có trong chỉ mục nhận mã -1.
+        """
+        return self.vocabulary.get_indexer([keyword.strip() for keyword in keywords])
+
+    def rows_with(self, keyword):
+        """
+        Lấy vị trí các hàng chứa chính xác từ khóa `keyword`.
+
+        Trả về:
+            numpy.ndarray: Mảng vị trí hàng (tăng dần).
+        """
+        code = self.keyword_ids([keyword])[0]
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        if self.posting_rows is None:
+            self.posting_rows = self.rows[np.argsort(self.codes, kind="stable")]
+        return self.posting_rows[self.posting_offsets[code]:self.posting_offsets[code + 1]]
+
+    def keywords_of(self, position):
+        """
+        Lấy danh sách từ khóa của hàng ở vị trí `position`.
+        """
+        return list(self.vocabulary[self.codes[self.offsets[position]:self.offsets[position + 1]]])
+
+    def contains(self, keyword):
+        """
+        Tạo mặt nạ boolean các hàng chứa chính xác từ khóa `keyword`.
+        """
+        mask = np.zeros(self.row_count, dtype=bool)
+        mask[self.rows_with(keyword)] = True
+        return mask
+
+    def any_of(self, keywords):
+        """
+        Tạo mặt nạ boolean các hàng chứa ít nhất một trong các từ khóa.
+        """
+        return self._hit_counts(keywords) > 0
+
+    def all_of(self, keywords):
+        """
+        Tạo mặt nạ boolean các hàng chứa tất cả các từ khóa.
+        """
+        ids = self.keyword_ids(keywords)
+        if len(ids) == 0 or (ids < 0).any():
+            return np.zeros(self.row_count, dtype=bool)
+        return self._hit_counts(keywords) == len(np.unique(ids))
+
+    def keyword_counts(self):
+        """
+        Đếm số hàng chứa mỗi từ khóa.
+
+        Trả về:
+            pandas.Series: Số hàng theo từ khóa, sắp xếp giảm dần.
+        """
+        counts = pd.Series(np.diff(self.posting_offsets), index=self.vocabulary, name="count")
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+    def correctness_rates(self, answers):
+        """
+        Tính tỉ lệ trả lời đúng theo từng từ khóa.
+
+        Chỉ các hàng có câu trả lời hợp lệ (0 hoặc 1) được tính.
+
+        Tham số:
+            answers (array-like): Cột "Type of Answer", theo cùng thứ tự hàng với cột từ khóa.
+
+        Trả về:
+            pandas.DataFrame: Các cột "Answers", "Correct" và "Correct Rate" theo từ khóa,
+                sắp xếp giảm dần theo số câu trả lời.
+        """
+        answers = pd.to_numeric(pd.Series(answers), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        valid = ((answers == 0) | (answers == 1))[self.rows]
+        correct = (answers == 1)[self.rows]
+        size = len(self.vocabulary)
+        total = np.bincount(self.codes, weights=valid, minlength=size).astype(np.int64)
+        right = np.bincount(self.codes, weights=correct, minlength=size).astype(np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(total > 0, right / np.maximum(total, 1), np.nan)
+        result = pd.DataFrame({"Answers": total, "Correct": right, "Correct Rate": rate}, index=self.vocabulary)
+        result.index.name = "Keyword"
+        # Từ khóa chỉ còn trong từ vựng (các hàng chứa nó đã bị xóa hoặc sửa) không được báo cáo.
+        result = result[np.bincount(self.codes, minlength=size) > 0]
+        return result.sort_values("Answers", ascending=False, kind="stable")
+
+    def _hit_counts(self, keywords):
+        ids = self.keyword_ids(keywords)
+        ids = np.unique(ids[ids >= 0])
+        if len(ids) == 0:
+            return np.zeros(self.row_count, dtype=np.int64)
+        hit = np.zeros(len(self.vocabulary), dtype=bool)
+        hit[ids] = True
+        return np.bincount(self.rows[hit[self.codes]], minlength=self.row_count)
+
+    def _tokenize(self, keywords):
+        # Tách các chuỗi từ khóa phân biệt một lần, thêm từ khóa mới vào cuối từ vựng, rồi trải mã từ khóa ra cho
+        # các hàng. Trả về số từ khóa của mỗi hàng và mảng mã theo thứ tự hàng.
+        string_codes, strings = pd.factorize(pd.Series(keywords.to_numpy(dtype=object)))
+        tokens = pd.Series(strings.to_numpy(dtype=object)).str.split(self.separator).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != "")]
+        pairs = pd.DataFrame({"string": tokens.index.to_numpy(), "token": tokens.to_numpy()}).drop_duplicates()
+        token_codes = self.vocabulary.get_indexer(pairs["token"])
+        if (token_codes < 0).any():
+            self.vocabulary = self.vocabulary.append(pd.Index(pairs["token"][token_codes < 0].unique()))
+            token_codes = self.vocabulary.get_indexer(pairs["token"])
+
+        string_offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs["string"].to_numpy(), minlength=len(strings)), out=string_offsets[1:])
+        # Hàng rỗng có mã chuỗi -1, trỏ tới số 0 thêm vào cuối (kể cả khi không có chuỗi nào).
+        row_counts = np.append(np.diff(string_offsets), 0)[string_codes]
+        row_offsets = np.zeros(len(row_counts) + 1, dtype=np.int64)
+        np.cumsum(row_counts, out=row_offsets[1:])
+        starts = string_offsets[np.maximum(string_codes, 0)]
+        positions = np.arange(row_offsets[-1]) + np.repeat(starts - row_offsets[:-1], row_counts)
+        return row_counts, token_codes.astype(np.int32)[positions]
+
+    def _segments(self, positions):
+        # Với các vị trí hàng tăng dần: chỉ số trong `codes`/`rows` của các từ khóa thuộc những hàng đó, số từ khóa
+        # của mỗi hàng, và chỗ bắt đầu đoạn của mỗi hàng sau khi các từ khóa đó bị bỏ đi.
+        starts = self.offsets[positions]
+        lengths = self.offsets[positions + 1] - starts
+        starts = starts - (np.cumsum(lengths) - lengths)
+        return np.arange(lengths.sum()) + np.repeat(starts, lengths), lengths, starts
+
+    def _recount(self, removed, added):
+        # Cập nhật `posting_offsets` theo mã các từ khóa bị bỏ đi và được thêm vào (từ vựng có thể vừa dài thêm).
+        size = len(self.vocabulary)
+        counts = np.zeros(size, dtype=np.int64)
+        counts[:len(self.posting_offsets) - 1] = np.diff(self.posting_offsets)
+        counts += np.bincount(added, minlength=size) - np.bincount(removed, minlength=size)
+        self.posting_offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.posting_offsets[1:])
+        self.posting_rows = None
+
+    def _reindex(self):
+        # Dựng lại các mảng suy ra từ `rows` và `codes` (đã sắp theo hàng). Phép sắp xếp `posting_rows` là bước
+        # đắt nhất nên được hoãn tới lần tra cứu đầu tiên (xem `rows_with`).
+        self.offsets = np.zeros(self.row_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.rows, minlength=self.row_count), out=self.offsets[1:])
+        self.posting_rows = None
+        self.posting_offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.codes, minlength=len(self.vocabulary)), out=self.posting_offsets[1:])
@@ -1,8 +1,16 @@
-from tkinter import Tk, Frame, Canvas, LabelFrame, Label, Entry, Button, Scrollbar, Toplevel, messagebox
-from tkinter import ttk
-from data_manager import COLUMN_NAMES, DataManager
-from chart_utils import draw_stacked_bar_chart, draw_pie_chart, draw_area_chart, clear_chart_area
-import matplotlib.pyplot as plt
+import sys
+from tkinter import Tk, Frame, LabelFrame, Label, Entry, Button, messagebox
+from data_manager import COLUMN_NAMES
+from storage import open_storage
+from chart_utils import CHART_TYPES, ChartPanel
+from virtual_table import VirtualTable
+from task_runner import TaskRunner
+from diagnostics import DiagnosticsWindow
+from tracing import tracer, traced
+
+COMPACT_EVERY = 1000
+DEFAULT_DATA_FILE = "./data/dataset.csv"
+
 
 class App:
     """
@@ -14,25 +22,35 @@ class App:
         - Sắp xếp dữ liệu theo các cột.
         - Hiển thị dữ liệu dưới dạng bảng.
         - Biểu đồ dữ liệu theo các kiểu: Hình cột xếp chồng, Hình tròn, Diện tích.
+        - Thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia (tính trên nhiều lõi CPU).
 
-    Lưu ý: Dữ liệu được lưu trữ trong file CSV.
+    Lưu ý: Dữ liệu được lưu trữ trong file CSV hoặc cơ sở dữ liệu SQLite (xem `open_storage`). Các thao tác tải,
+    lưu, thêm/sửa/xóa, tìm kiếm, sắp xếp và thống kê được chạy trong luồng nền (xem `TaskRunner`) để giao diện
+    không bị treo, kể cả khi phải chờ một tác vụ nền khác đang giữ dữ liệu.
     """
 
-    def __init__(self, master):
+    def __init__(self, master, data_file=DEFAULT_DATA_FILE, streaming=False):
         """
         Khởi tạo cửa sổ chính của ứng dụng.
 
         Tham số:
             master (tkinter.Tk): Đối tượng Tk() của cửa sổ chính.
+            data_file (str, tùy chọn): File dữ liệu (CSV, hoặc SQLite với phần mở rộng `.db`/`.sqlite`).
+            streaming (bool, tùy chọn): Đọc file CSV theo từng phần ở chế độ chỉ đọc, cho file lớn hơn bộ nhớ.
         """
         self.master = master
         self.master.title("Quản lý và Hiển thị Dữ liệu")
         self.master.state("zoomed")
 
-        self.data_manager = DataManager()
+        self.data_manager = None
+        self.diagnostics = None
         self.ascending_order = {}
+        self.runner = TaskRunner(self.master)
         self.create_widgets()
-        self.display_data()
+        self.set_status("Đang tải dữ liệu...")
+        self.runner.submit(lambda: open_storage(data_file, notify=self.notify_from_worker, streaming=streaming,
+                                                compact_every=None),
+                           key="load", on_success=self.on_data_loaded, on_error=self.on_task_error)
 
     def create_widgets(self):
         """
@@ -41,7 +59,7 @@ class App:
         - Khung chính (main_frame) chứa các khung con khác.
         - Khung CRUD (crud_frame) chứa các nút chức năng thêm, sửa, xóa, tìm kiếm và làm mới dữ liệu.
         - Khung Biểu đồ (chart_frame) chứa các nút chức năng vẽ các loại biểu đồ.
-        - Khung Bảng (tree_frame) chứa Treeview hiển thị dữ liệu.
+        - Khung Bảng (tree_frame) chứa bảng ảo (VirtualTable) hiển thị dữ liệu, chỉ tạo các hàng đang hiển thị.
         - Các trường nhập liệu (input_fields) tương ứng với các cột dữ liệu.
         """
         self.main_frame = Frame(self.master)
@@ -79,48 +97,157 @@ class App:
         Button(crud_input_frame, text="Update", command=self.update_data).pack(side="left", padx=5)
         Button(crud_input_frame, text="Delete", command=self.delete_data).pack(side="left", padx=5)
         Button(crud_input_frame, text="Refresh", command=self.display_data).pack(side="left", padx=5)
+        Button(crud_input_frame, text="Diagnostics", command=self.show_diagnostics).pack(side="left", padx=5)
 
         chart_button_frame = Frame(self.chart_frame)
         chart_button_frame.pack(side="left", fill="y", padx=(0, 10))
-        Button(chart_button_frame, text="Stacked Bar Chart", command=self.draw_stacked_bar_chart).pack(fill="x", pady=5)
-        Button(chart_button_frame, text="Pie Chart", command=self.draw_pie_chart).pack(fill="x", pady=5)
-        Button(chart_button_frame, text="Area Chart", command=self.draw_area_chart).pack(fill="x", pady=5)
+        for text, chart in (("Stacked Bar Chart", "stacked-bar"), ("Pie Chart", "pie"), ("Area Chart", "area"),
+                            ("Student Accuracy", "student-accuracy"), ("Question Difficulty", "question-difficulty"),
+                            ("Topic Success by Country", "topic-success")):
+            button = Button(chart_button_frame, text=text, command=lambda chart=chart: self.show_chart(chart))
+            button.pack(fill="x", pady=5)
 
         self.chart_display_frame = Frame(self.chart_frame)
         self.chart_display_frame.pack(side="right", fill="both", expand=True)
+        self.chart_panel = ChartPanel(self.chart_display_frame)
 
-        self.tree = ttk.Treeview(self.tree_frame, columns=COLUMN_NAMES, show="headings", height=15)
+        self.table = VirtualTable(self.tree_frame, COLUMN_NAMES, height=15, heading_command=self.sort_column)
+        self.tree = self.table.tree
+        self.tree.bind("<<TableSelect>>", self.auto_fill_fields, add="+")
 
-        for column in COLUMN_NAMES:
-            self.tree.heading(column, text=column, command=lambda c=column: self.sort_column(c))
-            self.tree.column(column, anchor="w", width=120)
-        self.tree.pack(side="left", fill="both", expand=True)
-        self.tree.bind("<<TreeviewSelect>>", self.auto_fill_fields)
-
-        vertical_scrollbar = Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        vertical_scrollbar.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=vertical_scrollbar.set)
+        self.status_label = Label(self.main_frame, text="", anchor="w")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10)
 
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def set_status(self, message):
+        """
+        Hiển thị một thông điệp trạng thái ở cuối cửa sổ.
+        """
+        self.status_label.config(text=message)
+
+    def notify_from_worker(self, level, title, message):
+        """
+        Hiển thị thông báo của `data_manager`; có thể được gọi từ luồng nền.
+        """
+        self.runner.call_soon(getattr(messagebox, "show" + level), title, message)
+
+    @traced
+    def on_data_loaded(self, data_manager):
+        """
+        Được gọi trên luồng giao diện khi dữ liệu đã được tải xong trong luồng nền.
+        """
+        self.data_manager = data_manager
+        self.display_data()
+
+    def on_task_error(self, error):
+        """
+        Hiển thị lỗi của một tác vụ nền.
+        """
+        self.set_status("")
+        messagebox.showerror("Lỗi", str(error))
+
+    def on_task_progress(self, fraction, message):
+        """
+        Hiển thị tiến độ của một tác vụ nền trên thanh trạng thái.
+        """
+        self.set_status(f"{message} ({fraction:.0%})")
+
+    def is_ready(self):
+        """
+        Kiểm tra dữ liệu đã được tải xong hay chưa; nếu chưa, báo cho người dùng trên thanh trạng thái.
+        """
+        if self.data_manager is None:
+            self.set_status("Dữ liệu đang được tải, vui lòng chờ...")
+            return False
+        return True
+
+    def is_writable(self):
+        """
+        Kiểm tra dữ liệu đã được tải và cho phép thêm/sửa/xóa; nếu không, báo cho người dùng.
+        """
+        if not self.is_ready():
+            return False
+        if self.data_manager.read_only:
+            messagebox.showwarning("Cảnh báo", "Dữ liệu đang được mở ở chế độ chỉ đọc.")
+            return False
+        return True
+
+    @traced
     def display_data(self, sort_by="Student ID", ascending=True):
         """
         Hiển thị dữ liệu trong Treeview.
 
-        Xóa dữ liệu cũ, sắp xếp dữ liệu theo cột và thứ tự được chọn,
-        và sau đó hiển thị từng hàng dữ liệu trong Treeview.
+        Lấy khung nhìn dữ liệu đã sắp xếp theo cột và thứ tự được chọn trong luồng nền (hoán vị sắp xếp chỉ được
+        tính ở lần đầu tiên cho mỗi cột), sau đó gán khung nhìn làm nguồn cho bảng ảo.
+        Chỉ các hàng đang hiển thị được đọc và tạo trong Treeview. Một yêu cầu hiển thị mới (sắp xếp, tìm kiếm)
+        sẽ hủy yêu cầu trước đó nếu yêu cầu đó chưa xong.
 
         Tham số:
             sort_by (str, tùy chọn): Cột để sắp xếp dữ liệu. Mặc định là "Student ID".
             ascending (bool, tùy chọn): Thứ tự sắp xếp (True: tăng dần, False: giảm dần). Mặc định là True.
         """
-        self.data_manager.sort_data(sort_by, ascending)
-        self.tree.delete(*self.tree.get_children())
-        for _, row in self.data_manager.data.iterrows():
-            self.tree.insert("", "end", values=list(row))
+        if not self.is_ready():
+            return
         for field in self.input_fields:
             field.delete(0, "end")
+        self.set_status("Đang sắp xếp dữ liệu...")
+        self.runner.submit(self.data_manager.sorted_view, sort_by, ascending, key="view",
+                           on_success=self.show_view, on_error=self.on_task_error)
+
+    @traced
+    def show_view(self, view):
+        """
+        Hiển thị một khung nhìn dữ liệu đã sắp xếp trong bảng ảo.
+        """
+        self.table.show_view(view)
+        self.set_status(f"{len(view)} hàng")
+
+    def schedule_compaction(self):
+        """
+        Nén nhật ký thay đổi vào file CSV trong luồng nền khi nhật ký đã đủ dài.
+        """
+        if self.data_manager.pending_changes() >= COMPACT_EVERY and not self.runner.is_busy("save"):
+            self.runner.submit(self.data_manager.compact, key="save", on_error=self.on_task_error)
+
+    def submit_write(self, func, *args, message):
+        """
+        Chạy một thao tác thêm/sửa/xóa trong luồng nền, vì thao tác phải chờ các tác vụ nền khác (tìm kiếm, xây dựng
+        chỉ mục, thống kê) đang giữ dữ liệu.
 
+        Mỗi lần chỉ có một thao tác ghi: khi thao tác trước chưa xong, thao tác mới bị từ chối và thanh trạng thái
+        báo bận, để các thao tác được ghi theo đúng thứ tự người dùng thực hiện.
+
+        Tham số:
+            func (callable): Phương thức của `data_manager` cần chạy.
+            *args: Các tham số của phương thức.
+            message (str): Thông điệp trạng thái trong lúc chờ.
+        """
+        if self.runner.is_busy("write"):
+            self.set_status("Đang ghi dữ liệu, vui lòng chờ...")
+            return
+        self.set_status(message)
+        self.runner.submit(func, *args, key="write", on_success=self.on_data_changed, on_error=self.on_write_error)
+
+    def on_data_changed(self, _):
+        """
+        Cập nhật hiển thị dữ liệu trong Treeview và biểu đồ đang hiển thị sau một thao tác ghi.
+        """
+        self.schedule_compaction()
+        self.display_data()
+        self.refresh_chart()
+
+    def on_write_error(self, error):
+        """
+        Hiển thị lỗi của một thao tác ghi; dữ liệu nhập không hợp lệ (`ValueError`) chỉ là cảnh báo.
+        """
+        if isinstance(error, ValueError):
+            self.set_status("")
+            messagebox.showwarning("Cảnh báo", str(error))
+        else:
+            self.on_task_error(error)
+
+    @traced
     def auto_fill_fields(self, events):
         """
         Tự động điền các trường nhập liệu khi chọn một hàng trong Treeview.
@@ -134,71 +261,89 @@ class App:
                 self.input_fields[i].delete(0, "end")
                 self.input_fields[i].insert(0, value)
 
+    @traced
     def add_data(self):
         """
         Thêm một hàng dữ liệu mới.
 
         Lấy giá trị từ các trường nhập liệu, tạo thành một danh sách,
-        gọi phương thức `add_data` của `data_manager` để thêm dữ liệu mới,
-        cuối cùng cập nhật hiển thị dữ liệu trong Treeview.
+        gọi phương thức `add_data` của `data_manager` trong luồng nền để thêm dữ liệu mới (xem `submit_write`),
+        cuối cùng cập nhật hiển thị dữ liệu trong Treeview và biểu đồ đang hiển thị.
         """
+        if not self.is_writable():
+            return
         new_data = [entry.get() for entry in self.input_fields]
-        self.data_manager.add_data(new_data)
-        self.display_data()
+        self.submit_write(self.data_manager.add_data, new_data, message="Đang thêm dữ liệu...")
 
+    @traced
     def delete_data(self):
         """
         Xóa các hàng dữ liệu được chọn.
 
         Kiểm tra xem có hàng nào được chọn, nếu không hiển thị thông báo cảnh báo.
-        Nếu có, lấy chỉ số của các hàng được chọn và gọi phương thức `delete_data`
-        của `data_manager` để xóa dữ liệu, cuối cùng cập nhật hiển thị dữ liệu trong Treeview.
+        Nếu có, gọi phương thức `delete_rows` của `data_manager` trong luồng nền với mã định danh của các hàng được
+        chọn để xóa tất cả trong một thao tác, cuối cùng cập nhật hiển thị dữ liệu trong Treeview và biểu đồ đang
+        hiển thị.
         """
-        selected_items = self.tree.selection()
-        if not selected_items:
+        if not self.is_writable():
+            return
+        selected_keys = self.table.selected_keys()
+        if not selected_keys:
             messagebox.showwarning("Cảnh báo", "Vui lòng chọn một mục để xóa.")
             return
-        indices = [self.tree.index(item) for item in selected_items]
-        self.data_manager.delete_data(indices)
-        self.display_data()
+        self.submit_write(self.data_manager.delete_rows, selected_keys, message="Đang xóa dữ liệu...")
 
+    @traced
     def update_data(self):
         """
         Cập nhật dữ liệu của các hàng được chọn.
 
         Kiểm tra xem có hàng nào được chọn, nếu không hiển thị thông báo cảnh báo.
-        Nếu có, lấy giá trị từ các trường nhập liệu, gọi phương thức `update_data`
-        của `data_manager` để cập nhật dữ liệu, cuối cùng cập nhật hiển thị dữ liệu trong Treeview.
+        Nếu có, lấy giá trị từ các trường nhập liệu, gọi phương thức `update_rows` của `data_manager` trong luồng nền
+        để cập nhật tất cả các hàng được chọn trong một thao tác, cuối cùng cập nhật hiển thị dữ liệu trong Treeview
+        và biểu đồ đang hiển thị.
         """
-        selected_items = self.tree.selection()
-        if not selected_items:
+        if not self.is_writable():
+            return
+        selected_keys = self.table.selected_keys()
+        if not selected_keys:
             messagebox.showwarning("Cảnh báo", "Vui lòng chọn một mục để cập nhật.")
             return
         updated_data = [field.get() for field in self.input_fields]
-        for item in selected_items:
-            index = self.tree.index(item)
-            self.data_manager.update_data(index, updated_data)
-        self.display_data()
+        self.submit_write(self.data_manager.update_rows, selected_keys, updated_data,
+                          message="Đang cập nhật dữ liệu...")
 
+    @traced
     def search_data(self):
         """
         Tìm kiếm dữ liệu.
 
-        Lấy giá trị tìm kiếm từ các trường nhập liệu, gọi phương thức `search_data`
-        của `data_manager` để thực hiện tìm kiếm, sau đó hiển thị kết quả trong Treeview.
+        Lấy giá trị tìm kiếm từ các trường nhập liệu, gọi phương thức `search_view`
+        của `data_manager` trong luồng nền để thực hiện tìm kiếm, sau đó hiển thị kết quả trong bảng ảo.
+        Một lần tìm kiếm mới sẽ hủy lần tìm kiếm trước nếu lần đó chưa xong.
         Nếu không tìm thấy kết quả, hiển thị thông báo.
         """
+        if not self.is_ready():
+            return
         search_values = [field.get().strip() for field in self.input_fields]
         if not any(search_values):
             messagebox.showwarning("Cảnh báo", "Vui lòng nhập ít nhất một giá trị để tìm kiếm.")
             return
-        filtered_data = self.data_manager.search_data(search_values)
-        self.tree.delete(*self.tree.get_children())
-        for _, row in filtered_data.iterrows():
-            self.tree.insert("", "end", values=tuple(row))
-        if filtered_data.empty:
+        self.set_status("Đang tìm kiếm...")
+        self.runner.submit(lambda task: self.data_manager.search_view(search_values, progress=task.report_progress),
+                           key="view", pass_task=True, on_success=self.show_search_results,
+                           on_progress=self.on_task_progress, on_error=self.on_task_error)
+
+    @traced
+    def show_search_results(self, view):
+        """
+        Hiển thị kết quả tìm kiếm trong bảng ảo, thông báo nếu không tìm thấy kết quả.
+        """
+        self.show_view(view)
+        if len(view) == 0:
             messagebox.showinfo("Kết quả", "Không tìm thấy kết quả phù hợp.")
 
+    @traced
     def sort_column(self, col):
         """
         Sắp xếp dữ liệu theo một cột khi người dùng nhấp vào tiêu đề cột trong Treeview.
@@ -208,43 +353,86 @@ class App:
         Tham số:
             col (str): Tên cột cần sắp xếp.
         """
+        if not self.is_ready():
+            return
         self.ascending_order[col] = not self.ascending_order.get(col, True)
         self.display_data(sort_by=col, ascending=self.ascending_order[col])
 
-    def draw_stacked_bar_chart(self):
+    @traced
+    def show_chart(self, name):
         """
-        Vẽ biểu đồ hình cột xếp chồng.
+        Hiển thị một biểu đồ (xem `chart_utils.CHART_TYPES`).
 
-        Gọi hàm `draw_stacked_bar_chart` từ `chart_utils` để vẽ biểu đồ.
-        """
-        draw_stacked_bar_chart(self.data_manager.data, self.chart_display_frame)
+        Nếu biểu đồ đã được vẽ với phiên bản dữ liệu hiện tại (`data_manager.version`), biểu đồ được hiển thị lại
+        ngay. Nếu không, dữ liệu của biểu đồ (các bảng đếm đã được `data_manager` lưu đệm, hoặc thống kê tính trên
+        nhiều tiến trình) được lấy trong luồng nền rồi biểu đồ được cập nhật trên luồng giao diện.
 
-    def draw_pie_chart(self):
+        Tham số:
+            name (str): Loại biểu đồ.
         """
-        Vẽ biểu đồ hình tròn.
-
-        Gọi hàm `draw_pie_chart` từ `chart_utils` để vẽ biểu đồ.
+        if not self.is_ready():
+            return
+        version = self.data_manager.version
+        if self.chart_panel.is_current(name, version):
+            self.runner.cancel("chart")
+            self.chart_panel.show(name)
+            return
+        source = CHART_TYPES[name].source
+        if source == "statistics":
+            self.set_status("Đang tính thống kê...")
+        self.runner.submit(getattr(self.data_manager, source), key="chart", on_error=self.on_task_error,
+                           on_success=lambda data: self.on_chart_data(name, data, version))
+
+    @traced
+    def on_chart_data(self, name, data, version):
         """
-        draw_pie_chart(self.data_manager.data, self.chart_display_frame)
+        Vẽ hoặc cập nhật biểu đồ trên luồng giao diện khi dữ liệu của biểu đồ đã sẵn sàng.
+        """
+        if CHART_TYPES[name].source == "statistics":
+            self.set_status("")
+        try:
+            self.chart_panel.show(name, data, version)
+        except ValueError as error:
+            messagebox.showwarning("Cảnh báo", str(error))
+
+    def refresh_chart(self):
+        """
+        Cập nhật biểu đồ đang hiển thị sau khi dữ liệu thay đổi.
 
-    def draw_area_chart(self):
+        Chỉ các biểu đồ vẽ từ các bảng đếm (được cập nhật tăng dần) được cập nhật ngay; biểu đồ thống kê được tính
+        lại trên toàn bộ dữ liệu nên chỉ được cập nhật khi người dùng chọn lại.
         """
-        Vẽ biểu đồ diện tích.
+        name = self.chart_panel.shown
+        if name is not None and CHART_TYPES[name].source == "aggregates":
+            self.show_chart(name)
 
-        Gọi hàm `draw_area_chart` từ `chart_utils` để vẽ biểu đồ.
+    def show_diagnostics(self):
         """
-        draw_area_chart(self.data_manager.data, self.chart_display_frame)
+        Mở cửa sổ chẩn đoán hiệu năng (xem `DiagnosticsWindow`), hoặc đưa cửa sổ đang mở lên trên.
+        """
+        if self.diagnostics is not None and self.diagnostics.exists():
+            self.diagnostics.window.lift()
+            return
+        self.diagnostics = DiagnosticsWindow(self.master)
 
     def on_closing(self):
         """
         Xử lý sự kiện đóng cửa sổ ứng dụng.
 
-        Xóa các biểu đồ đang hiển thị và đóng cửa sổ ứng dụng.
+        Xóa các biểu đồ đang hiển thị, chờ thao tác ghi đang chờ (nếu có) và các tác vụ nền đang chạy kết thúc, nén
+        nhật ký thay đổi vào file CSV và đóng cửa sổ ứng dụng.
         """
-        clear_chart_area(self.chart_display_frame)
+        self.chart_panel.clear()
+        self.runner.wait("write")
+        self.runner.shutdown(wait=True)
+        if self.data_manager is not None:
+            self.data_manager.close()
         self.master.destroy()
 
 
-root = Tk()
-app = App(root)
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument not in ("--stream", "--trace")]
+    tracer.enabled = "--trace" in sys.argv[1:]
+    root = Tk()
+    app = App(root, arguments[0] if arguments else DEFAULT_DATA_FILE, streaming="--stream" in sys.argv[1:])
+    root.mainloop()
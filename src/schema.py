@@ -0,0 +1,214 @@
+"""
+Kiểu dữ liệu của các cột trong `COLUMN_NAMES`, dùng để giữ `DataManager.data` gọn trong bộ nhớ.
+
+Các cột mã số và kết quả trả lời là số nguyên nhỏ có thể rỗng (`Int32`, `Int8` với mặt nạ giá trị rỗng thay vì
+`float64`), các cột văn bản là `category` (mỗi chuỗi phân biệt chỉ lưu một lần, mỗi hàng chỉ giữ một mã số nguyên),
+kể cả cột "Keywords" vì các hàng của cùng một câu hỏi có cùng chuỗi từ khóa. Nếu một giá trị không vừa với kiểu
+số nguyên của cột (ví dụ 456 trong cột "Type of Answer"), cột được nới sang kiểu rộng hơn thay vì mất giá trị.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+COLUMN_NAMES = ["Student ID", "Student Country", "Question ID", "Type of Answer", "Question Level", "Topic", "Subtopic",
+                "Keywords"]
+SCHEMA = {
+    "Student ID": "Int32",
+    "Student Country": "category",
+    "Question ID": "Int32",
+    "Type of Answer": "Int8",
+    "Question Level": "category",
+    "Topic": "category",
+    "Subtopic": "category",
+    "Keywords": "category",
+}
+CATEGORICAL_COLUMNS = [column for column in COLUMN_NAMES if SCHEMA[column] == "category"]
+INTEGER_COLUMNS = [column for column in COLUMN_NAMES if SCHEMA[column] != "category"]
+INTEGER_TYPES = ["Int8", "Int16", "Int32", "Int64"]
+# Các chuỗi được coi là giá trị rỗng khi nhập tay (bảng hiển thị giá trị rỗng thành "nan" hoặc "<NA>").
+MISSING_VALUES = {"", "nan", "NaN", "<NA>", "None"}
+
+# Ràng buộc của một hàng hợp lệ, dùng bởi `validation`: các cột không được rỗng, tập giá trị cho phép,
+# khoảng giá trị của cột số và các cột xác định một câu trả lời (không được trùng lặp).
+REQUIRED_COLUMNS = [column for column in COLUMN_NAMES if column != "Keywords"]
+ALLOWED_VALUES = {
+    "Type of Answer": [0, 1],
+    "Question Level": ["Basic", "Advanced"],
+}
+VALUE_RANGES = {
+    "Student ID": (0, np.iinfo(np.int32).max),
+    "Question ID": (0, np.iinfo(np.int32).max),
+}
+KEY_COLUMNS = ["Student ID", "Question ID"]
+
+
+def _integer_type(values, minimum_type):
+    """
+    Kiểu số nguyên có thể rỗng nhỏ nhất (không nhỏ hơn `minimum_type`) chứa được mọi giá trị trong `values`.
+    """
+    values = values[~np.isnan(values)]
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in INTEGER_TYPES[INTEGER_TYPES.index(minimum_type):]:
+        limits = np.iinfo(dtype.lower())
+        if limits.min <= low and high <= limits.max:
+            return dtype
+    return INTEGER_TYPES[-1]
+
+
+def _to_integer(series, minimum_type):
+    """
+    Đổi một cột thành số nguyên có thể rỗng; giá trị không phải số nguyên trở thành rỗng.
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    values = values.to_numpy(dtype=float, na_value=np.nan, copy=True)
+    values[~np.isfinite(values) | (values != np.round(values)) | (np.abs(values) >= 2 ** 63)] = np.nan
+    return pd.Series(values, index=series.index, name=series.name).astype(_integer_type(values, minimum_type))
+
+
+def apply_schema(data):
+    """
+    Đổi các cột của một DataFrame sang kiểu trong `SCHEMA`; các cột không có trong `SCHEMA` được giữ nguyên.
+
+    Giá trị không đổi được sang kiểu của cột (ví dụ chữ trong cột số) trở thành rỗng. Các cột đã đúng kiểu
+    không bị sao chép.
+
+    Tham số:
+        data (pandas.DataFrame): Dữ liệu cần đổi kiểu.
+
+    Trả về:
+        pandas.DataFrame: Dữ liệu với các cột đã đổi kiểu.
+    """
+    columns = {}
+    for column in data.columns:
+        series = data[column]
+        kind = SCHEMA.get(column)
+        if kind == "category" and not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        elif kind in INTEGER_TYPES and str(series.dtype) not in INTEGER_TYPES[INTEGER_TYPES.index(kind):]:
+            series = _to_integer(series, kind)
+        columns[column] = series
+    return pd.DataFrame(columns, index=data.index)
+
+
+def coerce_value(column, value, errors="raise"):
+    """
+    Đổi một giá trị nhập vào (thường là chuỗi) sang kiểu Python tương ứng với cột.
+
+    Tham số:
+        column (str): Tên cột.
+        value: Giá trị cần đổi.
+        errors (str, tùy chọn): "raise" để ném lỗi với giá trị không hợp lệ, "coerce" để đổi thành rỗng.
+
+    Trả về:
+        int, str hoặc None: Giá trị đã đổi; None là giá trị rỗng.
+
+    Ngoại lệ:
+        ValueError: Nếu giá trị không hợp lệ với kiểu của cột và `errors` là "raise".
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NA:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value in MISSING_VALUES:
+            return None
+    if SCHEMA.get(column, "category") == "category":
+        return str(value)
+    try:
+        number = float(value)
+        if number == int(number) and abs(number) < 2 ** 63:
+            return int(number)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    if errors == "raise":
+        raise ValueError(f"Giá trị không hợp lệ cho cột {column}: {value!r} (cần một số nguyên).")
+    return None
+
+
+def coerce_row(row, errors="raise"):
+    """
+    Đổi các giá trị của một hàng (theo thứ tự `COLUMN_NAMES`) sang kiểu của từng cột, xem `coerce_value`.
+
+    Trả về:
+        list: Các giá trị đã đổi, ghi được vào nhật ký thay đổi (JSON).
+    """
+    return [coerce_value(column, value, errors) for column, value in zip(COLUMN_NAMES, row)]
+
+
+def _integer_array(values, minimum_type):
+    """
+    Mảng số nguyên có thể rỗng cho các giá trị mới của một cột.
+
+    Giá trị đã được `coerce_row` đổi kiểu (int hoặc None) được chuyển thẳng, các giá trị khác được đổi theo lô.
+    """
+    if all(value is None or type(value) is int for value in values):
+        present = [value for value in values if value is not None]
+        bounds = np.array([min(present), max(present)] if present else [], dtype=float)
+        return pd.array(values, dtype=_integer_type(bounds, minimum_type))
+    return _to_integer(pd.Series(values, dtype=object), minimum_type).array
+
+
+def _category_codes(categories, values):
+    """
+    Mã danh mục của các giá trị (-1 nếu không có trong danh mục); với vài giá trị, tra từng giá trị nhanh hơn
+    `Index.get_indexer`.
+    """
+    if len(values) > 16:
+        return categories.get_indexer(values)
+    return np.array([categories.get_loc(value) if value in categories else -1 for value in values], dtype=np.intp)
+
+
+def conform(data, rows, index=None):
+    """
+    Tạo DataFrame cho các hàng mới với đúng kiểu các cột của `data`, để việc thêm/sửa không đổi kiểu cột.
+
+    Các giá trị mới của cột `category` được bổ sung vào danh mục của cột, và cột số nguyên được nới sang kiểu
+    rộng hơn nếu giá trị mới không vừa; hai thay đổi này được thực hiện trực tiếp trên `data`.
+
+    Tham số:
+        data (pandas.DataFrame): Dữ liệu hiện có.
+        rows (list): Các hàng mới, mỗi hàng là danh sách giá trị theo các cột của `data`.
+        index (pandas.Index, tùy chọn): Nhãn chỉ mục của các hàng mới.
+
+    Trả về:
+        pandas.DataFrame: Các hàng mới, cùng các cột và kiểu với `data`.
+    """
+    columns = list(zip(*rows)) if len(rows) else [()] * len(data.columns)
+    new_columns = {}
+    for column, values in zip(data.columns, columns):
+        series = data[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = _category_codes(series.cat.categories, values)
+            added = list(dict.fromkeys(value for value, code in zip(values, codes)
+                                       if code < 0 and not pd.isna(value)))
+            if added:
+                data[column] = series = series.cat.add_categories(added)
+                codes = _category_codes(series.cat.categories, values)
+            new_columns[column] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif str(series.dtype) in INTEGER_TYPES:
+            array = _integer_array(list(values), str(series.dtype))
+            if array.dtype != series.dtype:
+                data[column] = series.astype(array.dtype)
+            new_columns[column] = array
+        else:
+            new_columns[column] = pd.array(list(values), dtype=series.dtype)
+    return pd.DataFrame(new_columns, index=index if index is not None else pd.RangeIndex(len(rows)))
+
+
+def memory_report(data):
+    """
+    Bộ nhớ sử dụng của từng cột, tính cả các chuỗi Python và danh mục của cột `category`.
+
+    Trả về:
+        pandas.DataFrame: Theo cột (và một hàng "Total"): Dtype, Non-Null, Bytes, Bytes/Row.
+    """
+    usage = data.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        "Dtype": data.dtypes.astype(str),
+        "Non-Null": data.notna().sum(),
+        "Bytes": usage,
+    })
+    report.loc["Total"] = ["", len(data), int(usage.sum())]
+    report["Bytes/Row"] = report["Bytes"] / max(len(data), 1)
+    report.index.name = "Column"
+    return report
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnIndex:
+    """
+    Chỉ mục tìm kiếm chuỗi con cho một cột dữ liệu.
+
+    Mỗi hàng được lưu dưới dạng mã số nguyên của giá trị (chuỗi) của nó; các giá trị phân biệt được lập chỉ mục
+    theo bộ ba ký tự (trigram). Khi tìm kiếm, chỉ các giá trị phân biệt được so khớp với chuỗi cần tìm, sau đó
+    mặt nạ của các hàng được tính bằng một phép tra bảng vector hóa trên mảng mã. Mã 0 dành cho giá trị rỗng (NaN),
+    không bao giờ khớp với chuỗi tìm kiếm.
+    """
+
+    def __init__(self, series):
+        """
+        Xây dựng chỉ mục từ một cột dữ liệu.
+
+        Tham số:
+            series (pandas.Series): Cột dữ liệu cần lập chỉ mục.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.values = [None]
+        self.lowered = [None]
+        self.code_of = {}
+        self.trigrams = {}
+        for value in uniques:
+            self._code(value)
+        self.size = len(codes)
+        self.codes = np.empty(max(16, self.size), dtype=np.int32)
+        self.codes[:self.size] = codes + 1
+
+    def append(self, value):
+        """
+        Thêm mã của một giá trị mới vào cuối chỉ mục.
+        """
+        if self.size == len(self.codes):
+            grown = np.empty(len(self.codes) * 2, dtype=np.int32)
+            grown[:self.size] = self.codes[:self.size]
+            self.codes = grown
+        self.codes[self.size] = self._code(value)
+        self.size += 1
+
+    def extend(self, values):
+        """
+        Thêm mã của nhiều giá trị mới vào cuối chỉ mục; mỗi giá trị phân biệt chỉ được tra cứu một lần.
+        """
+        codes = self._codes(values)
+        size = self.size + len(codes)
+        if size > len(self.codes):
+            grown = np.empty(max(size, len(self.codes) * 2), dtype=np.int32)
+            grown[:self.size] = self.codes[:self.size]
+            self.codes = grown
+        self.codes[self.size:size] = codes
+        self.size = size
+
+    def update(self, positions, values):
+        """
+        Thay giá trị của các hàng ở các vị trí cho trước; mỗi giá trị phân biệt chỉ được tra cứu một lần.
+        """
+        self.codes[np.asarray(positions, dtype=np.int64)] = self._codes(values)
+
+    def delete(self, positions):
+        """
+        Xóa các hàng ở các vị trí cho trước, dồn các hàng phía sau lên.
+        """
+        keep = np.ones(self.size, dtype=bool)
+        keep[positions] = False
+        remaining = self.codes[:self.size][keep]
+        self.codes[:len(remaining)] = remaining
+        self.size = len(remaining)
+
+    def match(self, query):
+        """
+        Tìm các hàng có giá trị chứa chuỗi `query` (không phân biệt chữ hoa chữ thường).
+
+        Trả về:
+            numpy.ndarray: Mặt nạ boolean theo vị trí hàng.
+        """
+        query = query.lower()
+        if len(query) >= 3:
+            candidates = None
+            for i in range(len(query) - 2):
+                codes = self.trigrams.get(query[i:i + 3], set())
+                candidates = codes if candidates is None else candidates & codes
+                if not candidates:
+                    break
+        else:
+            candidates = range(1, len(self.values))
+        hit = np.zeros(len(self.values), dtype=bool)
+        hit[[code for code in candidates if query in self.lowered[code]]] = True
+        return hit[self.codes[:self.size]]
+
+    def _codes(self, values):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        mapping = np.array([0] + [self._code(value) for value in uniques], dtype=np.int32)
+        return mapping[codes + 1]
+
+    def _code(self, value):
+        if pd.isna(value):
+            return 0
+        value = str(value)
+        code = self.code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            lowered = value.lower()
+            self.values.append(value)
+            self.lowered.append(lowered)
+            self.code_of[value] = code
+            for i in range(len(lowered) - 2):
+                self.trigrams.setdefault(lowered[i:i + 3], set()).add(code)
+        return code
+
+
+class SearchIndex:
+    """
+    Tập hợp các chỉ mục tìm kiếm theo cột cho một DataFrame.
+
+    Các vị trí hàng trong chỉ mục luôn khớp với vị trí hàng trong DataFrame; DataManager cập nhật chỉ mục
+    tăng dần sau mỗi thao tác thêm/sửa/xóa thay vì xây dựng lại từ đầu.
+    """
+
+    def __init__(self, data):
+        """
+        Xây dựng chỉ mục cho tất cả các cột của DataFrame.
+
+        Tham số:
+            data (pandas.DataFrame): Dữ liệu cần lập chỉ mục.
+        """
+        self.columns = {column: ColumnIndex(data[column]) for column in data.columns}
+
+    def append(self, row):
+        """
+        Thêm một hàng vào cuối chỉ mục.
+
+        Tham số:
+            row (pandas.Series): Hàng vừa được thêm vào DataFrame.
+        """
+        for column, index in self.columns.items():
+            index.append(row[column])
+
+    def extend(self, rows):
+        """
+        Thêm nhiều hàng vào cuối chỉ mục.
+
+        Tham số:
+            rows (pandas.DataFrame): Các hàng vừa được nối vào DataFrame.
+        """
+        for column, index in self.columns.items():
+            index.extend(rows[column])
+
+    def update(self, positions, rows):
+        """
+        Cập nhật các hàng ở các vị trí cho trước.
+
+        Tham số:
+            positions (list): Vị trí của các hàng trong DataFrame.
+            rows (pandas.DataFrame): Giá trị mới của các hàng, theo cùng thứ tự với `positions`.
+        """
+        for column, index in self.columns.items():
+            index.update(positions, rows[column])
+
+    def delete(self, positions):
+        """
+        Xóa các hàng ở các vị trí cho trước.
+
+        Tham số:
+            positions (list): Danh sách vị trí hàng cần xóa.
+        """
+        for index in self.columns.values():
+            index.delete(positions)
+
+    def match(self, criteria):
+        """
+        Tìm các hàng thỏa mãn đồng thời tất cả các điều kiện.
+
+        Tham số:
+            criteria (dict): Ánh xạ tên cột -> chuỗi con cần tìm.
+
+        Trả về:
+            numpy.ndarray hoặc None: Mặt nạ boolean theo vị trí hàng, hoặc None nếu không có điều kiện nào.
+        """
+        mask = None
+        for column, query in criteria.items():
+            column_mask = self.columns[column].match(query)
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
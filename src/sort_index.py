@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+def _sort_keys(values, numeric):
+    """
+    Chuyển các giá trị (không rỗng) của một cột thành mảng khóa có thể so sánh với nhau.
+
+    Cột số được so sánh theo giá trị số (giá trị không đổi được sang số được xếp sau cùng), các cột khác theo chuỗi.
+    """
+    if numeric:
+        try:
+            return np.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            return pd.to_numeric(pd.Series(list(values), dtype=object), errors="coerce").to_numpy(dtype=float)
+    return np.asarray([str(value) for value in values], dtype=object)
+
+
+class ColumnSortIndex:
+    """
+    Hoán vị sắp xếp (argsort) của một cột, lưu theo mã định danh hàng.
+
+    `keys` là các giá trị không rỗng của cột theo thứ tự tăng dần, `ids` là mã định danh hàng tương ứng;
+    các hàng có giá trị rỗng được giữ riêng trong `null_ids` và luôn được xếp cuối, giống `sort_values`.
+    Các hàng cùng giá trị được xếp theo mã định danh hàng (cũng là thứ tự của chúng trong dữ liệu).
+    Thêm hàng dùng tìm kiếm nhị phân để chèn vào đúng chỗ, xóa hàng chỉ loại bỏ mã khỏi hoán vị, vì vậy
+    hoán vị không bao giờ phải sắp xếp lại từ đầu. Thứ tự giảm dần là thứ tự tăng dần được đọc ngược.
+    """
+
+    def __init__(self, series):
+        """
+        Xây dựng hoán vị sắp xếp cho một cột.
+
+        Tham số:
+            series (pandas.Series): Cột dữ liệu, với chỉ mục là mã định danh hàng.
+        """
+        self.column = series.name
+        self.numeric = pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype)
+        valid = series.notna().to_numpy()
+        ids = series.index.to_numpy(dtype=np.int64)
+        values = series.to_numpy(dtype=float, na_value=np.nan) if self.numeric else series.to_numpy()
+        keys = _sort_keys(values[valid], self.numeric)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.ids = ids[valid][order]
+        self.null_ids = ids[~valid]
+
+    def __len__(self):
+        return len(self.ids) + len(self.null_ids)
+
+    def insert(self, row_ids, values):
+        """
+        Chèn các hàng vào hoán vị bằng tìm kiếm nhị phân, theo thứ tự (giá trị, mã định danh hàng).
+
+        Hàng mới thêm có mã lớn nhất nên đứng sau các hàng cùng giá trị; chỉ hàng được sửa (giữ mã cũ) mới phải tìm
+        chỗ bên trong nhóm các hàng cùng giá trị.
+
+        Tham số:
+            row_ids (list): Mã định danh các hàng.
+            values (list): Giá trị của cột tại các hàng tương ứng.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        null = pd.isna(pd.Series(list(values), dtype=object)).to_numpy()
+        self.null_ids = np.append(self.null_ids, row_ids[null])
+        keys = _sort_keys([value for value, is_null in zip(values, null) if not is_null], self.numeric)
+        if len(keys) == 0:
+            return
+        row_ids = row_ids[~null]
+        order = np.argsort(row_ids, kind="stable")
+        order = order[np.argsort(keys[order], kind="stable")]
+        keys, row_ids = keys[order], row_ids[order]
+        first = np.searchsorted(self.keys, keys, side="left")
+        positions = np.searchsorted(self.keys, keys, side="right")
+        inside = positions > first
+        inside[inside] &= row_ids[inside] < self.ids[positions[inside] - 1]
+        for i in np.flatnonzero(inside):
+            positions[i] = first[i] + np.searchsorted(self.ids[first[i]:positions[i]], row_ids[i])
+        self.keys = np.insert(self.keys, positions, keys)
+        self.ids = np.insert(self.ids, positions, row_ids)
+
+    def remove(self, row_ids):
+        """
+        Loại bỏ các hàng khỏi hoán vị.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        keep = ~np.isin(self.ids, row_ids)
+        self.keys = self.keys[keep]
+        self.ids = self.ids[keep]
+        self.null_ids = self.null_ids[~np.isin(self.null_ids, row_ids)]
+
+    def window(self, start, stop, ascending=True):
+        """
+        Lấy mã định danh của các hàng từ vị trí `start` tới `stop` trong thứ tự sắp xếp.
+
+        Tham số:
+            start (int): Vị trí bắt đầu trong thứ tự sắp xếp.
+            stop (int): Vị trí kết thúc (không bao gồm).
+            ascending (bool, tùy chọn): Thứ tự tăng dần (True) hoặc giảm dần (False). Giá trị rỗng luôn ở cuối.
+
+        Trả về:
+            numpy.ndarray: Mã định danh hàng.
+        """
+        count = len(self.ids)
+        parts = []
+        first, last = min(start, count), min(stop, count)
+        if first < last:
+            parts.append(self.ids[first:last] if ascending else self.ids[count - last:count - first][::-1])
+        if stop > count:
+            parts.append(self.null_ids[max(start - count, 0):stop - count])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class SortedView:
+    """
+    Khung nhìn dữ liệu đã sắp xếp theo một cột, dùng làm nguồn cho `VirtualTable`.
+
+    Chỉ các hàng được yêu cầu qua `fetch_rows` mới được đọc từ dữ liệu.
+    """
+
+    def __init__(self, index, ascending, rows_by_id):
+        """
+        Tham số:
+            index (ColumnSortIndex): Hoán vị sắp xếp của cột.
+            ascending (bool): Thứ tự sắp xếp.
+            rows_by_id (callable): Hàm nhận danh sách mã định danh hàng và trả về các cặp (mã, giá trị các cột).
+        """
+        self.index = index
+        self.ascending = ascending
+        self.rows_by_id = rows_by_id
+        self.row_count = len(index)
+
+    def __len__(self):
+        return self.row_count
+
+    def fetch_rows(self, start, stop):
+        """
+        Lấy các hàng từ vị trí `start` tới `stop` trong thứ tự sắp xếp.
+        """
+        return self.rows_by_id(self.index.window(start, stop, self.ascending))
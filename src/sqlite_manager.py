@@ -0,0 +1,690 @@
+import bisect
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics import ANALYTICS_COLUMNS, compute_statistics
+from data_manager import COLUMN_NAMES
+from schema import CATEGORICAL_COLUMNS, INTEGER_COLUMNS, KEY_COLUMNS, apply_schema, coerce_row
+from storage import StorageEngine
+from tracing import traced
+from validation import check_rows, pair_values, quarantine, validate
+
+TABLE_NAME = "answers"
+COLUMN_TYPES = {column: "INTEGER" for column in INTEGER_COLUMNS}
+INDEXED_COLUMNS = [column for column in COLUMN_NAMES if column != "Keywords"]
+IMPORT_CHUNK_SIZE = 50000
+MAX_VARIABLES = 900
+
+
+def quote(column):
+    """
+    Đặt tên cột trong dấu ngoặc kép để dùng trong câu lệnh SQL.
+    """
+    return '"' + column.replace('"', '""') + '"'
+
+
+class SqlView:
+    """
+    Khung nhìn kết quả một truy vấn trên bảng SQLite, dùng làm nguồn cho `VirtualTable`.
+
+    Khung nhìn gồm một hoặc nhiều đoạn nối tiếp nhau (xem `SqlSegment`). Số hàng của mỗi đoạn được đếm khi tạo khung
+    nhìn; `fetch_rows` chỉ đọc các hàng được yêu cầu, vì vậy dữ liệu không cần nằm trong bộ nhớ.
+    """
+
+    def __init__(self, storage, segments):
+        """
+        Tham số:
+            storage (SqliteDataManager): Bộ lưu trữ chứa bảng dữ liệu.
+            segments (list): Các bộ (điều kiện WHERE, tham số, cột sắp xếp hoặc None, chiều "ASC" hoặc "DESC").
+        """
+        self.segments = [SqlSegment(storage, *segment) for segment in segments]
+        self.row_count = sum(segment.count for segment in self.segments)
+
+    def __len__(self):
+        return self.row_count
+
+    def fetch_rows(self, start, stop):
+        """
+        Lấy các hàng từ vị trí `start` tới `stop` của khung nhìn.
+        """
+        rows = []
+        offset = 0
+        for segment in self.segments:
+            first, last = max(start - offset, 0), min(stop - offset, segment.count)
+            if first < last:
+                rows.extend(segment.fetch(first, last))
+            offset += segment.count
+        return rows
+
+
+class SqlSegment:
+    """
+    Một đoạn của `SqlView`: các hàng thỏa mãn một điều kiện WHERE, sắp theo một cột rồi theo mã định danh hàng
+    (cùng chiều), hoặc chỉ theo mã định danh hàng.
+
+    Các trang được đọc theo khóa (keyset) thay vì LIMIT/OFFSET từ đầu đoạn: vị trí và khóa (giá trị cột, mã định danh
+    hàng) của hàng đầu và hàng cuối mỗi trang đã đọc được ghi nhớ làm mốc, và trang mới được đọc từ mốc gần nhất, phía
+    trước hoặc phía sau nó (đầu và cuối đoạn cũng là mốc), bằng điều kiện so sánh với khóa trên chỉ mục của cột.
+    OFFSET chỉ còn dùng cho khoảng cách giữa mốc và trang cần đọc: bằng 0 khi cuộn liên tục và nhỏ khi cuộn từng trang
+    hay nhảy tới đầu hoặc cuối; chỉ khi nhảy vào giữa một vùng chưa đọc mới phải bỏ qua nhiều hàng.
+    """
+
+    def __init__(self, storage, where, params, column, direction):
+        """
+        Tham số:
+            storage (SqliteDataManager): Bộ lưu trữ chứa bảng dữ liệu.
+            where (str): Điều kiện WHERE của đoạn.
+            params (tuple): Tham số của điều kiện.
+            column (str): Tên cột sắp xếp (các hàng của đoạn không được có giá trị NULL ở cột này), hoặc None để chỉ
+                sắp theo mã định danh hàng.
+            direction (str): "ASC" hoặc "DESC".
+        """
+        self.storage = storage
+        self.where = where
+        self.params = tuple(params)
+        self.column = column
+        self.ascending = direction == "ASC"
+        self.count = storage.count(where, params)
+        self.positions = []
+        self.keys = []
+
+    def fetch(self, first, last):
+        """
+        Lấy các hàng từ vị trí `first` tới `last` của đoạn.
+        """
+        index = bisect.bisect_left(self.positions, first)
+        before, before_key = (self.positions[index - 1], self.keys[index - 1]) if index else (-1, None)
+        index = bisect.bisect_left(self.positions, last)
+        after, after_key = (self.count, None)
+        if index < len(self.positions):
+            after, after_key = self.positions[index], self.keys[index]
+        if first - before - 1 <= after - last:
+            rows = self._read(before_key, True, last - first, first - before - 1)
+        else:
+            rows = self._read(after_key, False, last - first, after - last)[::-1]
+        if rows:
+            self._remember(first, rows[0])
+            self._remember(first + len(rows) - 1, rows[-1])
+        return rows
+
+    def _read(self, key, forward, limit, offset):
+        # Đọc `limit` hàng sau (hoặc trước) khóa `key`, bỏ qua `offset` hàng đầu tiên; None là đầu (hoặc cuối) đoạn.
+        direction, compare = ("ASC", ">") if self.ascending == forward else ("DESC", "<")
+        by_id = f"row_id {direction}"
+        order = f"{quote(self.column)} {direction}, {by_id}" if self.column else by_id
+        if key is None:
+            return self.storage.select(self.where, self.params, order, limit, offset)
+        value, row_id = key
+        if self.column is None:
+            return self.storage.select(f"({self.where}) AND row_id {compare} ?", self.params + (row_id,), order,
+                                       limit, offset)
+        # SQLite chỉ tìm thẳng tới khóa (giá trị, row_id) trong chỉ mục khi cột được so sánh bằng, nên các hàng cùng
+        # giá trị với mốc và các hàng có giá trị lớn hơn (nhỏ hơn) được đọc bằng hai truy vấn.
+        column = quote(self.column)
+        ties_where = f"({self.where}) AND {column} = ? AND row_id {compare} ?"
+        ties_params = self.params + (value, row_id)
+        rows = self.storage.select(ties_where, ties_params, by_id, limit, offset)
+        if len(rows) == limit:
+            return rows
+        skipped = offset if rows else min(offset, self.storage.count(ties_where, ties_params))
+        return rows + self.storage.select(f"({self.where}) AND {column} {compare} ?", self.params + (value,), order,
+                                          limit - len(rows), offset - skipped)
+
+    def _remember(self, position, row):
+        row_id, values = row
+        key = (values[COLUMN_NAMES.index(self.column)] if self.column else None, row_id)
+        index = bisect.bisect_left(self.positions, position)
+        if index == len(self.positions) or self.positions[index] != position:
+            self.positions.insert(index, position)
+            self.keys.insert(index, key)
+
+
+class SqlPairs:
+    """
+    Các cặp (Student ID, Question ID) đã có trong bảng, tra bằng SQL theo chỉ mục của cột "Student ID".
+
+    Dùng làm tham số `existing` của `validation.find_problems`, nên việc kiểm tra trùng lặp không cần nạp bảng vào
+    bộ nhớ.
+    """
+
+    def __init__(self, connection, exclude=()):
+        """
+        Tham số:
+            connection (sqlite3.Connection): Kết nối dùng để tra cứu (trong giao dịch đang ghi, nếu có).
+            exclude (list, tùy chọn): Mã định danh các hàng không được tính, ví dụ các hàng sắp được sửa.
+        """
+        self.connection = connection
+        self.exclude = {int(row_id) for row_id in exclude}
+
+    def contains(self, keys):
+        """
+        Mặt nạ các khóa (xem `validation.pair_values`) đã có trong bảng.
+        """
+        students, questions = pair_values(keys)
+        pairs = list(zip(students.tolist(), questions.tolist()))
+        student_ids = sorted(set(students.tolist()))
+        student, question = (quote(column) for column in KEY_COLUMNS)
+        found = set()
+        for start in range(0, len(student_ids), MAX_VARIABLES):
+            chunk = student_ids[start:start + MAX_VARIABLES]
+            marks = ", ".join("?" for _ in chunk)
+            rows = self.connection.execute(
+                f"SELECT row_id, {student}, {question} FROM {TABLE_NAME} WHERE {student} IN ({marks})", chunk)
+            if self.exclude:
+                rows = [row for row in rows if row[0] not in self.exclude]
+            found.update(row[1:] for row in rows)
+        return np.fromiter((pair in found for pair in pairs), dtype=bool, count=len(pairs))
+
+
+class SqlAggregates:
+    """
+    Các bảng đếm dùng cho biểu đồ, tính bằng GROUP BY trong SQLite.
+
+    Có cùng giao diện với `AggregateCache` (thuộc tính `columns`, các phương thức `country_answer_table()`,
+    `level_counts()`, `topic_counts()`), nên các hàm vẽ trong `chart_utils` dùng được trực tiếp.
+    Giá trị rỗng (NULL) không được đếm.
+    """
+
+    def __init__(self, storage):
+        """
+        Tính các bảng đếm từ bảng dữ liệu.
+
+        Tham số:
+            storage (SqliteDataManager): Bộ lưu trữ chứa bảng dữ liệu.
+        """
+        self.columns = list(COLUMN_NAMES)
+        self.country_answer = storage.group_count(["Student Country", "Type of Answer"])
+        self.levels = storage.group_count(["Question Level"])
+        self.topics = storage.group_count(["Topic"])
+
+    def country_answer_table(self):
+        """
+        Bảng số câu trả lời theo quốc gia (hàng) và loại câu trả lời (cột).
+        """
+        if not self.country_answer:
+            return pd.DataFrame()
+        counts = pd.Series({key: count for key, count in self.country_answer})
+        counts.index.names = ["Student Country", "Type of Answer"]
+        return counts.sort_index().unstack(fill_value=0)
+
+    def level_counts(self):
+        """
+        Số câu hỏi theo cấp độ, sắp xếp giảm dần.
+        """
+        return self._as_series(self.levels, "Question Level")
+
+    def topic_counts(self):
+        """
+        Số câu hỏi theo chủ đề, sắp xếp giảm dần.
+        """
+        return self._as_series(self.topics, "Topic")
+
+    def _as_series(self, groups, name):
+        counts = pd.Series({key[0]: count for key, count in groups}, dtype="int64", name="count")
+        counts.index.name = name
+        return counts.sort_values(ascending=False, kind="stable")
+
+
+class SqliteDataManager(StorageEngine):
+    """
+    Bộ lưu trữ dữ liệu trên cơ sở dữ liệu SQLite.
+
+    Dữ liệu nằm trong bảng `answers`, mỗi hàng có mã định danh `row_id` (khóa chính, không được dùng lại sau khi
+    xóa). Các cột (trừ "Keywords") đều được đánh chỉ mục. Thêm/sửa/xóa là các giao dịch theo hàng nên không phải
+    ghi lại toàn bộ dữ liệu; tìm kiếm, sắp xếp, phân trang và các bảng đếm cho biểu đồ đều được thực hiện bằng
+    SQL, vì vậy dữ liệu lớn hơn bộ nhớ vẫn dùng được với `App`.
+
+    Các hàng được thêm/sửa được kiểm tra bằng `validation` như với `DataManager` (cùng tùy chọn `unique_pairs`):
+    `add_data` và `update_rows` ném
+    `ValueError`, còn `append_rows` và `import_csv` chuyển các hàng không hợp lệ vào file cách ly
+    `<file_name>.quarantine.csv`. Giá trị rỗng được lưu là NULL.
+
+    Cơ sở dữ liệu được mở ở chế độ WAL. Các thao tác ghi dùng chung một kết nối được bảo vệ bởi `self.lock`;
+    mỗi luồng đọc dữ liệu qua kết nối riêng của mình nên việc đọc (ví dụ cuộn bảng) không phải chờ các truy vấn
+    dài ở luồng nền.
+    """
+
+    def __init__(self, file_name="./data/dataset.db", use_validation=True, unique_pairs=False, notify=None):
+        """
+        Mở (hoặc tạo mới) cơ sở dữ liệu.
+
+        Tham số:
+            file_name (str, tùy chọn): Đường dẫn tới file cơ sở dữ liệu SQLite.
+            use_validation (bool, tùy chọn): Kiểm tra và cách ly các hàng không hợp lệ (xem `validation`).
+            unique_pairs (bool, tùy chọn): Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ.
+            notify (callable, tùy chọn): Hàm `notify(level, title, message)` nhận các thông báo, xem `DataManager`.
+        """
+        self.file_name = file_name
+        self.notify = notify
+        self.use_validation = use_validation
+        self.unique_pairs = unique_pairs
+        self.quarantine_file = file_name + ".quarantine.csv"
+        self.lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = []
+        self._aggregates = None
+        self.version = 0
+        if not os.path.exists(file_name):
+            self._notify("warning", "Cảnh báo", "File không tồn tại. Tạo cơ sở dữ liệu mới.")
+        self.connection = self._connect()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.file_name, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.create_function("icontains", 2, self._icontains, deterministic=True)
+        return connection
+
+    def _reader(self):
+        """
+        Kết nối chỉ dùng để đọc của luồng hiện tại.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            with self.lock:
+                self._readers.append(connection)
+        return connection
+
+    def _create_schema(self):
+        columns = ", ".join(f"{quote(column)} {COLUMN_TYPES.get(column, 'TEXT')}" for column in COLUMN_NAMES)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} (row_id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+            for position, column in enumerate(INDEXED_COLUMNS):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {TABLE_NAME}_column_{position} ON {TABLE_NAME} ({quote(column)})")
+
+    @staticmethod
+    def _icontains(value, needle):
+        if value is None or needle is None:
+            return None
+        return needle.casefold() in str(value).casefold()
+
+    def row_count(self):
+        """
+        Tổng số hàng dữ liệu.
+        """
+        return self.count("1", ())
+
+    def count(self, where, params):
+        """
+        Đếm số hàng thỏa mãn điều kiện `where`.
+        """
+        return self._reader().execute(f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE {where}", params).fetchall()[0][0]
+
+    def select(self, where, params, order, limit, offset=0):
+        """
+        Đọc một trang các hàng thỏa mãn điều kiện `where` theo thứ tự `order`.
+
+        Trả về:
+            list: Các cặp (mã định danh hàng, tuple giá trị các cột); NULL được hiển thị là chuỗi rỗng.
+        """
+        columns = ", ".join(quote(column) for column in COLUMN_NAMES)
+        cursor = self._reader().execute(
+            f"SELECT row_id, {columns} FROM {TABLE_NAME} WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            tuple(params) + (limit, offset))
+        return [(row[0], tuple("" if value is None else value for value in row[1:])) for row in cursor]
+
+    def group_count(self, columns):
+        """
+        Đếm số hàng theo từng nhóm giá trị của các cột (GROUP BY), bỏ qua các hàng có giá trị rỗng.
+
+        Trả về:
+            list: Các cặp (tuple giá trị nhóm, số hàng).
+        """
+        names = ", ".join(quote(column) for column in columns)
+        where = " AND ".join(f"{quote(column)} IS NOT NULL" for column in columns)
+        cursor = self._reader().execute(
+            f"SELECT {names}, COUNT(*) FROM {TABLE_NAME} WHERE {where} GROUP BY {names} ORDER BY {names}")
+        return [(tuple(row[:-1]), row[-1]) for row in cursor]
+
+    @traced
+    def sorted_view(self, sort_by, ascending=True):
+        """
+        Tạo khung nhìn dữ liệu đã sắp xếp theo một cột.
+
+        Thứ tự giống `DataManager.sorted_view`: các giá trị rỗng luôn ở cuối theo thứ tự mã định danh hàng, thứ tự
+        giảm dần là thứ tự tăng dần được đọc ngược. Cả hai đoạn đều đọc theo chỉ mục của cột nên không phải sắp xếp.
+
+        Tham số:
+            sort_by (str): Tên cột cần sắp xếp.
+            ascending (bool, tùy chọn): Thứ tự sắp xếp.
+
+        Trả về:
+            SqlView: Khung nhìn có `len()` và `fetch_rows(start, stop)`, dùng cho `VirtualTable.show_view`.
+        """
+        if sort_by not in COLUMN_NAMES:
+            return SqlView(self, [("1", (), None, "ASC")])
+        column = quote(sort_by)
+        direction = "ASC" if ascending else "DESC"
+        return SqlView(self, [(f"{column} IS NOT NULL", (), sort_by, direction),
+                              (f"{column} IS NULL", (), None, "ASC")])
+
+    @traced
+    def search_view(self, search_values, progress=None):
+        """
+        Tìm kiếm dữ liệu dựa trên các giá trị tìm kiếm.
+
+        Mỗi giá trị tìm kiếm trở thành một điều kiện chuỗi con, không phân biệt chữ hoa chữ thường, trên cột tương
+        ứng; các điều kiện được nối bằng AND. Chuỗi ASCII dùng toán tử LIKE của SQLite, các chuỗi khác dùng hàm
+        `icontains` (LIKE chỉ bỏ qua chữ hoa chữ thường với ký tự ASCII).
+
+        Tham số:
+            search_values (list): Danh sách các giá trị tìm kiếm, tương ứng với các cột.
+            progress (callable, tùy chọn): Hàm `progress(fraction, message)`, được gọi trước và sau khi đếm kết quả.
+
+        Trả về:
+            SqlView: Khung nhìn các hàng thỏa mãn điều kiện tìm kiếm, theo thứ tự mã định danh hàng.
+        """
+        where, params = self._search_condition(search_values)
+        if progress:
+            progress(0.0, "Đang tìm kiếm trong cơ sở dữ liệu...")
+        view = SqlView(self, [(where, params, None, "ASC")])
+        if progress:
+            progress(1.0, "Đã tìm xong")
+        return view
+
+    def _search_condition(self, search_values):
+        """
+        Tạo điều kiện WHERE (và các tham số) cho các giá trị tìm kiếm, xem `search_view`.
+        """
+        conditions, params = [], []
+        for column, value in zip(COLUMN_NAMES, search_values):
+            if not value:
+                continue
+            if value.isascii():
+                escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conditions.append(f"CAST({quote(column)} AS TEXT) LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+            else:
+                conditions.append(f"icontains({quote(column)}, ?)")
+                params.append(value)
+        return " AND ".join(conditions) or "1", tuple(params)
+
+    @traced
+    def aggregates(self):
+        """
+        Lấy các bảng đếm dùng cho biểu đồ, tính lại bằng GROUP BY khi dữ liệu đã thay đổi.
+
+        Trả về:
+            SqlAggregates: Các bảng đếm.
+        """
+        with self.lock:
+            if self._aggregates is None:
+                self._aggregates = SqlAggregates(self)
+            return self._aggregates
+
+    @traced
+    def statistics(self, workers=None):
+        """
+        Tính thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia trên nhiều lõi CPU.
+
+        Chỉ các cột cần thiết được đọc từ cơ sở dữ liệu (xem `compute_statistics`).
+
+        Trả về:
+            Statistics: Kết quả thống kê.
+        """
+        columns = ", ".join(quote(column) for column in ANALYTICS_COLUMNS)
+        data = pd.read_sql_query(f"SELECT {columns} FROM {TABLE_NAME}", self._reader())
+        return compute_statistics(data, workers=workers)
+
+    @traced
+    def add_data(self, new_data):
+        """
+        Thêm một hàng dữ liệu mới.
+
+        Các giá trị được đổi sang kiểu của từng cột (xem `schema.coerce_row`) và được kiểm tra (xem `validation`).
+
+        Tham số:
+            new_data (list): Danh sách các giá trị tương ứng với các cột.
+
+        Ngoại lệ:
+            ValueError: Nếu hàng không hợp lệ, kể cả (khi bật `unique_pairs`) khi cặp (Student ID, Question ID) đã
+                có trong bảng.
+        """
+        row = coerce_row(new_data)
+        with self.lock, self.connection:
+            if self.use_validation:
+                check_rows([row], self._pairs(), self.unique_pairs)
+            self._write([row])
+            self._aggregates = None
+            self.version += 1
+
+    @traced
+    def update_rows(self, row_ids, updated_data):
+        """
+        Cập nhật nhiều hàng cùng lúc theo mã định danh hàng, trong một giao dịch.
+
+        Tham số:
+            row_ids (list): Danh sách mã định danh các hàng cần cập nhật.
+            updated_data (list): Danh sách các giá trị mới cho các hàng được cập nhật.
+
+        Ngoại lệ:
+            KeyError: Nếu có mã định danh không tồn tại; khi đó không hàng nào bị thay đổi.
+            ValueError: Nếu hàng giá trị mới không hợp lệ, hoặc khi bật `unique_pairs`, các hàng sau khi sửa trùng
+                cặp (Student ID, Question ID) với nhau hoặc với một hàng khác.
+        """
+        assignments = ", ".join(f"{quote(column)} = ?" for column in COLUMN_NAMES)
+        values = coerce_row(updated_data)
+        with self.lock, self.connection:
+            self._require_rows(row_ids)
+            if self.use_validation:
+                check_rows([values] * len(row_ids), self._pairs(exclude=row_ids), self.unique_pairs)
+            self.connection.executemany(f"UPDATE {TABLE_NAME} SET {assignments} WHERE row_id = ?",
+                                        [values + [int(row_id)] for row_id in row_ids])
+            self._aggregates = None
+            self.version += 1
+
+    @traced
+    def delete_rows(self, row_ids):
+        """
+        Xóa nhiều hàng cùng lúc theo mã định danh hàng, trong một giao dịch.
+
+        Tham số:
+            row_ids (list): Danh sách mã định danh các hàng cần xóa.
+
+        Ngoại lệ:
+            KeyError: Nếu có mã định danh không tồn tại; khi đó không hàng nào bị xóa.
+        """
+        with self.lock, self.connection:
+            self._require_rows(row_ids)
+            self.connection.executemany(f"DELETE FROM {TABLE_NAME} WHERE row_id = ?",
+                                        [(int(row_id),) for row_id in row_ids])
+            self._aggregates = None
+            self.version += 1
+
+    @traced
+    def append_rows(self, rows):
+        """
+        Thêm nhiều hàng cùng lúc trong một giao dịch.
+
+        Các hàng không hợp lệ được chuyển vào file cách ly thay vì được thêm (xem `_insert`).
+
+        Tham số:
+            rows (pandas.DataFrame hoặc list): Các hàng cần thêm; DataFrame được sắp lại theo các cột của dữ liệu.
+
+        Trả về:
+            int: Số hàng đã thêm.
+        """
+        with self.lock, self.connection:
+            count, rejected = self._insert(rows)
+            self._aggregates = None
+            self.version += 1
+        self._notify_rejected(rejected)
+        return count
+
+    @traced
+    def delete_where(self, search_values):
+        """
+        Xóa tất cả các hàng thỏa mãn điều kiện tìm kiếm (xem `search_view`) bằng một câu lệnh DELETE.
+
+        Tham số:
+            search_values (list): Danh sách các giá trị tìm kiếm, tương ứng với các cột.
+
+        Trả về:
+            int: Số hàng đã xóa.
+
+        Ngoại lệ:
+            ValueError: Nếu không có điều kiện nào (để tránh xóa toàn bộ dữ liệu).
+        """
+        if not any(search_values):
+            raise ValueError("Cần ít nhất một điều kiện để xóa theo bộ lọc.")
+        where, params = self._search_condition(search_values)
+        with self.lock, self.connection:
+            count = self.connection.execute(f"DELETE FROM {TABLE_NAME} WHERE {where}", params).rowcount
+            self._aggregates = None
+            self.version += 1
+        return count
+
+    def _insert(self, rows):
+        """
+        Kiểm tra (xem `validation`) và thêm một lô hàng trong giao dịch đang mở; các hàng không hợp lệ (kể cả, khi bật
+        `unique_pairs`, các hàng trùng cặp (Student ID, Question ID) với bảng) được ghi vào file cách ly. Các giá trị
+        được đổi sang kiểu của từng cột theo lô (`schema.apply_schema`), giá trị rỗng thành NULL.
+
+        Trả về:
+            tuple: (số hàng đã thêm, số hàng bị cách ly).
+        """
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(list(rows), columns=COLUMN_NAMES)
+        rows = rows.reindex(columns=COLUMN_NAMES)
+        rejected = 0
+        if self.use_validation:
+            rows, invalid = validate(rows, self._pairs(), self.unique_pairs)
+            if len(invalid):
+                quarantine(invalid, self.quarantine_file)
+                rejected = len(invalid)
+        frame = apply_schema(rows).astype(object)
+        return self._write(frame.where(frame.notna(), None).to_numpy().tolist()), rejected
+
+    def _pairs(self, exclude=()):
+        """
+        Các cặp (Student ID, Question ID) trong bảng trừ các hàng `exclude`, hoặc None nếu không bật `unique_pairs`.
+        """
+        return SqlPairs(self.connection, exclude=exclude) if self.unique_pairs else None
+
+    def _write(self, rows):
+        """
+        Thêm các hàng có giá trị kiểu Python (int, str, None), ví dụ kết quả của `coerce_row`.
+        """
+        columns = ", ".join(quote(column) for column in COLUMN_NAMES)
+        marks = ", ".join("?" for _ in COLUMN_NAMES)
+        return self.connection.executemany(f"INSERT INTO {TABLE_NAME} ({columns}) VALUES ({marks})", rows).rowcount
+
+    def _notify_rejected(self, rejected):
+        if rejected:
+            self._notify("warning", "Cảnh báo",
+                         f"{rejected} hàng không hợp lệ đã được chuyển vào file {self.quarantine_file}.")
+
+    def _require_rows(self, row_ids):
+        """
+        Ném `KeyError` nếu có mã định danh hàng không tồn tại trong bảng.
+        """
+        row_ids = [int(row_id) for row_id in row_ids]
+        found = set()
+        for start in range(0, len(row_ids), MAX_VARIABLES):
+            chunk = row_ids[start:start + MAX_VARIABLES]
+            marks = ", ".join("?" for _ in chunk)
+            found.update(row[0] for row in self.connection.execute(
+                f"SELECT row_id FROM {TABLE_NAME} WHERE row_id IN ({marks})", chunk))
+        missing = [row_id for row_id in row_ids if row_id not in found]
+        if missing:
+            raise KeyError(f"Không tìm thấy hàng: {missing}")
+
+    @traced
+    def import_csv(self, csv_file, replace=False, chunksize=IMPORT_CHUNK_SIZE):
+        """
+        Nhập dữ liệu từ một file CSV (định dạng của `DataManager`) vào cơ sở dữ liệu.
+
+        File được đọc từng phần `chunksize` hàng nên không cần nằm trọn trong bộ nhớ; toàn bộ việc nhập là một
+        giao dịch duy nhất. Các hàng không hợp lệ được chuyển vào file cách ly (xem `_insert`).
+
+        Tham số:
+            csv_file (str): Đường dẫn tới file CSV.
+            replace (bool, tùy chọn): Xóa dữ liệu hiện có trước khi nhập.
+            chunksize (int, tùy chọn): Số hàng đọc mỗi lần.
+
+        Trả về:
+            int: Số hàng đã nhập.
+        """
+        imported = rejected = 0
+        with self.lock, self.connection:
+            if replace:
+                self.connection.execute(f"DELETE FROM {TABLE_NAME}")
+            for chunk in pd.read_csv(csv_file, delimiter=";", encoding="utf-8", chunksize=chunksize,
+                                     dtype={column: "category" for column in CATEGORICAL_COLUMNS}):
+                count, invalid = self._insert(chunk)
+                imported += count
+                rejected += invalid
+            self._aggregates = None
+            self.version += 1
+        self._notify_rejected(rejected)
+        return imported
+
+    @traced
+    def export_csv(self, csv_file, chunksize=IMPORT_CHUNK_SIZE):
+        """
+        Xuất toàn bộ dữ liệu ra một file CSV (định dạng của `DataManager`), theo thứ tự mã định danh hàng.
+
+        Dữ liệu được đọc từng phần và ghi vào một file tạm, sau đó đổi tên nguyên tử thành `csv_file`.
+
+        Tham số:
+            csv_file (str): Đường dẫn tới file CSV cần ghi.
+            chunksize (int, tùy chọn): Số hàng đọc mỗi lần.
+
+        Trả về:
+            int: Số hàng đã xuất.
+        """
+        columns = ", ".join(quote(column) for column in COLUMN_NAMES)
+        exported = 0
+        tmp_name = csv_file + ".tmp"
+        with open(tmp_name, "w", encoding="utf-8", newline="") as handle:
+            chunks = pd.read_sql_query(f"SELECT {columns} FROM {TABLE_NAME} ORDER BY row_id", self._reader(),
+                                       chunksize=chunksize)
+            for chunk in chunks:
+                chunk.to_csv(handle, sep=";", index=False, header=exported == 0)
+                exported += len(chunk)
+            if exported == 0:
+                pd.DataFrame(columns=COLUMN_NAMES).to_csv(handle, sep=";", index=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, csv_file)
+        return exported
+
+    def close(self):
+        """
+        Đóng các kết nối tới cơ sở dữ liệu.
+        """
+        with self.lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+            self.connection.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Nhập/xuất dữ liệu giữa file CSV và cơ sở dữ liệu SQLite.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("csv_file")
+    parser.add_argument("database")
+    parser.add_argument("--replace", action="store_true", help="Xóa dữ liệu hiện có trước khi nhập.")
+    parser.add_argument("--unique-pairs", action="store_true",
+                        help="Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ.")
+    arguments = parser.parse_args()
+    storage = SqliteDataManager(arguments.database, unique_pairs=arguments.unique_pairs,
+                                notify=lambda level, title, message: print(message))
+    try:
+        if arguments.command == "import":
+            print(f"Đã nhập {storage.import_csv(arguments.csv_file, replace=arguments.replace)} hàng.")
+        else:
+            print(f"Đã xuất {storage.export_csv(arguments.csv_file)} hàng.")
+    finally:
+        storage.close()
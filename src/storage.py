@@ -0,0 +1,171 @@
+import os
+
+READ_ONLY_MESSAGE = "Bộ lưu trữ này chỉ cho phép đọc dữ liệu."
+
+
+class StorageEngine:
+    """
+    Giao diện chung của các bộ lưu trữ dữ liệu mà ứng dụng sử dụng.
+
+    Ứng dụng (`App`) chỉ làm việc với dữ liệu qua các phương thức dưới đây, vì vậy có thể chạy trên bất kỳ bộ
+    lưu trữ nào cài đặt chúng: `DataManager` (DataFrame trong bộ nhớ + file CSV) hoặc `SqliteDataManager`
+    (cơ sở dữ liệu SQLite, dữ liệu không cần nằm trọn trong bộ nhớ). Các hàng được xác định bằng mã định danh
+    hàng ổn định; các khung nhìn (view) có `len()` và `fetch_rows(start, stop)` để dùng với `VirtualTable`.
+    Bộ lưu trữ có `read_only = True` không hỗ trợ thêm/sửa/xóa. `version` tăng mỗi khi dữ liệu thay đổi, để các
+    kết quả tính từ dữ liệu (ví dụ biểu đồ đã vẽ, xem `chart_utils.ChartPanel`) biết khi nào cần tính lại.
+    """
+
+    read_only = False
+    version = 0
+
+    def row_count(self):
+        """
+        Tổng số hàng dữ liệu.
+        """
+        raise NotImplementedError
+
+    def sorted_view(self, sort_by, ascending=True):
+        """
+        Khung nhìn toàn bộ dữ liệu, sắp xếp theo cột `sort_by`.
+        """
+        raise NotImplementedError
+
+    def search_view(self, search_values, progress=None):
+        """
+        Khung nhìn các hàng thỏa mãn điều kiện tìm kiếm (chuỗi con, không phân biệt chữ hoa chữ thường)
+        theo từng cột tương ứng với `search_values`.
+        """
+        raise NotImplementedError
+
+    def aggregates(self):
+        """
+        Các bảng đếm dùng cho biểu đồ: có thuộc tính `columns` và các phương thức `country_answer_table()`,
+        `level_counts()`, `topic_counts()` (xem `AggregateCache`).
+        """
+        raise NotImplementedError
+
+    def statistics(self, workers=None):
+        """
+        Thống kê theo học sinh, theo câu hỏi và theo chủ đề/quốc gia (xem `analytics.compute_statistics`).
+        """
+        raise NotImplementedError("Bộ lưu trữ này không hỗ trợ thống kê theo học sinh và câu hỏi.")
+
+    def add_data(self, new_data):
+        """
+        Thêm một hàng dữ liệu mới.
+        """
+        raise NotImplementedError(READ_ONLY_MESSAGE)
+
+    def update_rows(self, row_ids, updated_data):
+        """
+        Cập nhật nhiều hàng theo mã định danh hàng trong một thao tác.
+        """
+        raise NotImplementedError(READ_ONLY_MESSAGE)
+
+    def delete_rows(self, row_ids):
+        """
+        Xóa nhiều hàng theo mã định danh hàng trong một thao tác.
+        """
+        raise NotImplementedError(READ_ONLY_MESSAGE)
+
+    def append_rows(self, rows):
+        """
+        Thêm nhiều hàng (DataFrame hoặc danh sách hàng) trong một thao tác; trả về số hàng đã thêm.
+        """
+        raise NotImplementedError(READ_ONLY_MESSAGE)
+
+    def delete_where(self, search_values):
+        """
+        Xóa tất cả các hàng thỏa mãn điều kiện tìm kiếm trong một thao tác; trả về số hàng đã xóa.
+        """
+        raise NotImplementedError(READ_ONLY_MESSAGE)
+
+    def pending_changes(self):
+        """
+        Số thay đổi chưa được ghi gộp vào nơi lưu trữ chính (xem `compact`).
+        """
+        return 0
+
+    def compact(self):
+        """
+        Ghi gộp các thay đổi đang chờ vào nơi lưu trữ chính.
+        """
+
+    def purge_rejected(self):
+        """
+        Xóa vĩnh viễn khỏi nơi lưu trữ chính các hàng không hợp lệ đã bị bỏ qua khi tải.
+
+        Trả về:
+            int: Số hàng đã xóa.
+        """
+        return 0
+
+    def close(self):
+        """
+        Ghi các thay đổi còn lại và giải phóng tài nguyên.
+        """
+
+    def _notify(self, level, title, message):
+        """
+        Gửi một thông báo tới người dùng qua `self.notify`, hoặc `messagebox` nếu không được chỉ định.
+
+        `tkinter` chỉ được nạp khi cần hiển thị hộp thoại, để tầng dữ liệu dùng được khi không có màn hình
+        (ví dụ `cli.py` truyền `notify` ghi ra stderr).
+        """
+        if self.notify:
+            self.notify(level, title, message)
+        else:
+            from tkinter import messagebox
+            getattr(messagebox, "show" + level)(title, message)
+
+
+class FrameView:
+    """
+    Khung nhìn trên một DataFrame, dùng làm nguồn cho `VirtualTable`.
+
+    Khóa của mỗi hàng là nhãn chỉ mục của hàng đó trong DataFrame.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def fetch_rows(self, start, stop):
+        """
+        Lấy các hàng từ vị trí `start` tới `stop`.
+        """
+        window = self.frame.iloc[start:stop]
+        return list(zip(window.index, window.itertuples(index=False, name=None)))
+
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+
+def open_storage(file_name, notify=None, streaming=False, unique_pairs=False, **csv_options):
+    """
+    Mở bộ lưu trữ phù hợp với file dữ liệu.
+
+    File có phần mở rộng `.db`, `.sqlite` hoặc `.sqlite3` được mở bằng `SqliteDataManager`,
+    các file khác bằng `DataManager` (CSV), hoặc `StreamingDataManager` nếu `streaming` là True.
+
+    Tham số:
+        file_name (str): Đường dẫn tới file dữ liệu.
+        notify (callable, tùy chọn): Hàm nhận thông báo lỗi/cảnh báo, xem `DataManager`.
+        streaming (bool, tùy chọn): Đọc file CSV theo từng phần, chỉ đọc (cho file lớn hơn bộ nhớ).
+        unique_pairs (bool, tùy chọn): Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ, xem
+            `validation` (không áp dụng cho chế độ đọc luồng).
+        **csv_options: Các tùy chọn khác của `DataManager` (bỏ qua với SQLite và chế độ đọc luồng).
+
+    Trả về:
+        StorageEngine: Bộ lưu trữ đã được mở.
+    """
+    if os.path.splitext(file_name)[1].lower() in SQLITE_EXTENSIONS:
+        from sqlite_manager import SqliteDataManager
+        return SqliteDataManager(file_name, unique_pairs=unique_pairs, notify=notify)
+    if streaming:
+        from streaming import StreamingDataManager
+        return StreamingDataManager(file_name, notify=notify)
+    from data_manager import DataManager
+    return DataManager(file_name, unique_pairs=unique_pairs, notify=notify, **csv_options)
@@ -0,0 +1,218 @@
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aggregate_cache import AggregateCache
+from data_manager import COLUMN_NAMES
+from storage import StorageEngine
+from tracing import traced
+
+CHUNK_SIZE = 100000
+PAGE_SIZE = 1000
+
+
+def read_chunks(file_name, chunksize=CHUNK_SIZE, usecols=None):
+    """
+    Đọc file CSV (định dạng của `DataManager`) thành từng phần `chunksize` hàng.
+
+    Nhãn chỉ mục của mỗi phần là vị trí hàng trong file, tính từ 0, giống như khi đọc toàn bộ file.
+
+    Tham số:
+        file_name (str): Đường dẫn tới file CSV.
+        chunksize (int, tùy chọn): Số hàng của mỗi phần.
+        usecols (list, tùy chọn): Chỉ đọc các cột này.
+
+    Trả về:
+        iterator: Các DataFrame liên tiếp.
+    """
+    return pd.read_csv(file_name, delimiter=";", encoding="utf-8", chunksize=chunksize, usecols=usecols)
+
+
+def stream_aggregates(file_name, chunksize=CHUNK_SIZE):
+    """
+    Tính các bảng đếm dùng cho biểu đồ trong một lần đọc file CSV theo từng phần.
+
+    Chỉ đọc các cột cần cho biểu đồ; bộ nhớ sử dụng tối đa phụ thuộc vào `chunksize` chứ không phụ thuộc kích thước
+    file.
+
+    Trả về:
+        AggregateCache: Các bảng đếm của toàn bộ file.
+    """
+    columns = ["Student Country", "Type of Answer", "Question Level", "Topic"]
+    header = pd.read_csv(file_name, delimiter=";", encoding="utf-8", nrows=0).columns
+    return AggregateCache.from_chunks(read_chunks(file_name, chunksize, [c for c in columns if c in header]))
+
+
+class RowOffsets:
+    """
+    Vị trí (byte) trong file CSV của hàng đầu tiên của mỗi trang `page_size` hàng.
+
+    Được xây dựng trong một lần đọc file theo dòng, chỉ giữ một số nguyên cho mỗi trang. Một hàng có thể kéo dài
+    nhiều dòng nếu chứa xuống dòng trong dấu ngoặc kép; số dấu ngoặc kép được dùng để nhận biết trường hợp đó.
+    Dòng trống bị bỏ qua, giống `read_csv`.
+    """
+
+    def __init__(self, file_name, page_size=PAGE_SIZE):
+        self.file_name = file_name
+        self.page_size = page_size
+        starts = []
+        row_count = 0
+        with open(file_name, "rb") as handle:
+            self.header = handle.readline()
+            position = handle.tell()
+            open_quotes = False
+            for line in handle:
+                if not open_quotes and line.strip():
+                    if row_count % page_size == 0:
+                        starts.append(position)
+                    row_count += 1
+                if line.count(b'"') % 2:
+                    open_quotes = not open_quotes
+                position += len(line)
+        self.starts = np.asarray(starts + [position], dtype=np.int64)
+        self.row_count = row_count
+
+    def read_page(self, page):
+        """
+        Đọc một trang hàng.
+
+        Trả về:
+            pandas.DataFrame: Các hàng của trang, với nhãn chỉ mục là vị trí hàng trong file.
+        """
+        with open(self.file_name, "rb") as handle:
+            handle.seek(self.starts[page])
+            raw = handle.read(self.starts[page + 1] - self.starts[page])
+        frame = pd.read_csv(io.BytesIO(self.header + raw), delimiter=";", encoding="utf-8")
+        frame.index = pd.RangeIndex(page * self.page_size, page * self.page_size + len(frame))
+        return frame
+
+
+class CsvView:
+    """
+    Khung nhìn các hàng của file CSV, đọc theo trang khi cần; dùng làm nguồn cho `VirtualTable`.
+
+    Mặc định gồm tất cả các hàng theo thứ tự trong file; có thể giới hạn ở một tập vị trí hàng (ví dụ kết quả tìm kiếm).
+    Trang đọc gần nhất được giữ lại để cuộn trong cùng một trang không phải đọc lại file.
+    """
+
+    def __init__(self, offsets, positions=None):
+        """
+        Tham số:
+            offsets (RowOffsets): Vị trí các trang trong file.
+            positions (numpy.ndarray, tùy chọn): Vị trí (tăng dần) của các hàng thuộc khung nhìn.
+        """
+        self.offsets = offsets
+        self.positions = positions
+        self._lock = threading.Lock()
+        self._page = None
+        self._page_frame = None
+
+    def __len__(self):
+        return self.offsets.row_count if self.positions is None else len(self.positions)
+
+    def fetch_rows(self, start, stop):
+        """
+        Lấy các hàng từ vị trí `start` tới `stop` của khung nhìn.
+        """
+        if self.positions is None:
+            positions = np.arange(start, min(stop, len(self)))
+        else:
+            positions = self.positions[start:stop]
+        rows = []
+        page_size = self.offsets.page_size
+        for page in np.unique(positions // page_size):
+            frame = self._read_page(int(page))
+            wanted = positions[positions // page_size == page]
+            window = frame.loc[wanted]
+            rows.extend(zip(window.index, window.itertuples(index=False, name=None)))
+        return rows
+
+    def _read_page(self, page):
+        with self._lock:
+            if self._page != page:
+                self._page_frame = self.offsets.read_page(page)
+                self._page = page
+            return self._page_frame
+
+
+class StreamingDataManager(StorageEngine):
+    """
+    Bộ lưu trữ chỉ đọc cho các file CSV lớn hơn bộ nhớ.
+
+    File không bao giờ được đọc toàn bộ vào một DataFrame: bảng hiển thị đọc theo trang `page_size` hàng,
+    tìm kiếm và các bảng đếm cho biểu đồ được tính trong một lần đọc file theo từng phần `chunksize` hàng.
+    Bộ nhớ sử dụng tối đa vì vậy phụ thuộc vào kích thước phần/trang chứ không phụ thuộc kích thước file
+    (kết quả tìm kiếm chỉ giữ vị trí của các hàng khớp). Không hỗ trợ thêm/sửa/xóa và sắp xếp; các hàng được
+    hiển thị theo thứ tự trong file. Để thao tác trên dữ liệu lớn, dùng `SqliteDataManager`.
+    """
+
+    read_only = True
+
+    def __init__(self, file_name="./data/dataset.csv", chunksize=CHUNK_SIZE, page_size=PAGE_SIZE, notify=None):
+        """
+        Tham số:
+            file_name (str, tùy chọn): Đường dẫn tới file CSV.
+            chunksize (int, tùy chọn): Số hàng đọc mỗi lần khi tìm kiếm và thống kê.
+            page_size (int, tùy chọn): Số hàng của mỗi trang khi hiển thị.
+            notify (callable, tùy chọn): Hàm nhận thông báo, xem `DataManager`.
+        """
+        self.file_name = file_name
+        self.chunksize = chunksize
+        self.notify = notify
+        self.lock = threading.RLock()
+        self._aggregates = None
+        self.offsets = RowOffsets(file_name, page_size)
+
+    def row_count(self):
+        """
+        Tổng số hàng dữ liệu.
+        """
+        return self.offsets.row_count
+
+    def sorted_view(self, sort_by, ascending=True):
+        """
+        Khung nhìn toàn bộ dữ liệu theo thứ tự trong file (chế độ đọc luồng không sắp xếp dữ liệu).
+        """
+        return CsvView(self.offsets)
+
+    @traced
+    def search_view(self, search_values, progress=None):
+        """
+        Tìm kiếm dữ liệu trong một lần đọc file theo từng phần.
+
+        Mỗi giá trị tìm kiếm được so khớp như chuỗi con thông thường, không phân biệt chữ hoa chữ thường, giống
+        chỉ mục tìm kiếm của `DataManager`; chỉ vị trí của các hàng khớp được giữ lại.
+
+        Tham số:
+            search_values (list): Danh sách các giá trị tìm kiếm, tương ứng với các cột.
+            progress (callable, tùy chọn): Hàm `progress(fraction, message)` được gọi sau mỗi phần.
+
+        Trả về:
+            CsvView: Khung nhìn các hàng thỏa mãn điều kiện tìm kiếm.
+        """
+        criteria = {COLUMN_NAMES[i]: value for i, value in enumerate(search_values) if value}
+        matches = []
+        total = max(self.offsets.row_count, 1)
+        for chunk in read_chunks(self.file_name, self.chunksize, list(criteria) or None):
+            mask = np.ones(len(chunk), dtype=bool)
+            for column, value in criteria.items():
+                mask &= chunk[column].astype(str).str.contains(value, case=False, na=False, regex=False).to_numpy()
+            matches.append(chunk.index.to_numpy(dtype=np.int64)[mask])
+            if progress:
+                progress(min((chunk.index[-1] + 1) / total, 1.0), "Đang tìm kiếm trong file...")
+        return CsvView(self.offsets, np.concatenate(matches) if matches else np.empty(0, dtype=np.int64))
+
+    @traced
+    def aggregates(self):
+        """
+        Lấy các bảng đếm dùng cho biểu đồ, tính trong một lần đọc file ở lần gọi đầu tiên.
+
+        Trả về:
+            AggregateCache: Các bảng đếm của toàn bộ file.
+        """
+        with self.lock:
+            if self._aggregates is None:
+                self._aggregates = stream_aggregates(self.file_name, self.chunksize)
+            return self._aggregates
@@ -0,0 +1,150 @@
+"""
+Sinh dữ liệu câu trả lời tổng hợp có cùng các cột và phân phối với dữ liệu thật, dùng cho đo hiệu năng.
+
+Ví dụ:
+    python src/synthetic_data.py 1000000 --output data/synthetic_1m.csv --seed 42
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_manager import COLUMN_NAMES
+
+DEFAULT_REFERENCE = "./data/dataset.csv"
+CHUNK_SIZE = 500000
+QUESTION_COLUMNS = ["Question Level", "Topic", "Subtopic", "Keywords"]
+
+
+class DatasetProfile:
+    """
+    Các phân phối rút ra từ dữ liệu thật, làm mẫu cho dữ liệu tổng hợp.
+
+    Mỗi câu hỏi giữ nguyên các thuộc tính (cấp độ, chủ đề, chủ đề con, từ khóa) và tần suất xuất hiện của nó;
+    mỗi học sinh thuộc một quốc gia theo tỉ lệ của dữ liệu thật. Tỉ lệ giá trị rỗng của từng cột và số câu trả lời
+    trung bình của một học sinh cũng được giữ lại.
+    """
+
+    def __init__(self, reference):
+        """
+        Tham số:
+            reference (pandas.DataFrame): Dữ liệu thật.
+        """
+        answers = pd.to_numeric(reference["Type of Answer"], errors="coerce")
+        valid = reference[reference["Question ID"].notna() & answers.isin((0, 1))].assign(**{"Type of Answer": answers})
+        questions = valid.groupby("Question ID").agg(
+            {**{column: "first" for column in QUESTION_COLUMNS}, "Type of Answer": ["mean", "size"]})
+        self.questions = questions[QUESTION_COLUMNS].droplevel(1, axis=1).reset_index(drop=True)
+        self.question_difficulty = questions[("Type of Answer", "mean")].to_numpy()
+        popularity = questions[("Type of Answer", "size")].to_numpy(dtype=float)
+        self.question_weights = popularity / popularity.sum()
+        countries = valid.groupby("Student ID")["Student Country"].first().value_counts(normalize=True)
+        self.countries = countries.index.to_numpy(dtype=object)
+        self.country_weights = countries.to_numpy()
+        self.answers_per_student = max(len(valid) / max(valid["Student ID"].nunique(), 1), 1.0)
+        self.rows = max(len(valid), 1)
+        self.missing_rates = reference[COLUMN_NAMES].isna().mean().to_dict()
+
+
+def generate_chunks(rows, profile, seed=0, chunksize=CHUNK_SIZE, missing=True):
+    """
+    Sinh dữ liệu tổng hợp thành từng phần, để dữ liệu hàng triệu hàng không cần nằm trọn trong bộ nhớ.
+
+    Số học sinh và số câu hỏi tăng theo số hàng. Kết quả trả lời theo mô hình logistic một tham số: mỗi học sinh
+    có một năng lực ngẫu nhiên, độ khó của câu hỏi lấy từ tỉ lệ trả lời đúng của câu hỏi mẫu, nên tỉ lệ đúng chung
+    và tương quan giữa các câu hỏi giống dữ liệu thật. Như dữ liệu thật, các hàng của một học sinh nằm liền nhau
+    (mỗi phần chứa trọn các học sinh của nó), và mỗi học sinh trả lời một câu hỏi không quá một lần, nên dữ liệu
+    hợp lệ cả khi bật `unique_pairs` (xem `validation`).
+
+    Tham số:
+        rows (int): Tổng số hàng.
+        profile (DatasetProfile): Phân phối mẫu.
+        seed (int, tùy chọn): Hạt giống ngẫu nhiên; cùng hạt giống cho cùng dữ liệu.
+        chunksize (int, tùy chọn): Số hàng của mỗi phần.
+        missing (bool, tùy chọn): Thêm giá trị rỗng theo tỉ lệ của dữ liệu thật.
+
+    Trả về:
+        iterator: Các DataFrame có các cột `COLUMN_NAMES`.
+    """
+    rng = np.random.default_rng(seed)
+    students = max(int(rows / profile.answers_per_student), 1)
+    student_country = rng.choice(len(profile.countries), size=students, p=profile.country_weights)
+    student_ability = rng.normal(0.0, 1.0, size=students)
+    copies = max(int(np.ceil(rows / profile.rows)), 1)
+    base_questions = len(profile.questions)
+    difficulty = np.log(np.clip(profile.question_difficulty, 0.02, 0.98) /
+                        (1 - np.clip(profile.question_difficulty, 0.02, 0.98)))
+    questions = base_questions * copies
+    question_weights = np.tile(profile.question_weights, copies) / copies
+    answers = rng.multinomial(rows, np.full(students, 1 / students))
+    ends = np.cumsum(answers)
+    first = 0
+    while first < students:
+        start = ends[first - 1] if first else 0
+        last = max(int(np.searchsorted(ends, start + chunksize, side="right")), first + 1)
+        student = np.repeat(np.arange(first, last), answers[first:last])
+        first = last
+        size = len(student)
+        if not size:
+            continue
+        question = rng.choice(questions, size=size, p=question_weights)
+        # Rút lại các câu hỏi mà học sinh đã trả lời trong cùng phần (mọi câu trả lời của học sinh đều ở đó).
+        while True:
+            repeated = np.ones(size, dtype=bool)
+            repeated[np.unique(student * questions + question, return_index=True)[1]] = False
+            if not repeated.any():
+                break
+            question[repeated] = rng.choice(questions, size=int(repeated.sum()), p=question_weights)
+        template = question % base_questions
+        chance = 1 / (1 + np.exp(-(difficulty[template] + student_ability[student])))
+        chunk = pd.DataFrame({
+            "Student ID": student + 1,
+            "Student Country": profile.countries[student_country[student]],
+            "Question ID": question + 1,
+            "Type of Answer": (rng.random(size) < chance).astype(np.int64),
+        })
+        for column in QUESTION_COLUMNS:
+            chunk[column] = profile.questions[column].to_numpy(dtype=object)[template]
+        chunk = chunk[COLUMN_NAMES]
+        if missing:
+            for column, rate in profile.missing_rates.items():
+                if rate:
+                    chunk[column] = chunk[column].where(rng.random(size) >= rate)
+        yield chunk
+
+
+def write_dataset(file_name, rows, reference=DEFAULT_REFERENCE, seed=0, chunksize=CHUNK_SIZE):
+    """
+    Sinh một file CSV tổng hợp (định dạng của `DataManager`).
+
+    Tham số:
+        file_name (str): Đường dẫn file cần ghi.
+        rows (int): Số hàng.
+        reference (str, tùy chọn): File dữ liệu thật dùng làm mẫu.
+        seed (int, tùy chọn): Hạt giống ngẫu nhiên.
+        chunksize (int, tùy chọn): Số hàng sinh và ghi mỗi lần.
+
+    Trả về:
+        str: `file_name`.
+    """
+    profile = DatasetProfile(pd.read_csv(reference, delimiter=";", encoding="utf-8"))
+    directory = os.path.dirname(file_name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_name = file_name + ".tmp"
+    with open(tmp_name, "w", encoding="utf-8", newline="") as handle:
+        for number, chunk in enumerate(generate_chunks(rows, profile, seed=seed, chunksize=chunksize)):
+            chunk.to_csv(handle, sep=";", index=False, header=number == 0)
+    os.replace(tmp_name, file_name)
+    return file_name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sinh dữ liệu câu trả lời tổng hợp cho đo hiệu năng.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--reference", default=DEFAULT_REFERENCE, help="File dữ liệu thật dùng làm mẫu.")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    write_dataset(arguments.output, arguments.rows, reference=arguments.reference, seed=arguments.seed)
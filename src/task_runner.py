@@ -0,0 +1,201 @@
+import concurrent.futures
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+
+class TaskCancelled(Exception):
+    """
+    Được ném ra bên trong một tác vụ nền khi tác vụ đó đã bị hủy.
+    """
+
+
+class Task:
+    """
+    Một tác vụ chạy trong luồng nền của `TaskRunner`.
+
+    Hàm của tác vụ có thể nhận đối tượng này (tham số `pass_task=True` của `TaskRunner.submit`) để báo cáo
+    tiến độ qua `report_progress` và kiểm tra việc bị hủy qua `check_cancelled`.
+    """
+
+    def __init__(self, runner, key, on_success, on_error, on_progress):
+        self.runner = runner
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """
+        Hủy tác vụ. Nếu tác vụ đang chạy, kết quả của nó sẽ bị bỏ qua.
+        """
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def is_cancelled(self):
+        """
+        Kiểm tra tác vụ đã bị hủy hay chưa.
+        """
+        return self._cancelled.is_set()
+
+    def check_cancelled(self):
+        """
+        Ném `TaskCancelled` nếu tác vụ đã bị hủy; dùng để dừng sớm các tác vụ dài.
+        """
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, fraction, message=""):
+        """
+        Báo cáo tiến độ của tác vụ về luồng giao diện.
+
+        Đồng thời dừng tác vụ (ném `TaskCancelled`) nếu tác vụ đã bị hủy.
+
+        Tham số:
+            fraction (float): Tỉ lệ hoàn thành, từ 0 đến 1.
+            message (str, tùy chọn): Mô tả bước đang thực hiện.
+        """
+        self.check_cancelled()
+        self.runner._post(self, "progress", (fraction, message))
+
+
+class TaskRunner:
+    """
+    Bộ thực thi tác vụ nền cho ứng dụng Tkinter.
+
+    Các thao tác dữ liệu tốn thời gian (tải, lưu, tìm kiếm, sắp xếp, thống kê) được chạy trong một thread pool
+    để vòng lặp sự kiện của Tk không bị chặn. Kết quả, lỗi và tiến độ được đưa vào một hàng đợi và được
+    chuyển về luồng giao diện bằng `root.after`, vì Tkinter chỉ được gọi từ luồng chính. Các tác vụ có cùng
+    khóa (`key`) thay thế nhau: gửi một tác vụ mới sẽ hủy tác vụ cũ và kết quả của tác vụ cũ bị bỏ qua.
+    """
+
+    def __init__(self, root, max_workers=2, poll_interval=50):
+        """
+        Khởi tạo bộ thực thi.
+
+        Tham số:
+            root (tkinter.Tk): Cửa sổ chính, dùng để lập lịch bằng `after`.
+            max_workers (int, tùy chọn): Số luồng nền tối đa.
+            poll_interval (int, tùy chọn): Chu kỳ (ms) kiểm tra hàng đợi kết quả.
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-worker")
+        self.active = {}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._after_id = self.root.after(self.poll_interval, self._poll)
+
+    def submit(self, func, *args, key=None, on_success=None, on_error=None, on_progress=None, pass_task=False):
+        """
+        Gửi một hàm để chạy trong luồng nền.
+
+        Tham số:
+            func (callable): Hàm cần chạy.
+            *args: Các tham số của hàm.
+            key (str, tùy chọn): Khóa của tác vụ; tác vụ đang chạy có cùng khóa sẽ bị hủy.
+            on_success (callable, tùy chọn): Được gọi trên luồng giao diện với kết quả của hàm.
+            on_error (callable, tùy chọn): Được gọi trên luồng giao diện với ngoại lệ nếu hàm lỗi.
+            on_progress (callable, tùy chọn): Được gọi trên luồng giao diện với (tỉ lệ, thông điệp) khi có tiến độ.
+            pass_task (bool, tùy chọn): Truyền đối tượng `Task` làm tham số đầu tiên của hàm.
+
+        Trả về:
+            Task: Tác vụ vừa được gửi.
+        """
+        if key is not None and key in self.active:
+            self.active[key].cancel()
+        task = Task(self, key, on_success, on_error, on_progress)
+        if key is not None:
+            self.active[key] = task
+        call_args = (task,) + args if pass_task else args
+        task.future = self.executor.submit(self._run, task, func, call_args)
+        return task
+
+    def call_soon(self, func, *args):
+        """
+        Lập lịch gọi `func(*args)` trên luồng giao diện; an toàn khi gọi từ luồng nền.
+        """
+        self._queue.put((None, "call", (func, args)))
+
+    def cancel(self, key):
+        """
+        Hủy tác vụ đang chạy với khóa `key`, nếu có.
+        """
+        task = self.active.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def wait(self, key):
+        """
+        Chờ tác vụ với khóa `key` (nếu có) chạy xong; kết quả và lỗi của nó vẫn được chuyển về luồng giao diện.
+        """
+        task = self.active.get(key)
+        if task is not None and not task.future.cancelled():
+            concurrent.futures.wait([task.future])
+
+    def is_busy(self, key):
+        """
+        Kiểm tra có tác vụ nào với khóa `key` đang chạy hay không.
+        """
+        return key in self.active
+
+    def shutdown(self, wait=True):
+        """
+        Dừng bộ thực thi: hủy các tác vụ chưa chạy và (tùy chọn) chờ các tác vụ đang chạy kết thúc.
+        """
+        self._closed = True
+        for task in list(self.active.values()):
+            task.cancel()
+        self.active.clear()
+        self.root.after_cancel(self._after_id)
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, task, func, args):
+        if task.is_cancelled():
+            return
+        try:
+            with span("TaskRunner.run", key=task.key, function=getattr(func, "__qualname__", repr(func))):
+                result = func(*args)
+        except TaskCancelled:
+            self._post(task, "cancelled", None)
+        except Exception as error:
+            self._post(task, "error", error)
+        else:
+            self._post(task, "success", result)
+
+    def _post(self, task, kind, payload):
+        self._queue.put((task, kind, payload))
+
+    def _poll(self):
+        while True:
+            try:
+                task, kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(task, kind, payload)
+        if not self._closed:
+            self._after_id = self.root.after(self.poll_interval, self._poll)
+
+    def _dispatch(self, task, kind, payload):
+        if kind == "call":
+            func, args = payload
+            func(*args)
+            return
+        if kind != "progress" and task.key is not None and self.active.get(task.key) is task:
+            del self.active[task.key]
+        if task.is_cancelled():
+            return
+        if kind == "progress" and task.on_progress:
+            task.on_progress(*payload)
+        elif kind == "success" and task.on_success:
+            task.on_success(payload)
+        elif kind == "error":
+            if task.on_error:
+                task.on_error(payload)
+            else:
+                raise payload
@@ -0,0 +1,232 @@
+"""
+Đo thời gian các thao tác của ứng dụng (span) để tìm ra phần chậm, ví dụ đọc/ghi CSV, tìm kiếm hay vẽ biểu đồ.
+
+Các span được ghi vào một bộ đệm vòng có kích thước cố định (`Tracer.records`), nên việc đo có thể bật suốt phiên
+làm việc mà không tăng bộ nhớ. Khi tắt (mặc định), mỗi điểm đo chỉ tốn một phép kiểm tra `tracer.enabled`.
+Kết quả có thể xuất ra JSON hoặc định dạng Chrome trace (mở bằng chrome://tracing hoặc https://ui.perfetto.dev).
+
+Ví dụ:
+    from tracing import tracer, span, traced
+
+    @traced
+    def save_data(self): ...
+
+    with span("read_csv", file=file_name):
+        ...
+
+    tracer.enabled = True
+    tracer.profile_next("DataManager.search_data")  # chạy lần tìm kiếm tiếp theo dưới cProfile
+    tracer.export_chrome_trace("trace.json")
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque, namedtuple
+
+DEFAULT_CAPACITY = 10000
+PROFILE_CAPACITY = 10
+PROFILE_LINES = 40
+
+SpanRecord = namedtuple("SpanRecord", "name start duration thread args error")
+SpanRecord.__doc__ = """
+Một span đã kết thúc: tên, thời điểm bắt đầu và độ dài (nano giây, theo `time.perf_counter_ns`), tên luồng,
+các thông tin kèm theo (dict hoặc None) và tên ngoại lệ nếu thao tác bị lỗi.
+"""
+
+ProfileRecord = namedtuple("ProfileRecord", "name duration report")
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Bộ ghi span dùng chung cho cả ứng dụng; an toàn khi dùng từ nhiều luồng.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, enabled=False):
+        """
+        Tham số:
+            capacity (int, tùy chọn): Số span tối đa được giữ lại; span cũ nhất bị bỏ khi bộ đệm đầy.
+            enabled (bool, tùy chọn): Bật ghi span ngay từ đầu.
+        """
+        self.enabled = enabled
+        self.records = deque(maxlen=capacity)
+        self.profiles = deque(maxlen=PROFILE_CAPACITY)
+        self._lock = threading.Lock()
+        self._profile_target = None
+        self._origin = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        """
+        Context manager đo thời gian một khối lệnh.
+
+        Tham số:
+            name (str): Tên thao tác.
+            **args: Thông tin kèm theo, ví dụ số hàng; phải chuyển được sang JSON (hoặc `str`).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args or None)
+
+    def wrap(self, function, name=None):
+        """
+        Bọc một hàm để mỗi lần gọi được ghi thành một span (tên mặc định là `__qualname__` của hàm).
+        """
+        name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            with self._span(name, None):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def profile_next(self, name=None):
+        """
+        Chạy lần tiếp theo của một thao tác dưới cProfile; kết quả được thêm vào `self.profiles`.
+
+        Chỉ có tác dụng khi việc ghi span đang bật. Mỗi lần gọi chỉ ghi một thao tác.
+
+        Tham số:
+            name (str, tùy chọn): Tên span cần ghi; mặc định là span tiếp theo bắt đầu ở bất kỳ luồng nào.
+        """
+        with self._lock:
+            self._profile_target = name or ""
+
+    def profile_pending(self):
+        """
+        Kiểm tra có yêu cầu ghi cProfile nào chưa được thực hiện hay không.
+        """
+        return self._profile_target is not None
+
+    def clear(self):
+        """
+        Xóa các span và kết quả cProfile đã ghi.
+        """
+        self.records.clear()
+        self.profiles.clear()
+
+    @contextlib.contextmanager
+    def _span(self, name, args):
+        profiler = self._start_profile(name)
+        error = None
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            duration = time.perf_counter_ns() - start
+            if profiler is not None:
+                profiler.disable()
+                self.profiles.append(ProfileRecord(name, duration, _profile_report(profiler)))
+            self.records.append(SpanRecord(name, start, duration, threading.current_thread().name, args, error))
+
+    def _start_profile(self, name):
+        if self._profile_target is None:
+            return None
+        with self._lock:
+            if self._profile_target not in ("", name):
+                return None
+            self._profile_target = None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Một trình profile khác đang chạy (Python 3.12+ chỉ cho phép một trình profile mỗi lúc).
+            return None
+        return profiler
+
+    def summary(self):
+        """
+        Tổng hợp các span đã ghi theo tên.
+
+        Trả về:
+            list: Các dict (name, count, total_ms, mean_ms, max_ms, errors), sắp xếp giảm dần theo tổng thời gian.
+        """
+        totals = {}
+        for record in list(self.records):
+            item = totals.setdefault(record.name, {"name": record.name, "count": 0, "total_ms": 0.0,
+                                                   "max_ms": 0.0, "errors": 0})
+            milliseconds = record.duration / 1e6
+            item["count"] += 1
+            item["total_ms"] += milliseconds
+            item["max_ms"] = max(item["max_ms"], milliseconds)
+            item["errors"] += record.error is not None
+        for item in totals.values():
+            item["mean_ms"] = item["total_ms"] / item["count"]
+        return sorted(totals.values(), key=lambda item: item["total_ms"], reverse=True)
+
+    def export_json(self, file_name):
+        """
+        Xuất các span, bảng tổng hợp và kết quả cProfile ra file JSON.
+        """
+        spans = [{
+            "name": record.name,
+            "start_ms": (record.start - self._origin) / 1e6,
+            "duration_ms": record.duration / 1e6,
+            "thread": record.thread,
+            "args": record.args,
+            "error": record.error,
+        } for record in list(self.records)]
+        profiles = [{"name": item.name, "duration_ms": item.duration / 1e6, "report": item.report}
+                    for item in list(self.profiles)]
+        _write_json(file_name, {"spans": spans, "summary": self.summary(), "profiles": profiles})
+
+    def export_chrome_trace(self, file_name):
+        """
+        Xuất các span ra định dạng Chrome trace (sự kiện "X"), xem được trong chrome://tracing hoặc Perfetto.
+        """
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for record in list(self.records):
+            tid = threads.setdefault(record.thread, len(threads) + 1)
+            args = dict(record.args or {})
+            if record.error:
+                args["error"] = record.error
+            events.append({"name": record.name, "cat": record.name.split(".")[0], "ph": "X", "pid": pid,
+                           "tid": tid, "ts": (record.start - self._origin) / 1e3, "dur": record.duration / 1e3,
+                           "args": args})
+        events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}}
+                      for thread, tid in threads.items())
+        _write_json(file_name, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def _profile_report(profiler):
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return output.getvalue()
+
+
+def _write_json(file_name, content):
+    with open(file_name, "w", encoding="utf-8") as handle:
+        json.dump(content, handle, ensure_ascii=False, indent=1, default=str)
+
+
+tracer = Tracer()
+
+
+def span(name, **args):
+    """
+    Đo một khối lệnh bằng bộ ghi dùng chung `tracer` (xem `Tracer.span`).
+    """
+    return tracer.span(name, **args)
+
+
+def traced(function=None, *, name=None):
+    """
+    Decorator ghi mỗi lần gọi hàm thành một span của `tracer`; dùng `@traced` hoặc `@traced(name="...")`.
+    """
+    if function is None:
+        return lambda function: tracer.wrap(function, name)
+    return tracer.wrap(function, name)
@@ -0,0 +1,259 @@
+"""
+Kiểm tra các hàng dữ liệu trước khi đưa vào `DataManager`, theo các ràng buộc trong `schema`: kiểu (cột số phải là
+số nguyên), miền giá trị (`ALLOWED_VALUES`, `VALUE_RANGES`), giá trị rỗng (`REQUIRED_COLUMNS`) và, nếu được yêu cầu
+(`unique_pairs=True`), các cặp (Student ID, Question ID) trùng lặp (`KEY_COLUMNS`).
+
+Quy tắc không trùng cặp tắt theo mặc định: trong dữ liệu của ứng dụng, một học sinh có thể trả lời cùng một câu hỏi
+nhiều lần (các lần làm lại, có thể với kết quả khác nhau), nên một cặp lặp lại là dữ liệu thật chứ không phải lỗi.
+
+Mỗi ràng buộc là một phép toán trên toàn cột (pandas/NumPy), không lặp qua từng hàng bằng Python; chỉ các hàng không
+hợp lệ mới được ghép chuỗi lý do. Các hàng không hợp lệ được ghi vào file cách ly (`quarantine`) cùng lý do.
+Việc kiểm tra trùng lặp với dữ liệu hiện có dùng `PairIndex`, được cập nhật tăng dần khi dữ liệu thay đổi để
+việc thêm một hàng không phải tính lại khóa của cả bảng.
+
+Ví dụ:
+    valid, rejected = validate(data)
+    quarantine(rejected, "data/dataset.csv.quarantine.csv")
+"""
+import collections
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import (COLUMN_NAMES, SCHEMA, MISSING_VALUES, REQUIRED_COLUMNS, ALLOWED_VALUES, VALUE_RANGES,
+                    KEY_COLUMNS)
+
+REASON_COLUMN = "Reason"
+REASON_SEPARATOR = "; "
+
+
+class _Problems:
+    """
+    Các lý do không hợp lệ của từng hàng; chỉ các hàng bị đánh dấu mới được ghép chuỗi.
+    """
+
+    def __init__(self, size):
+        self.bad = np.zeros(size, dtype=bool)
+        self.reasons = np.full(size, "", dtype=object)
+
+    def flag(self, mask, reason):
+        mask = np.asarray(mask, dtype=bool)
+        if not mask.any():
+            return
+        current = self.reasons[mask]
+        self.reasons[mask] = np.where(self.bad[mask], current + REASON_SEPARATOR + reason, reason)
+        self.bad |= mask
+
+
+def _is_missing(series):
+    """
+    Mặt nạ các giá trị rỗng: NaN/NA, hoặc chuỗi rỗng/"nan"/... (xem `schema.MISSING_VALUES`).
+    """
+    missing = series.isna().to_numpy(copy=True)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Chỉ so sánh các giá trị phân biệt rồi tra theo mã của từng hàng.
+        blank = series.cat.categories.astype(str).str.strip().isin(MISSING_VALUES)
+        codes = series.cat.codes.to_numpy()
+        missing |= (codes >= 0) & np.append(blank, False)[codes]
+    elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        missing |= series.astype(str).str.strip().isin(MISSING_VALUES).to_numpy()
+    return missing
+
+
+def _as_numbers(series):
+    """
+    Giá trị số (float) của một cột; giá trị không đổi được sang số trở thành NaN.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        series = series.astype(str).str.strip()
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def _pair_keys(student, question):
+    """
+    Khóa int64 của mỗi cặp (Student ID, Question ID); các mã số đã nằm trong `VALUE_RANGES` (dưới 2**31).
+    """
+    return student.astype(np.int64) << 31 | question.astype(np.int64)
+
+
+def pair_values(keys):
+    """
+    Tách các khóa của `_pair_keys` trở lại thành hai mảng (Student ID, Question ID).
+    """
+    return keys >> 31, keys & (2 ** 31 - 1)
+
+
+def _existing_keys(existing):
+    student = _as_numbers(existing[KEY_COLUMNS[0]])
+    question = _as_numbers(existing[KEY_COLUMNS[1]])
+    present = np.isfinite(student) & np.isfinite(question)
+    return _pair_keys(student[present], question[present])
+
+
+class PairIndex:
+    """
+    Số lần xuất hiện của mỗi cặp (Student ID, Question ID) trong dữ liệu, dùng để kiểm tra trùng lặp.
+
+    Được xây dựng một lần từ dữ liệu và cập nhật tăng dần bằng `add`/`remove` khi thêm, sửa, xóa hàng.
+    """
+
+    def __init__(self, data):
+        self.counts = collections.Counter(_existing_keys(data).tolist())
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, rows):
+        """
+        Thêm các cặp của các hàng mới (pandas.DataFrame).
+        """
+        self.counts.update(_existing_keys(rows).tolist())
+
+    def remove(self, rows):
+        """
+        Bớt các cặp của các hàng bị xóa hoặc sắp bị sửa (pandas.DataFrame).
+        """
+        for key in _existing_keys(rows).tolist():
+            self.counts[key] -= 1
+            if self.counts[key] <= 0:
+                del self.counts[key]
+
+    def contains(self, keys):
+        """
+        Mặt nạ các khóa (xem `_pair_keys`) đã có trong dữ liệu.
+        """
+        return np.fromiter((key in self.counts for key in keys.tolist()), dtype=bool, count=len(keys))
+
+
+def find_problems(data, existing=None, unique_pairs=False):
+    """
+    Tìm lý do không hợp lệ của từng hàng.
+
+    Khi `unique_pairs` là True, một hàng trùng cặp (Student ID, Question ID) với một hàng hợp lệ đứng trước nó, hoặc
+    với một hàng của `existing`, là hàng trùng lặp; hàng đầu tiên của mỗi cặp được giữ lại.
+
+    Tham số:
+        data (pandas.DataFrame): Các hàng cần kiểm tra, với giá trị thô (ví dụ từ `read_csv`) hoặc đã đổi kiểu.
+        existing (tùy chọn): Dữ liệu hiện có để kiểm tra trùng lặp với các hàng mới: một pandas.DataFrame, hoặc
+            một đối tượng có phương thức `contains(keys)` trả về mặt nạ các khóa đã có (ví dụ `PairIndex`).
+        unique_pairs (bool, tùy chọn): Coi các cặp (Student ID, Question ID) lặp lại là không hợp lệ.
+
+    Trả về:
+        pandas.Series: Lý do của từng hàng (nhiều lý do cách nhau bởi "; "), chuỗi rỗng nếu hàng hợp lệ.
+    """
+    return pd.Series(_check(data, existing, unique_pairs).reasons, index=data.index, name=REASON_COLUMN)
+
+
+def _check(data, existing, unique_pairs):
+    problems = _Problems(len(data))
+    numbers = {}
+    for column in COLUMN_NAMES:
+        if column not in data.columns:
+            if column in REQUIRED_COLUMNS:
+                problems.flag(np.ones(len(data), dtype=bool), f"thiếu cột '{column}'")
+            continue
+        series = data[column]
+        missing = _is_missing(series)
+        if column in REQUIRED_COLUMNS:
+            problems.flag(missing, f"'{column}' rỗng")
+        if SCHEMA[column] != "category":
+            values = _as_numbers(series)
+            integral = np.isfinite(values) & (values == np.round(values))
+            problems.flag(~missing & ~integral, f"'{column}' không phải số nguyên")
+            if column in VALUE_RANGES:
+                low, high = VALUE_RANGES[column]
+                problems.flag(integral & ((values < low) | (values > high)),
+                              f"'{column}' nằm ngoài khoảng [{low}, {high}]")
+            if column in ALLOWED_VALUES:
+                problems.flag(integral & ~np.isin(values, ALLOWED_VALUES[column]),
+                              f"'{column}' không thuộc {ALLOWED_VALUES[column]}")
+            numbers[column] = values
+        elif column in ALLOWED_VALUES:
+            allowed = series.isin(ALLOWED_VALUES[column]).to_numpy()
+            problems.flag(~missing & ~allowed, f"'{column}' không thuộc {ALLOWED_VALUES[column]}")
+
+    if unique_pairs and all(column in numbers for column in KEY_COLUMNS):
+        candidates = ~problems.bad
+        keys = _pair_keys(numbers[KEY_COLUMNS[0]][candidates], numbers[KEY_COLUMNS[1]][candidates])
+        duplicated = pd.Series(keys).duplicated().to_numpy(copy=True)
+        if isinstance(existing, pd.DataFrame):
+            if len(existing):
+                duplicated |= np.isin(keys, _existing_keys(existing))
+        elif existing is not None and len(keys):
+            duplicated |= existing.contains(keys)
+        mask = np.zeros(len(data), dtype=bool)
+        mask[candidates] = duplicated
+        problems.flag(mask, f"trùng cặp ({', '.join(KEY_COLUMNS)})")
+    return problems
+
+
+def check_rows(rows, existing=None, unique_pairs=False):
+    """
+    Kiểm tra một vài hàng nhập tay, xem `find_problems`.
+
+    Tham số:
+        rows (list): Các hàng, mỗi hàng là danh sách giá trị theo `COLUMN_NAMES` (ví dụ kết quả của `coerce_row`).
+        existing, unique_pairs (tùy chọn): Xem `find_problems`.
+
+    Ngoại lệ:
+        ValueError: Kèm lý do của hàng không hợp lệ đầu tiên.
+    """
+    reasons = find_problems(pd.DataFrame(rows, columns=COLUMN_NAMES), existing, unique_pairs)
+    reasons = reasons[reasons != ""]
+    if len(reasons):
+        raise ValueError(f"Hàng không hợp lệ: {reasons.iloc[0]}.")
+
+
+def validate(data, existing=None, unique_pairs=False):
+    """
+    Tách các hàng hợp lệ và không hợp lệ, xem `find_problems`.
+
+    Trả về:
+        tuple: (các hàng hợp lệ, các hàng không hợp lệ kèm cột "Reason"), đều là pandas.DataFrame.
+    """
+    problems = _check(data, existing, unique_pairs)
+    bad = problems.bad
+    return data[~bad], data[bad].assign(**{REASON_COLUMN: problems.reasons[bad]})
+
+
+def quarantine(rejected, file_name):
+    """
+    Ghi nối các hàng không hợp lệ vào file cách ly (CSV phân tách bằng ";" như file dữ liệu, thêm cột "Reason").
+
+    Dòng tiêu đề chỉ được ghi khi file chưa tồn tại hoặc rỗng. Các giá trị được ghi như trong file gốc (xem
+    `as_written`).
+
+    Tham số:
+        rejected (pandas.DataFrame): Các hàng không hợp lệ, ví dụ kết quả thứ hai của `validate`.
+        file_name (str): Đường dẫn file cách ly.
+    """
+    header = not os.path.exists(file_name) or os.path.getsize(file_name) == 0
+    with open(file_name, "a", encoding="utf-8", newline="") as handle:
+        as_written(rejected).to_csv(handle, sep=";", index=False, header=header)
+
+
+def as_written(rows):
+    """
+    Chuẩn bị các hàng thô để ghi ra CSV: `read_csv` đọc cột số nguyên có giá trị rỗng thành float, nên các giá trị
+    nguyên của những cột số trong `SCHEMA` được ghi lại dạng số nguyên ("829" thay vì "829.0"); các giá trị khác
+    (chữ, số thực, rỗng) được giữ nguyên.
+
+    Tham số:
+        rows (pandas.DataFrame): Các hàng thô, ví dụ các hàng không hợp lệ của `validate`.
+
+    Trả về:
+        pandas.DataFrame: Bản sao với các cột số nguyên đã được chuyển.
+    """
+    rows = rows.copy()
+    for column in rows.columns:
+        if SCHEMA.get(column, "category") == "category" or not pd.api.types.is_float_dtype(rows[column].dtype):
+            continue
+        values = rows[column].to_numpy(dtype=float)
+        integral = np.isfinite(values) & (values == np.round(values)) & (np.abs(values) < 2 ** 53)
+        written = rows[column].astype(object)
+        written[integral] = values[integral].astype(np.int64).tolist()
+        rows[column] = written
+    return rows
@@ -0,0 +1,194 @@
+from tkinter import Scrollbar
+from tkinter import ttk
+from storage import FrameView
+from tracing import span, traced
+
+
+class VirtualTable:
+    """
+    Bảng dữ liệu ảo dựa trên ttk.Treeview.
+
+    Thay vì chèn toàn bộ các hàng vào Treeview, bảng chỉ tạo các hàng đang hiển thị. Vị trí cuộn được quản lý
+    bởi thanh cuộn riêng; mỗi khi cuộn, bảng lấy cửa sổ hàng mới từ nguồn dữ liệu thông qua hàm `fetch_rows`.
+    Một vùng đệm nhỏ các hàng xung quanh cửa sổ hiển thị được giữ lại để cuộn từng dòng không phải đọc lại nguồn.
+    Mỗi hàng trong Treeview có iid là khóa của hàng trong nguồn dữ liệu, nhờ đó lựa chọn được giữ qua các lần cuộn.
+
+    Việc vẽ lại các hàng khi cuộn cũng làm Treeview phát sự kiện <<TreeviewSelect>>; bảng bỏ qua các sự kiện đó và
+    chỉ phát sự kiện <<TableSelect>> khi người dùng thực sự thay đổi lựa chọn.
+    """
+
+    def __init__(self, master, columns, height=15, buffer=50, heading_command=None):
+        """
+        Khởi tạo bảng ảo.
+
+        Tham số:
+            master (tkinter.Widget): Khung chứa bảng.
+            columns (list): Danh sách tên cột.
+            height (int, tùy chọn): Số hàng hiển thị cùng lúc.
+            buffer (int, tùy chọn): Số hàng được đọc thêm trước và sau cửa sổ hiển thị.
+            heading_command (callable, tùy chọn): Hàm được gọi với tên cột khi người dùng nhấp vào tiêu đề cột.
+        """
+        self.height = height
+        self.buffer = buffer
+        self.tree = ttk.Treeview(master, columns=columns, show="headings", height=height)
+        for column in columns:
+            if heading_command:
+                self.tree.heading(column, text=column, command=lambda c=column: heading_command(c))
+            else:
+                self.tree.heading(column, text=column)
+            self.tree.column(column, anchor="w", width=120)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = Scrollbar(master, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<Button-1>", self._on_click, add="+")
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda event: self._on_arrow(1))
+        self.tree.bind("<Prior>", lambda event: self._scroll_by(-self.height))
+        self.tree.bind("<Next>", lambda event: self._scroll_by(self.height))
+        self.tree.bind("<Control-Home>", lambda event: self.scroll_to(0))
+        self.tree.bind("<Control-End>", lambda event: self.scroll_to(self.row_count))
+
+        self.row_count = 0
+        self.first = 0
+        self.selected = set()
+        self._shown_selection = ()
+        self._fetch_rows = None
+        self._window_start = 0
+        self._window = []
+
+    def set_source(self, row_count, fetch_rows):
+        """
+        Gán nguồn dữ liệu mới cho bảng và cuộn về đầu bảng.
+
+        Tham số:
+            row_count (int): Tổng số hàng của nguồn dữ liệu.
+            fetch_rows (callable): Hàm `fetch_rows(start, stop)` trả về danh sách các cặp (khóa hàng, giá trị các cột)
+                cho các hàng từ vị trí `start` tới `stop` (không bao gồm `stop`).
+        """
+        self.row_count = row_count
+        self._fetch_rows = fetch_rows
+        self._window = []
+        self.first = 0
+        self.selected.clear()
+        self.refresh()
+
+    def show_frame(self, frame):
+        """
+        Hiển thị một DataFrame (hoặc một khung nhìn của DataFrame) trong bảng.
+
+        Khóa của mỗi hàng là nhãn chỉ mục của hàng đó trong DataFrame.
+
+        Tham số:
+            frame (pandas.DataFrame): Dữ liệu cần hiển thị.
+        """
+        self.show_view(FrameView(frame))
+
+    def show_view(self, view):
+        """
+        Hiển thị một khung nhìn dữ liệu có `len()` và `fetch_rows(start, stop)` (ví dụ `SortedView`, `FrameView`).
+        """
+        self.set_source(len(view), view.fetch_rows)
+
+    def selected_keys(self):
+        """
+        Lấy khóa của tất cả các hàng đang được chọn, kể cả các hàng đã cuộn ra khỏi màn hình.
+
+        Trả về:
+            list: Danh sách khóa hàng.
+        """
+        return list(self.selected)
+
+    def yview(self, *args):
+        """
+        Xử lý lệnh cuộn từ thanh cuộn ("moveto" hoặc "scroll").
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.row_count))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._scroll_by(step * self.height if args[2] == "pages" else step)
+
+    def scroll_to(self, first):
+        """
+        Cuộn bảng để hàng ở vị trí `first` là hàng đầu tiên được hiển thị.
+        """
+        first = max(0, min(first, self.row_count - self.height))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+        return "break"
+
+    @traced
+    def refresh(self):
+        """
+        Vẽ lại các hàng đang hiển thị từ nguồn dữ liệu.
+        """
+        rows = self._visible_rows()
+        self.tree.delete(*self.tree.get_children())
+        for key, values in rows:
+            self.tree.insert("", "end", iid=str(key), values=list(values))
+        visible_selection = [str(key) for key, _ in rows if key in self.selected]
+        if visible_selection:
+            self.tree.selection_set(visible_selection)
+        self._shown_selection = self.tree.selection()
+        if self.row_count:
+            self.scrollbar.set(self.first / self.row_count, min(1.0, (self.first + self.height) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _visible_rows(self):
+        stop = min(self.first + self.height, self.row_count)
+        window_stop = self._window_start + len(self._window)
+        if self.first < self._window_start or stop > window_stop:
+            self._window_start = max(0, self.first - self.buffer)
+            with span("VirtualTable.fetch_rows"):
+                self._window = self._fetch_rows(self._window_start, min(stop + self.buffer, self.row_count)) \
+                    if self._fetch_rows else []
+        return self._window[self.first - self._window_start:stop - self._window_start]
+
+    def _scroll_by(self, rows):
+        return self.scroll_to(self.first + rows)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_arrow(self, step):
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        if not children or focus not in children:
+            return None
+        position = children.index(focus)
+        if 0 <= position + step < len(children):
+            return None
+        self._scroll_by(step)
+        children = self.tree.get_children()
+        if children:
+            target = children[0] if step < 0 else children[-1]
+            self.selected.clear()
+            self.tree.focus(target)
+            self.tree.selection_set(target)
+        return "break"
+
+    def _on_click(self, event):
+        if not event.state & (0x0001 | 0x0004):
+            self.selected.clear()
+
+    def _on_select(self, event):
+        # <<TreeviewSelect>> được đưa vào hàng đợi sự kiện, nên các sự kiện do `refresh` gây ra tới sau khi lựa chọn
+        # đã được khôi phục; so với lựa chọn đã hiển thị để bỏ qua chúng.
+        if self.tree.selection() == self._shown_selection:
+            return
+        self._shown_selection = self.tree.selection()
+        visible = {key for key, _ in self._visible_rows()}
+        chosen = set(self.tree.selection())
+        self.selected = {key for key in self.selected if key not in visible}
+        self.selected.update(key for key in visible if str(key) in chosen)
+        self.tree.event_generate("<<TableSelect>>")
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+# Các module của ứng dụng nằm phẳng trong src/ và import lẫn nhau theo tên (xem main.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+HEADER = "Student ID;Student Country;Question ID;Type of Answer;Question Level;Topic;Subtopic;Keywords\n"
+ROWS = [
+    "1;Portugal;10;1;Basic;Algebra;Linear;Matrix,Vector\n",
+    "1;Portugal;11;0;Advanced;Algebra;Linear;Vector\n",
+    "2;Italy;10;0;Basic;Algebra;Linear;Matrix,Vector\n",
+    "2;Italy;12;1;Basic;Geometry;Plane;\n",
+    "3;Lithuania;11;1;Advanced;Algebra;Linear;Vector\n",
+    "3;Lithuania;12;0;Basic;Geometry;Plane;\n",
+]
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """
+    File CSV nhỏ, hợp lệ, cùng định dạng với data/dataset.csv.
+    """
+    path = tmp_path / "dataset.csv"
+    path.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def open_manager():
+    """
+    Hàm mở `DataManager` trên một file, không hiển thị thông báo; các thông báo được ghi vào `open_manager.messages`.
+    """
+    from data_manager import DataManager
+
+    messages = []
+
+    def opener(file_name, **options):
+        options.setdefault("fsync", "never")
+        options.setdefault("compact_every", None)
+        return DataManager(file_name, notify=lambda *message: messages.append(message), **options)
+
+    opener.messages = messages
+    return opener
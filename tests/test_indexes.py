@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from aggregate_cache import AggregateCache
+from keyword_index import KeywordIndex
+from search_index import SearchIndex
+from sort_index import ColumnSortIndex
+
+
+def edit(manager):
+    """
+    Thực hiện lần lượt các thao tác thêm, sửa, xóa và nối nhiều hàng.
+    """
+    manager.add_data(["7", "Spain", "13", "1", "Basic", "Statistics", "Mean", "Average,Matrix"])
+    manager.update_data(1, ["8", "Spain", "14", "0", "Advanced", "Algebra", "Linear", "Eigen"])
+    manager.delete_data([0, 3])
+    manager.update_rows([manager.data.index[-1]], ["3", "Lithuania", "13", "1", "Basic", "Geometry", "Solid", ""])
+    manager.append_rows([
+        ["9", "France", "15", "1", "Basic", "Statistics", "Mean", "Average"],
+        ["9", "France", "16", "0", "Basic", "Geometry", "Plane", ""],
+    ])
+
+
+def test_search_index_follows_edits(csv_file, open_manager):
+    manager = open_manager(csv_file)
+    manager.search_data(["", "", "", "", "", "", "", "vec"])
+    edit(manager)
+
+    fresh = SearchIndex(manager.data)
+    for criteria in ({"Keywords": "vec"}, {"Student Country": "spa"}, {"Topic": "stat", "Keywords": "aver"}):
+        assert np.array_equal(manager.search_index.match(criteria), fresh.match(criteria)), criteria
+
+
+def test_keyword_index_follows_edits(csv_file, open_manager):
+    manager = open_manager(csv_file)
+    index = manager.keyword_index()
+    edit(manager)
+
+    assert manager.keyword_index() is index
+    fresh = KeywordIndex(manager.data["Keywords"])
+    for keyword in ("Matrix", "Vector", "Average", "Eigen"):
+        assert np.array_equal(index.rows_with(keyword), fresh.rows_with(keyword)), keyword
+    assert [index.keywords_of(i) for i in range(len(manager.data))] == \
+        [fresh.keywords_of(i) for i in range(len(manager.data))]
+    pd.testing.assert_series_equal(index.keyword_counts().sort_index(), fresh.keyword_counts().sort_index())
+    answers = manager.data["Type of Answer"]
+    pd.testing.assert_frame_equal(index.correctness_rates(answers).sort_index(),
+                                  fresh.correctness_rates(answers).sort_index())
+
+
+def test_aggregates_and_sort_indexes_follow_edits(csv_file, open_manager):
+    manager = open_manager(csv_file)
+    aggregates = manager.aggregates()
+    columns = ("Student ID", "Student Country", "Question Level", "Keywords")
+    sort_indexes = {column: manager.sort_index(column) for column in columns}
+    edit(manager)
+
+    assert manager.aggregates() is aggregates
+    fresh = AggregateCache(manager.data)
+    pd.testing.assert_frame_equal(aggregates.country_answer_table(), fresh.country_answer_table())
+    pd.testing.assert_series_equal(aggregates.level_counts().sort_index(), fresh.level_counts().sort_index())
+    pd.testing.assert_series_equal(aggregates.topic_counts().sort_index(), fresh.topic_counts().sort_index())
+
+    for column, index in sort_indexes.items():
+        assert manager.sort_index(column) is index
+        fresh = ColumnSortIndex(manager.data[column])
+        for ascending in (True, False):
+            assert list(index.window(0, len(manager.data), ascending)) == \
+                list(fresh.window(0, len(manager.data), ascending)), (column, ascending)
+
+
+def test_keyword_index_patches_match_rebuild():
+    rng = np.random.default_rng(0)
+    words = np.array(["a", "b", "c", " d ", ""], dtype=object)
+
+    def column(size):
+        return pd.Series([",".join(rng.choice(words, rng.integers(0, 4))) for _ in range(size)], dtype=object)
+
+    values = list(column(40))
+    index = KeywordIndex(pd.Series(values, dtype=object))
+    for _ in range(100):
+        positions = np.unique(rng.choice(len(values), 3))
+        new = column(len(positions))
+        index.update(positions, new)
+        for position, value in zip(positions, new):
+            values[position] = value
+        positions = np.unique(rng.choice(len(values), 2))
+        index.delete(positions)
+        values = [value for i, value in enumerate(values) if i not in positions]
+        new = column(2)
+        index.append(new)
+        values += list(new)
+
+    fresh = KeywordIndex(pd.Series(values, dtype=object))
+    assert [index.keywords_of(i) for i in range(len(values))] == [fresh.keywords_of(i) for i in range(len(values))]
+    for keyword in "abcd":
+        assert np.array_equal(index.rows_with(keyword), fresh.rows_with(keyword)), keyword
+    assert index.keyword_counts().to_dict() == fresh.keyword_counts().to_dict()
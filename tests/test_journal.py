@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from journal import ChangeJournal
+
+
+@pytest.fixture
+def journal(csv_file):
+    journal = ChangeJournal(csv_file + ".journal", fsync="never")
+    journal.replay(csv_file)
+    journal.reset(csv_file)
+    yield journal
+    journal.close()
+
+
+def test_replay_returns_records_in_order(csv_file, journal):
+    journal.append({"op": "add", "row": [1, float("nan"), None]})
+    journal.append({"op": "delete", "index": 0})
+    journal.close()
+    assert journal.replay(csv_file) == [{"op": "add", "row": [1, None, None]}, {"op": "delete", "index": 0}]
+    assert journal.attached and len(journal) == 2
+
+
+def test_torn_last_line_is_dropped_and_truncated(csv_file, journal):
+    journal.append({"op": "delete", "index": 0})
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as handle:
+        handle.write('{"op": "delete", "ind')
+    assert journal.replay(csv_file) == [{"op": "delete", "index": 0}]
+    with open(journal.path, "rb") as handle:
+        assert handle.read().endswith(b"}\n")
+
+
+def test_records_for_another_base_file_are_ignored(csv_file, journal):
+    journal.append({"op": "delete", "index": 0})
+    journal.close()
+    with open(csv_file, "a", encoding="utf-8") as handle:
+        handle.write("4;Spain;10;1;Basic;Algebra;Linear;\n")
+    assert journal.replay(csv_file) == []
+    assert not journal.attached
+    with pytest.raises(RuntimeError):
+        journal.append({"op": "delete", "index": 0})
+
+
+def test_reset_carries_records_written_after_the_mark(csv_file, journal):
+    journal.append({"op": "delete", "index": 0})
+    mark = journal.tell()
+    journal.append({"op": "delete", "index": 1})
+    # File gốc được ghi lại từ bản chụp tại `mark`; thao tác sau đó phải được giữ lại trong nhật ký mới.
+    os.utime(csv_file, ns=(0, 0))
+    journal.reset(csv_file, carry_from=mark)
+    assert len(journal) == 1
+    journal.append({"op": "delete", "index": 2})
+    journal.close()
+    assert journal.replay(csv_file) == [{"op": "delete", "index": 1}, {"op": "delete", "index": 2}]
+
+
+def test_reopen_after_compaction_replays_only_later_edits(csv_file, open_manager):
+    manager = open_manager(csv_file, use_cache=False)
+    manager.delete_data([0])
+    manager.compact()
+    assert len(manager.journal) == 0
+    manager.add_data(["9", "Spain", "10", "1", "Basic", "Algebra", "Linear", ""])
+    expected = manager.data.astype(object).values.tolist()
+    manager.journal.close()  # Dừng đột ngột sau lần nén.
+    reopened = open_manager(csv_file, use_cache=False)
+    assert reopened.data.astype(object).values.tolist() == expected
+    assert len(reopened.journal) == 1
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.mark.parametrize("swapped", [False, True])
+def test_interrupted_save_keeps_carried_edits(csv_file, open_manager, monkeypatch, swapped):
+    manager = open_manager(csv_file, use_cache=False, fsync="always")
+    manager.delete_data([0])
+    fsync, replace = os.fsync, os.replace
+
+    def edit_during_write(fd):
+        # Thao tác được ghi trong lúc file CSV mới đang được ghi từ bản chụp: chỉ nằm trong nhật ký mới.
+        monkeypatch.setattr(os, "fsync", fsync)
+        manager.add_data(["9", "Spain", "10", "1", "Basic", "Algebra", "Linear", ""])
+        fsync(fd)
+
+    def crash_at_csv_swap(source, target):
+        # Dừng đột ngột ngay trước (hoặc ngay sau) khi file tạm thay file CSV.
+        if target == csv_file and not swapped:
+            raise Crash()
+        replace(source, target)
+        if target == csv_file:
+            raise Crash()
+
+    monkeypatch.setattr(os, "fsync", edit_during_write)
+    monkeypatch.setattr(os, "replace", crash_at_csv_swap)
+    with pytest.raises(Crash):
+        manager.save_data()
+    monkeypatch.undo()
+    expected = manager.data.astype(object).values.tolist()
+    manager.journal.close()
+
+    reopened = open_manager(csv_file, use_cache=False)
+    assert reopened.data.astype(object).values.tolist() == expected
+    assert len(reopened.journal) == 1 and not os.path.exists(csv_file + ".tmp")
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from conftest import HEADER
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """
+    Bảng SQLite 300 hàng với ít giá trị phân biệt mỗi cột (nhiều hàng cùng khóa sắp xếp) và một số từ khóa rỗng.
+    """
+    from sqlite_manager import SqliteDataManager
+
+    rng = random.Random(0)
+    lines = [f"{i // 10};{rng.choice(['Italy', 'Portugal', 'Spain'])};{i % 10};{rng.choice('01')};"
+             f"{rng.choice(['Basic', 'Advanced'])};{rng.choice(['Algebra', 'Geometry'])};Linear;"
+             f"{rng.choice(['Matrix', 'Vector', ''])}\n" for i in range(300)]
+    path = tmp_path / "dataset.csv"
+    path.write_text(HEADER + "".join(lines), encoding="utf-8")
+    storage = SqliteDataManager(str(tmp_path / "dataset.db"), notify=lambda *message: None)
+    storage.import_csv(str(path))
+    yield storage
+    storage.close()
+
+
+@pytest.mark.parametrize("column", ["Topic", "Student ID", "Keywords"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_keyset_pages_match_full_read(storage, column, ascending):
+    expected = storage.sorted_view(column, ascending).fetch_rows(0, 300)
+    assert len(expected) == 300 and len({row_id for row_id, _ in expected}) == 300
+
+    view = storage.sorted_view(column, ascending)
+    rng = random.Random(1)
+    windows = [(start, start + 15) for start in range(0, 300, 7)]
+    windows += [(start - 15, start) for start in range(300, 15, -11)]
+    windows += [(start, start + rng.randint(1, 40)) for start in (rng.randrange(300) for _ in range(50))]
+    for start, stop in windows:
+        assert view.fetch_rows(start, stop) == expected[start:stop], (start, stop)
+
+
+def test_search_view_pages_by_row_id(storage):
+    expected = storage.search_view(["", "", "", "", "", "alg"]).fetch_rows(0, 300)
+    view = storage.search_view(["", "", "", "", "", "alg"])
+    assert [view.fetch_rows(start, start + 9) for start in range(len(view) - 9, -1, -9)] == \
+        [expected[start:start + 9] for start in range(len(view) - 9, -1, -9)]
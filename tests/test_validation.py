@@ -0,0 +1,172 @@
+import pandas as pd
+import pytest
+
+from conftest import HEADER, ROWS
+from validation import PairIndex, find_problems, validate
+
+
+def rows_of(manager):
+    return [list(row) for row in manager.data.astype(object).itertuples(index=False, name=None)]
+
+
+def test_find_problems_reports_every_rule():
+    data = pd.DataFrame([
+        [1, "Portugal", 10, 1, "Basic", "Algebra", "Linear", None],
+        [1, "Portugal", 10, 0, "Basic", "Algebra", "Linear", None],
+        [2, None, 11, 456, "Basic", "Algebra", "Linear", None],
+        ["x", "Italy", 12, 1, "Hard", "Algebra", "Linear", None],
+    ], columns=HEADER.strip().split(";"))
+    reasons = find_problems(data, unique_pairs=True)
+    assert reasons.iloc[0] == ""
+    assert "trùng cặp" in reasons.iloc[1]
+    # Mặc định một học sinh được trả lời lại cùng một câu hỏi.
+    assert find_problems(data).iloc[1] == ""
+    assert "'Student Country' rỗng" in reasons.iloc[2] and "'Type of Answer' không thuộc" in reasons.iloc[2]
+    assert "'Student ID' không phải số nguyên" in reasons.iloc[3] and "'Question Level'" in reasons.iloc[3]
+
+
+def test_pair_index_matches_dataframe_check(csv_file, open_manager):
+    manager = open_manager(csv_file)
+    new = manager.data.iloc[:2].copy()
+    new.iloc[1, 0] = 99
+    valid, rejected = validate(new, PairIndex(manager.data), unique_pairs=True)
+    assert len(valid) == 1 and len(rejected) == 1
+    assert validate(new, manager.data, unique_pairs=True)[0].equals(valid)
+
+
+def test_load_quarantines_raw_csv_once(tmp_path, open_manager):
+    path = tmp_path / "dataset.csv"
+    source = HEADER + "".join(ROWS) + ROWS[0] + "34;nan;nan;456;nan;nan;nan;nan\n"
+    path.write_text(source, encoding="utf-8")
+    quarantine_file = str(path) + ".quarantine.csv"
+    for _ in range(3):
+        manager = open_manager(str(path), use_cache=False)
+        assert len(manager.data) == len(ROWS) + 1
+        manager.close()
+    # Việc tải không sửa file nguồn; hàng lặp lại cặp (Student ID, Question ID) được giữ.
+    assert path.read_text(encoding="utf-8") == source
+    with open(quarantine_file, encoding="utf-8") as handle:
+        lines = handle.readlines()
+    assert len(lines) == 2 and lines[1].startswith("34;;;456;")
+    assert len(open_manager.messages) == 1
+
+
+def test_rejected_rows_stay_in_source_until_purged(tmp_path, open_manager):
+    path = tmp_path / "dataset.csv"
+    path.write_text(HEADER + "".join(ROWS) + "34;nan;nan;456;nan;nan;nan;nan\n", encoding="utf-8")
+    manager = open_manager(str(path))
+    manager.delete_data([0])
+    manager.close()
+    assert path.read_text(encoding="utf-8").endswith("34;;;456;;;;\n")
+    manager = open_manager(str(path))
+    assert len(manager.data) == len(ROWS) - 1
+    assert manager.purge_rejected() == 1
+    manager.close()
+    assert path.read_text(encoding="utf-8") == HEADER + "".join(ROWS[1:])
+    assert len(open_manager(str(path)).data) == len(ROWS) - 1
+
+
+def test_add_rejects_duplicate_pair_and_invalid_values(csv_file, open_manager):
+    manager = open_manager(csv_file, unique_pairs=True)
+    with pytest.raises(ValueError, match="trùng cặp"):
+        manager.add_data(["1", "Portugal", "10", "1", "Basic", "Algebra", "Linear", ""])
+    with pytest.raises(ValueError, match="Type of Answer"):
+        manager.add_data(["9", "Portugal", "10", "456", "Basic", "Algebra", "Linear", ""])
+    manager.add_data(["9", "Portugal", "10", "1", "Basic", "Algebra", "Linear", ""])
+    assert len(manager.data) == len(ROWS) + 1
+
+
+def test_update_rejects_duplicate_pairs(csv_file, open_manager):
+    manager = open_manager(csv_file, unique_pairs=True)
+    ids = list(manager.data.index[:3])
+    with pytest.raises(ValueError, match="trùng cặp"):
+        manager.update_rows(ids, ["1", "Portugal", "10", "1", "Basic", "Algebra", "Linear", "EDITED"])
+    with pytest.raises(ValueError, match="trùng cặp"):
+        manager.update_data(0, ["1", "Portugal", "11", "1", "Basic", "Algebra", "Linear", "EDITED"])
+    # Một hàng giữ nguyên cặp của chính nó, hoặc nhận một cặp vừa được giải phóng, là hợp lệ.
+    manager.update_data(0, ["1", "Portugal", "10", "1", "Basic", "Algebra", "Linear", "EDITED"])
+    manager.delete_rows([ids[1]])
+    manager.update_data(0, ["1", "Portugal", "11", "1", "Basic", "Algebra", "Linear", "EDITED"])
+    assert manager.data.iloc[0]["Question ID"] == 11
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_update_survives_close_and_reopen(csv_file, open_manager, use_cache):
+    manager = open_manager(csv_file, use_cache=use_cache)
+    manager.update_rows([manager.data.index[0]], ["1", "Portugal", "10", "0", "Basic", "Algebra", "Linear", "EDITED"])
+    expected = rows_of(manager)
+    manager.close()
+    reopened = open_manager(csv_file, use_cache=use_cache)
+    assert rows_of(reopened) == expected
+    assert open_manager.messages == []
+
+
+def test_journal_replays_onto_right_rows_after_compaction(csv_file, open_manager):
+    manager = open_manager(csv_file, use_cache=False)
+    manager.update_data(0, ["1", "Portugal", "10", "0", "Basic", "Algebra", "Linear", "FIRST"])
+    manager.compact()
+    manager.update_data(3, ["2", "Italy", "12", "1", "Basic", "Geometry", "Plane", "EDITED"])
+    expected = rows_of(manager)
+    manager.journal.close()  # Dừng đột ngột: nhật ký chưa được nén.
+    reopened = open_manager(csv_file, use_cache=False)
+    assert rows_of(reopened) == expected
+    assert reopened.data.iloc[3]["Keywords"] == "EDITED"
+
+
+@pytest.mark.parametrize("unique_pairs", [True, False])
+def test_append_rows_quarantines_rejects(csv_file, open_manager, unique_pairs):
+    manager = open_manager(csv_file, unique_pairs=unique_pairs)
+    added = manager.append_rows([
+        [1, "Portugal", 10, 1, "Basic", "Algebra", "Linear", None],
+        [7, "Portugal", 10, 1, "Basic", "Algebra", "Linear", None],
+        [7, "Portugal", 10, 1, "Basic", "Algebra", "Linear", None],
+        [8, "Portugal", 10, 5, "Basic", "Algebra", "Linear", None],
+    ])
+    assert added == (1 if unique_pairs else 3)
+    with open(manager.quarantine_file, encoding="utf-8") as handle:
+        assert len(handle.readlines()) == (4 if unique_pairs else 2)
+    if unique_pairs:
+        with pytest.raises(ValueError, match="trùng cặp"):
+            manager.add_data(["7", "Portugal", "10", "1", "Basic", "Algebra", "Linear", ""])
+
+
+def test_sqlite_backend_applies_same_rules(tmp_path, csv_file):
+    from sqlite_manager import SqliteDataManager
+
+    storage = SqliteDataManager(str(tmp_path / "dataset.db"), unique_pairs=True, notify=lambda *message: None)
+    try:
+        assert storage.import_csv(csv_file) == len(ROWS)
+        with pytest.raises(ValueError, match="trùng cặp"):
+            storage.add_data(["1", "Portugal", "10", "1", "Basic", "Algebra", "Linear", ""])
+        with pytest.raises(ValueError, match="Question Level"):
+            storage.add_data(["9", "Portugal", "10", "1", "Hard", "Algebra", "Linear", ""])
+        storage.add_data(["9", "Portugal", "10", "1", "Basic", "Algebra", "Linear", ""])
+        row_id, keywords = storage.connection.execute(
+            'SELECT row_id, Keywords FROM answers WHERE "Student ID" = 9').fetchone()
+        assert keywords is None
+        storage.update_rows([row_id], ["9", "Portugal", "10", "0", "Basic", "Algebra", "Linear", "EDITED"])
+        with pytest.raises(ValueError, match="trùng cặp"):
+            storage.update_rows([row_id, row_id - 1], ["9", "Portugal", "10", "0", "Basic", "Algebra", "Linear", ""])
+        assert storage.append_rows([[9, "Portugal", 10, 1, "Basic", "Algebra", "Linear", None],
+                                    [9, "Portugal", 11, 1, "Basic", "Algebra", "Linear", None]]) == 1
+        assert storage.row_count() == len(ROWS) + 2
+    finally:
+        storage.close()
+
+
+def test_backends_keep_repeated_pairs_by_default(tmp_path, csv_file, open_manager):
+    from sqlite_manager import SqliteDataManager
+
+    repeat = ["1", "Portugal", "10", "0", "Basic", "Algebra", "Linear", ""]
+    manager = open_manager(csv_file)
+    manager.add_data(repeat)
+    manager.update_rows(list(manager.data.index[:2]), repeat)
+    assert len(manager.data) == len(ROWS) + 1
+    storage = SqliteDataManager(str(tmp_path / "dataset.db"), notify=lambda *message: None)
+    try:
+        assert storage.import_csv(csv_file) == len(ROWS)
+        storage.add_data(repeat)
+        assert storage.append_rows([repeat, repeat]) == 2
+        assert storage.row_count() == len(ROWS) + 3
+    finally:
+        storage.close()